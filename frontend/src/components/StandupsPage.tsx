@@ -32,7 +32,6 @@ import {
   ListItemIcon,
   Tabs,
   Tab,
-  Pagination,
 } from '@mui/material';
 import {
   Add,
@@ -45,7 +44,7 @@ import {
   Schedule,
 } from '@mui/icons-material';
 import { format } from 'date-fns';
-import { Standup, StandupResponse, Team } from '../types/api';
+import { CursorPage, Standup, StandupResponse, Team } from '../types/api';
 import { apiService } from '../services/api';
 import { useAuth } from '../contexts/AuthContext';
 
@@ -96,8 +95,8 @@ const StandupsPage: React.FC = () => {
   const [teams, setTeams] = useState<Team[]>([]);
   const [loading, setLoading] = useState(true);
   const [error, setError] = useState<string | null>(null);
-  const [page, setPage] = useState(1);
-  const [totalPages, setTotalPages] = useState(1);
+  const [nextPage, setNextPage] = useState<CursorPage<Standup> | null>(null);
+  const [loadingMore, setLoadingMore] = useState(false);
   
   // Filters
   const [teamFilter, setTeamFilter] = useState('');
@@ -123,24 +122,24 @@ const StandupsPage: React.FC = () => {
 
   useEffect(() => {
     loadData();
-  }, [page, teamFilter, statusFilter]);
+  }, [teamFilter, statusFilter]);
 
   const loadData = async () => {
     try {
       setLoading(true);
-      const params: any = { page };
+      const params: any = { page_size: 25 };
       if (teamFilter) params.team = teamFilter;
       if (statusFilter) params.status = statusFilter;
 
       const [standupsData, responsesData, teamsData] = await Promise.all([
         apiService.getStandups(params),
-        apiService.getStandupResponses(),
+        apiService.getResponses({ page_size: 12 }),
         apiService.getTeams(),
       ]);
       
       setStandups(standupsData.results);
-      setTotalPages(Math.ceil(standupsData.count / 10));
-      setResponses(responsesData);
+      setNextPage(standupsData);
+      setResponses(responsesData.results);
       setTeams(teamsData);
       setError(null);
     } catch (err: any) {
@@ -151,6 +150,23 @@ const StandupsPage: React.FC = () => {
     }
   };
 
+  const loadMoreStandups = async () => {
+    if (!nextPage) return;
+    try {
+      setLoadingMore(true);
+      const page = await apiService.getNextPage(nextPage);
+      if (page) {
+        setStandups((current) => [...current, ...page.results]);
+      }
+      setNextPage(page);
+    } catch (err: any) {
+      setError('Failed to load more stand-ups');
+      console.error('Stand-ups error:', err);
+    } finally {
+      setLoadingMore(false);
+    }
+  };
+
   const handleViewStandup = async (standup: Standup) => {
     try {
       setSelectedStandup(standup);
@@ -253,7 +269,6 @@ const StandupsPage: React.FC = () => {
                 value={teamFilter}
                 onChange={(e) => {
                   setTeamFilter(e.target.value);
-                  setPage(1);
                 }}
               >
                 <MenuItem value="">All Teams</MenuItem>
@@ -272,7 +287,6 @@ const StandupsPage: React.FC = () => {
                 value={statusFilter}
                 onChange={(e) => {
                   setStatusFilter(e.target.value);
-                  setPage(1);
                 }}
               >
                 <MenuItem value="">All Statuses</MenuItem>
@@ -352,14 +366,11 @@ const StandupsPage: React.FC = () => {
           </Table>
         </TableContainer>
 
-        {totalPages > 1 && (
+        {nextPage?.next && (
           <Box sx={{ display: 'flex', justifyContent: 'center', mt: 3 }}>
-            <Pagination
-              count={totalPages}
-              page={page}
-              onChange={(e, newPage) => setPage(newPage)}
-              color="primary"
-            />
+            <Button variant="outlined" onClick={loadMoreStandups} disabled={loadingMore}>
+              {loadingMore ? 'Loading...' : 'Load more'}
+            </Button>
           </Box>
         )}
       </TabPanel>
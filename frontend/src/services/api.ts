@@ -8,11 +8,14 @@ import {
   StandupResponse, 
   StandupMetrics, 
   DashboardData, 
+  CursorPage,
   ApiError 
 } from '../types/api';
 
 class ApiService {
   private api: AxiosInstance;
+  // Last body and ETag of each GET URL, revalidated with If-None-Match
+  private etagCache = new Map<string, { etag: string; data: any }>();
 
   constructor() {
     this.api = axios.create({
@@ -21,6 +24,7 @@ class ApiService {
       headers: {
         'Content-Type': 'application/json',
       },
+      validateStatus: (status) => (status >= 200 && status < 300) || status === 304,
     });
 
     // Request interceptor for auth
@@ -29,12 +33,27 @@ class ApiService {
       if (token) {
         config.headers.Authorization = `Bearer ${token}`;
       }
+      const cached = config.method === 'get' && this.etagCache.get(this.api.getUri(config));
+      if (cached) {
+        config.headers['If-None-Match'] = cached.etag;
+      }
       return config;
     });
 
     // Response interceptor for error handling
     this.api.interceptors.response.use(
-      (response) => response,
+      (response) => {
+        if (response.config.method !== 'get') {
+          return response;
+        }
+        const url = this.api.getUri(response.config);
+        if (response.status === 304) {
+          response.data = this.etagCache.get(url)?.data;
+        } else if (response.headers.etag) {
+          this.etagCache.set(url, { etag: response.headers.etag, data: response.data });
+        }
+        return response;
+      },
       (error) => {
         if (error.response?.status === 401) {
           localStorage.removeItem('auth_token');
@@ -45,6 +64,27 @@ class ApiService {
     );
   }
 
+  // List endpoints are cursor paginated; `next` and `previous` are absolute URLs
+  private async getPage<T>(url: string, params?: Record<string, any>): Promise<CursorPage<T>> {
+    const response = await this.api.get(url, { params });
+    return response.data;
+  }
+
+  async getNextPage<T>(page: CursorPage<T>): Promise<CursorPage<T> | null> {
+    return page.next ? this.getPage<T>(page.next) : null;
+  }
+
+  // Short reference lists such as teams are still loaded in full
+  private async getAll<T>(url: string): Promise<T[]> {
+    let page: CursorPage<T> | null = await this.getPage<T>(url, { page_size: 200 });
+    const results: T[] = [];
+    while (page) {
+      results.push(...page.results);
+      page = await this.getNextPage(page);
+    }
+    return results;
+  }
+
   // Authentication
   async login(username: string, password: string): Promise<{ user: User; token?: string }> {
     const response = await this.api.post('/auth/login/', { username, password });
@@ -71,8 +111,7 @@ class ApiService {
 
   // Teams
   async getTeams(): Promise<Team[]> {
-    const response = await this.api.get('/teams/teams/');
-    return response.data.results || response.data;
+    return this.getAll<Team>('/teams/teams/');
   }
 
   async createTeam(team: Partial<Team>): Promise<Team> {
@@ -104,8 +143,7 @@ class ApiService {
   }
 
   async getTeamSchedules(): Promise<StandupSchedule[]> {
-    const response = await this.api.get('/teams/schedules/');
-    return response.data.results || response.data;
+    return this.getAll<StandupSchedule>('/teams/schedules/');
   }
 
   async createSchedule(schedule: Partial<StandupSchedule>): Promise<StandupSchedule> {
@@ -127,10 +165,9 @@ class ApiService {
     team?: number; 
     date?: string; 
     status?: string;
-    page?: number;
-  }): Promise<{ results: Standup[]; count: number }> {
-    const response = await this.api.get('/standups/standups/', { params });
-    return response.data;
+    page_size?: number;
+  }): Promise<CursorPage<Standup>> {
+    return this.getPage<Standup>('/standups/standups/', params);
   }
 
   async getStandup(id: number): Promise<Standup> {
@@ -164,23 +201,21 @@ class ApiService {
     return apiResponse.data;
   }
 
-  async getStandupResponses(): Promise<StandupResponse[]> {
-    const response = await this.api.get('/standups/responses/');
-    return response.data.results || response.data;
+  async getResponses(params?: { page_size?: number }): Promise<CursorPage<StandupResponse>> {
+    return this.getPage<StandupResponse>('/standups/responses/', params);
   }
 
   // Metrics
   async getMetrics(params?: { 
     team?: number; 
     date?: string;
-    page?: number;
-  }): Promise<{ results: StandupMetrics[]; count: number }> {
-    const response = await this.api.get('/standups/metrics/', { params });
-    return response.data;
+    page_size?: number;
+  }): Promise<CursorPage<StandupMetrics>> {
+    return this.getPage<StandupMetrics>('/standups/metrics/', params);
   }
 
-  async getTeamSummary(): Promise<any[]> {
-    const response = await this.api.get('/standups/metrics/team_summary/');
+  async getTeamSummary(days?: number): Promise<any[]> {
+    const response = await this.api.get('/standups/metrics/team_summary/', { params: { days } });
     return response.data;
   }
 
@@ -109,6 +109,12 @@ export interface DashboardData {
   recent_responses: StandupResponse[];
 }
 
+export interface CursorPage<T> {
+  next: string | null;
+  previous: string | null;
+  results: T[];
+}
+
 export interface ApiError {
   message: string;
   details?: Record<string, string[]>;
@@ -0,0 +1,15 @@
+#!/bin/sh
+# Start a hot standby of the db service, cloning it on first start
+set -e
+
+if [ ! -s "$PGDATA/PG_VERSION" ]; then
+    until PGPASSWORD="$POSTGRES_PASSWORD" pg_basebackup \
+        -h "$PRIMARY_HOST" -U "$POSTGRES_USER" -D "$PGDATA" -R -X stream; do
+        echo "Waiting for the primary to accept replication connections..."
+        rm -rf "${PGDATA:?}"/*
+        sleep 2
+    done
+    chmod 700 "$PGDATA"
+fi
+
+exec postgres
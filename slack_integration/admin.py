@@ -1,5 +1,9 @@
 from django.contrib import admin
-from .models import SlackWorkspace, SlackMessage, SlackInteraction, SlackUserMapping, SlackChannelMapping
+from .models import (
+    SlackWorkspace, SlackMessage, SlackOutboxMessage, SlackInteraction, SlackUserMapping, SlackChannelMapping
+)
+from .outbox import replay
+from .tasks import drain_slack_outbox
 
 
 @admin.register(SlackWorkspace)
@@ -19,6 +23,22 @@ class SlackMessageAdmin(admin.ModelAdmin):
     date_hierarchy = 'sent_at'
 
 
+@admin.register(SlackOutboxMessage)
+class SlackOutboxMessageAdmin(admin.ModelAdmin):
+    list_display = ['workspace', 'channel_id', 'message_type', 'status', 'attempts', 'next_attempt_at', 'last_error']
+    list_filter = ['status', 'message_type', 'workspace']
+    search_fields = ['channel_id', 'last_error']
+    readonly_fields = ['created_at', 'sent_at', 'message_ts']
+    date_hierarchy = 'created_at'
+    actions = ['replay_messages']
+    
+    @admin.action(description='Replay selected messages')
+    def replay_messages(self, request, queryset):
+        count = replay(queryset)
+        drain_slack_outbox.delay()
+        self.message_user(request, f"Queued {count} messages for delivery")
+
+
 @admin.register(SlackInteraction)
 class SlackInteractionAdmin(admin.ModelAdmin):
     list_display = ['workspace', 'user_id', 'interaction_type', 'created_at']
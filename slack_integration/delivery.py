@@ -0,0 +1,174 @@
+import logging
+import math
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Optional, Dict, Any, List, Tuple, Callable
+
+from slack_sdk import WebClient
+from slack_sdk.errors import SlackApiError
+from django.conf import settings
+from django.core.cache import cache
+
+from standapp.instrumentation import SLACK_API_CALLS, SLACK_API_DURATION
+
+logger = logging.getLogger(__name__)
+
+
+# Slack Web API rate tiers in requests per minute
+# https://api.slack.com/docs/rate-limits
+RATE_TIERS = {
+    1: 1,
+    2: 20,
+    3: 50,
+    4: 100,
+}
+
+# Tier of each Web API method the app calls; chat.postMessage has its own
+# "special" limit, configured through SLACK_POST_MESSAGE_RATE_PER_MINUTE
+METHOD_TIERS = {
+    'chat.postMessage': 'special',
+    'views.open': 4,
+    'users.info': 4,
+    'conversations.info': 3,
+}
+
+
+class RateLimiter:
+    """Fixed-window call counter kept in the shared cache, blocking callers over the limit.
+
+    Every worker process that talks to the same workspace counts against the
+    same windows, so the configured rate holds however many workers send at
+    once. Taking a slot is one atomic cache increment (INCR on Redis) with no
+    lock, and a pause fills the windows it covers. Windows are numbered from
+    wall clock seconds because they are shared across processes.
+    """
+
+    def __init__(self, key: str, rate_per_minute: float,
+                 clock: Optional[Callable[[], float]] = None, sleep: Optional[Callable[[float], None]] = None):
+        self.key = key
+        # Slow tiers get longer windows rather than a limit that rounds down to zero
+        self.window = max(1.0, 60.0 / rate_per_minute)
+        self.limit = max(1, int(rate_per_minute * self.window / 60.0))
+        self.clock = clock or time.time
+        self.sleep = sleep or time.sleep
+
+    def _window_key(self, window: int) -> str:
+        return f'{self.key}:{window}'
+
+    def _take(self, window: int) -> int:
+        """Count a call in a window, returning the window's count including it"""
+        key = self._window_key(window)
+        try:
+            return cache.incr(key)
+        except ValueError:
+            # First call of the window; another process may create it at the same time
+            if cache.add(key, 1, timeout=int(self.window) + 1):
+                return 1
+            return cache.incr(key)
+
+    def acquire(self) -> None:
+        """Take a slot, sleeping while the current window is full or paused"""
+        while True:
+            now = self.clock()
+            window = int(now // self.window)
+            if self._take(window) <= self.limit:
+                return
+            self.sleep((window + 1) * self.window - now)
+
+    def pause(self, seconds: float) -> None:
+        """Hold every caller back, e.g. after Slack answered with a 429"""
+        now = self.clock()
+        first, last = int(now // self.window), math.ceil((now + seconds) / self.window)
+        cache.set_many(
+            {self._window_key(window): self.limit for window in range(first, last)},
+            timeout=int(seconds + self.window) + 1
+        )
+
+
+def get_rate_limiter(workspace_key: str, method: str) -> RateLimiter:
+    """Return the limiter shared by all processes for a workspace and API method"""
+    tier = METHOD_TIERS.get(method, 3)
+    if tier == 'special':
+        rate = settings.SLACK_POST_MESSAGE_RATE_PER_MINUTE
+    else:
+        rate = RATE_TIERS[tier]
+    return RateLimiter(f'slack_rate:{workspace_key}:{method}', rate)
+
+
+@dataclass
+class DeliveryResult:
+    """Outcome of a single outbound Slack message"""
+    channel: str
+    ok: bool
+    ts: Optional[str] = None
+    error: Optional[str] = None
+
+
+class SlackDeliveryEngine:
+    """Rate-limit-aware, concurrent sender for Slack Web API calls"""
+
+    def __init__(self, client: WebClient, workspace_key: str):
+        self.client = client
+        self.workspace_key = workspace_key
+        self.max_workers = settings.SLACK_DELIVERY_MAX_WORKERS
+        self.max_retries = settings.SLACK_DELIVERY_MAX_RETRIES
+
+    def call(self, method: str, **kwargs):
+        """Call a Web API method, waiting for a rate limit slot and honouring Retry-After"""
+        limiter = get_rate_limiter(self.workspace_key, method)
+        api_method = getattr(self.client, method.replace('.', '_'))
+
+        attempt = 0
+        while True:
+            attempt += 1
+            limiter.acquire()
+            started = time.perf_counter()
+            try:
+                response = api_method(**kwargs)
+                SLACK_API_CALLS.inc(method=method, status='ok')
+                return response
+            except SlackApiError as e:
+                rate_limited = e.response.status_code == 429
+                SLACK_API_CALLS.inc(method=method, status='rate_limited' if rate_limited else 'error')
+                if not rate_limited or attempt > self.max_retries:
+                    raise
+                retry_after = self._retry_after(e.response)
+                logger.warning(f"Slack rate limited {method}, retrying in {retry_after}s")
+                limiter.pause(retry_after)
+            except Exception:
+                SLACK_API_CALLS.inc(method=method, status='error')
+                raise
+            finally:
+                SLACK_API_DURATION.observe(time.perf_counter() - started, method=method)
+
+    def post_message(self, channel: str, message: Dict[str, Any]) -> DeliveryResult:
+        """Post one message and report the result instead of raising"""
+        try:
+            response = self.call('chat.postMessage', channel=channel, **message)
+            if response['ok']:
+                return DeliveryResult(channel=channel, ok=True, ts=response['ts'])
+            return DeliveryResult(channel=channel, ok=False, error=response.get('error'))
+        except SlackApiError as e:
+            return DeliveryResult(channel=channel, ok=False, error=e.response.get('error', str(e)))
+        except Exception as e:
+            return DeliveryResult(channel=channel, ok=False, error=str(e))
+
+    def post_messages(self, messages: List[Tuple[str, Dict[str, Any]]]) -> List[DeliveryResult]:
+        """Post many messages concurrently, returning results in input order"""
+        if len(messages) <= 1:
+            return [self.post_message(channel, message) for channel, message in messages]
+
+        with ThreadPoolExecutor(max_workers=min(self.max_workers, len(messages))) as executor:
+            return list(executor.map(lambda item: self.post_message(*item), messages))
+
+    @staticmethod
+    def _retry_after(response) -> float:
+        """Read the Retry-After header of a rate limited response"""
+        for name, value in (response.headers or {}).items():
+            if name.lower() == 'retry-after':
+                try:
+                    return float(value[0] if isinstance(value, list) else value)
+                except (TypeError, ValueError):
+                    break
+        return 1.0
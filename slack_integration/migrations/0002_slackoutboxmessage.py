@@ -0,0 +1,39 @@
+# Generated by Django 5.2.18 on 2026-10-16 23:44
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('slack_integration', '0001_initial'),
+        ('standups', '0002_standup_reminder_totals'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SlackOutboxMessage',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('channel_id', models.CharField(max_length=50)),
+                ('message_type', models.CharField(choices=[('reminder', 'Stand-up Reminder'), ('summary', 'Stand-up Summary'), ('follow_up', 'Follow-up Reminder'), ('response', 'Stand-up Response'), ('notification', 'Notification')], max_length=15)),
+                ('payload', models.JSONField()),
+                ('status', models.CharField(choices=[('pending', 'Pending'), ('sent', 'Sent'), ('dead', 'Dead Letter')], default='pending', max_length=10)),
+                ('attempts', models.IntegerField(default=0)),
+                ('next_attempt_at', models.DateTimeField(default=django.utils.timezone.now)),
+                ('last_error', models.TextField(blank=True)),
+                ('message_ts', models.CharField(blank=True, max_length=50, null=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('sent_at', models.DateTimeField(blank=True, null=True)),
+                ('reminder', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, to='standups.standupreminder')),
+                ('standup', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, to='standups.standup')),
+                ('workspace', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='outbox', to='slack_integration.slackworkspace')),
+            ],
+            options={
+                'ordering': ['-created_at'],
+                'indexes': [models.Index(condition=models.Q(('status', 'pending')), fields=['next_attempt_at'], name='outbox_pending_idx')],
+            },
+        ),
+    ]
@@ -1,7 +1,8 @@
 from django.db import models
 from django.contrib.auth.models import User
+from django.utils import timezone
 from teams.models import Team
-from standups.models import Standup
+from standups.models import Standup, StandupReminder
 
 
 class SlackWorkspace(models.Model):
@@ -48,6 +49,43 @@ class SlackMessage(models.Model):
         ordering = ['-sent_at']
 
 
+class SlackOutboxMessage(models.Model):
+    """Outbound Slack message, recorded before it is sent and retried until delivered"""
+    STATUS_CHOICES = [
+        ('pending', 'Pending'),
+        ('sent', 'Sent'),
+        ('dead', 'Dead Letter'),
+    ]
+
+    workspace = models.ForeignKey(SlackWorkspace, on_delete=models.CASCADE, related_name='outbox')
+    channel_id = models.CharField(max_length=50)
+    message_type = models.CharField(max_length=15, choices=SlackMessage.MESSAGE_TYPES)
+    payload = models.JSONField()  # chat.postMessage arguments besides the channel
+    standup = models.ForeignKey(Standup, on_delete=models.CASCADE, null=True, blank=True)
+    reminder = models.ForeignKey(StandupReminder, on_delete=models.CASCADE, null=True, blank=True)
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default='pending')
+    attempts = models.IntegerField(default=0)
+    next_attempt_at = models.DateTimeField(default=timezone.now)
+    last_error = models.TextField(blank=True)
+    message_ts = models.CharField(max_length=50, null=True, blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    sent_at = models.DateTimeField(null=True, blank=True)
+
+    def __str__(self):
+        return f"{self.message_type} - {self.channel_id} ({self.status})"
+
+    class Meta:
+        ordering = ['-created_at']
+        indexes = [
+            # The drainer only ever scans pending rows that are due
+            models.Index(
+                fields=['next_attempt_at'],
+                name='outbox_pending_idx',
+                condition=models.Q(status='pending')
+            ),
+        ]
+
+
 class SlackInteraction(models.Model):
     """Model for tracking Slack interactions (button clicks, modal submissions, etc.)"""
     INTERACTION_TYPES = [
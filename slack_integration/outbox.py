@@ -0,0 +1,144 @@
+"""
+Transactional outbox for outbound Slack messages.
+
+Reminders and summaries are written to SlackOutboxMessage in the same
+transaction as the state they announce, already leased to the code that
+delivers them right away: the writer itself for reminders, the
+send_standup_summary task for the summaries end_standups queues. Messages that fail stay pending with
+exponential backoff and are picked up again by the drain_slack_outbox task, as
+are messages whose sender died before the lease ran out; after
+SLACK_OUTBOX_MAX_ATTEMPTS, or on an error that retrying cannot fix, they
+become dead letters that can be replayed from admin.
+"""
+import json
+from datetime import timedelta
+from typing import List, Optional
+
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+
+from standups.models import Standup, StandupReminder
+from .delivery import DeliveryResult
+from .models import SlackMessage, SlackOutboxMessage
+
+
+# Slack errors that no amount of retrying will fix
+PERMANENT_ERRORS = {
+    'account_inactive', 'channel_not_found', 'invalid_auth', 'invalid_blocks', 'is_archived',
+    'msg_too_long', 'no_text', 'not_in_channel', 'token_revoked', 'user_not_found',
+}
+
+
+def backoff(attempts: int) -> timedelta:
+    """Delay before the next attempt after the given number of failed attempts"""
+    seconds = settings.SLACK_OUTBOX_BACKOFF_SECONDS * 2 ** (attempts - 1)
+    return timedelta(seconds=min(seconds, settings.SLACK_OUTBOX_MAX_BACKOFF_SECONDS))
+
+
+def lease_expiry(count: int, now=None):
+    """End of a lease on ``count`` messages: the configured lease plus the time sending them takes at the rate limit"""
+    seconds = settings.SLACK_OUTBOX_LEASE_SECONDS + count * 60 / settings.SLACK_POST_MESSAGE_RATE_PER_MINUTE
+    return (now or timezone.now()) + timedelta(seconds=seconds)
+
+
+def claim_due_messages(limit: int, now=None) -> List[SlackOutboxMessage]:
+    """Lease up to ``limit`` due messages to the caller.
+
+    Rows are locked with SKIP LOCKED and their next attempt is pushed past the
+    lease in the same transaction, so concurrent drainers never send the same
+    message twice, while a drainer that dies mid-batch only delays its rows.
+    """
+    now = now or timezone.now()
+
+    with transaction.atomic():
+        due = list(
+            SlackOutboxMessage.objects.select_for_update(
+                skip_locked=True, of=('self',)
+            ).filter(
+                status='pending',
+                next_attempt_at__lte=now
+            ).order_by('next_attempt_at')[:limit]
+        )
+
+        SlackOutboxMessage.objects.filter(
+            id__in=[message.id for message in due]
+        ).update(next_attempt_at=lease_expiry(len(due), now))
+
+    return due
+
+
+def claim_message(message_id: int, leased_until) -> Optional[SlackOutboxMessage]:
+    """Renew the lease a message was queued with, unless the drainer or another sender took it over.
+
+    The update only matches while the row still carries the lease it was
+    written with, so exactly one of the racing senders gets to deliver it.
+    """
+    claimed = SlackOutboxMessage.objects.filter(
+        id=message_id,
+        status='pending',
+        next_attempt_at=leased_until
+    ).update(next_attempt_at=lease_expiry(1))
+    if not claimed:
+        return None
+    return SlackOutboxMessage.objects.select_related('workspace').get(id=message_id)
+
+
+def record_results(messages: List[SlackOutboxMessage], results: List[DeliveryResult]) -> None:
+    """Write delivery outcomes back to the outbox and the rows the messages belong to"""
+    now = timezone.now()
+    delivered = []
+
+    for message, result in zip(messages, results):
+        message.attempts += 1
+        if result.ok:
+            message.status = 'sent'
+            message.message_ts = result.ts
+            message.sent_at = now
+            message.last_error = ''
+            delivered.append(message)
+        else:
+            message.last_error = result.error or 'unknown_error'
+            if result.error in PERMANENT_ERRORS or message.attempts >= settings.SLACK_OUTBOX_MAX_ATTEMPTS:
+                message.status = 'dead'
+            else:
+                message.next_attempt_at = now + backoff(message.attempts)
+
+    with transaction.atomic():
+        SlackOutboxMessage.objects.bulk_update(
+            messages, ['status', 'attempts', 'next_attempt_at', 'last_error', 'message_ts', 'sent_at']
+        )
+
+        SlackMessage.objects.bulk_create([
+            SlackMessage(
+                workspace_id=message.workspace_id,
+                channel_id=message.channel_id,
+                user_id=message.channel_id if message.message_type != 'summary' else None,
+                message_ts=message.message_ts,
+                message_type=message.message_type,
+                content=json.dumps(message.payload),
+                standup_id=message.standup_id
+            )
+            for message in delivered
+        ])
+
+        reminders = [
+            StandupReminder(id=message.reminder_id, slack_message_ts=message.message_ts)
+            for message in delivered if message.reminder_id
+        ]
+        StandupReminder.objects.bulk_update(reminders, ['slack_message_ts'])
+
+        # Summaries start the stand-up's thread in the team channel
+        for message in delivered:
+            if message.message_type == 'summary' and message.standup_id:
+                Standup.objects.filter(id=message.standup_id).update(slack_thread_ts=message.message_ts)
+
+
+def replay(queryset) -> int:
+    """Put messages, typically dead letters, back in the queue for immediate delivery"""
+    return queryset.exclude(status='sent').update(
+        status='pending',
+        attempts=0,
+        next_attempt_at=timezone.now(),
+        last_error=''
+    )
@@ -1,17 +1,17 @@
-import json
 import logging
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, List
 from datetime import datetime
 
 from slack_sdk import WebClient
-from slack_sdk.errors import SlackApiError
 from django.conf import settings
 from django.contrib.auth.models import User
 from django.utils import timezone
 
-from .models import SlackWorkspace, SlackMessage, SlackUserMapping, SlackChannelMapping
+from .delivery import SlackDeliveryEngine, DeliveryResult
+from .models import SlackWorkspace, SlackOutboxMessage, SlackUserMapping, SlackChannelMapping
+from .outbox import lease_expiry, record_results
 from teams.models import TeamMember
-from standups.models import Standup, StandupResponse
+from standups.models import Standup, StandupReminder, StandupResponse
 
 logger = logging.getLogger(__name__)
 
@@ -19,12 +19,15 @@ logger = logging.getLogger(__name__)
 class SlackService:
     """Service for handling Slack API interactions"""
     
-    def __init__(self, workspace_team_id: Optional[str] = None):
+    def __init__(self, workspace_team_id: Optional[str] = None, workspace: Optional[SlackWorkspace] = None):
         """Initialize Slack service with optional workspace"""
-        self.workspace = None
+        self.workspace = workspace
         self.client = None
+        self.delivery = None
         
-        if workspace_team_id:
+        if workspace:
+            self.client = WebClient(token=workspace.bot_access_token)
+        elif workspace_team_id:
             try:
                 self.workspace = SlackWorkspace.objects.get(
                     team_id=workspace_team_id,
@@ -38,51 +41,74 @@ class SlackService:
             self.workspace = SlackWorkspace.objects.filter(is_active=True).first()
             if self.workspace:
                 self.client = WebClient(token=self.workspace.bot_access_token)
+        
+        if self.client:
+            self.delivery = SlackDeliveryEngine(self.client, self.workspace.team_id)
     
     def send_standup_reminder(self, slack_user_id: str, standup: Standup, reminder_type: str) -> Optional[str]:
         """Send a stand-up reminder to a user"""
+        result = self.send_standup_reminders([slack_user_id], standup, reminder_type).get(slack_user_id)
+        return result.ts if result and result.ok else None
+    
+    def send_standup_reminders(self, slack_user_ids: List[str], standup: Standup, reminder_type: str) -> Dict[str, DeliveryResult]:
+        """Send the same stand-up reminder to many users, returning delivery results by Slack user ID"""
         if not self.client:
             logger.error("No Slack client available")
-            return None
+            return {}
         
-        try:
-            # Create reminder message based on type
-            if reminder_type == 'initial':
-                message = self._create_initial_reminder_message(standup)
-            elif reminder_type == 'follow_up':
-                message = self._create_follow_up_reminder_message(standup)
-            else:
-                message = self._create_final_reminder_message(standup)
-            
-            # Send DM to user
-            response = self.client.chat_postMessage(
-                channel=slack_user_id,
-                **message
+        messages = self.queue_standup_reminders(slack_user_ids, standup, reminder_type)
+        return {result.channel: result for result in self.deliver(messages)}
+    
+    def queue_standup_reminders(self, slack_user_ids: List[str], standup: Standup, reminder_type: str,
+                                reminders: Optional[List[StandupReminder]] = None) -> List[SlackOutboxMessage]:
+        """Record reminders in the outbox, in the caller's transaction, leased to the caller for delivery"""
+        if not self.client:
+            logger.error("No Slack client available")
+            return []
+        
+        # Reminder content only depends on the stand-up, so build it once
+        message = self._create_reminder_message(standup, reminder_type)
+        reminders = reminders or [None] * len(slack_user_ids)
+        # The drainer must not pick the messages up while the caller is still sending them
+        leased_until = lease_expiry(len(slack_user_ids))
+        
+        return SlackOutboxMessage.objects.bulk_create([
+            SlackOutboxMessage(
+                workspace=self.workspace,
+                channel_id=slack_user_id,
+                message_type='follow_up' if reminder_type == 'follow_up' else 'reminder',
+                payload=message,
+                standup=standup,
+                reminder=reminder,
+                next_attempt_at=leased_until
             )
-            
-            if response['ok']:
-                # Log the message
-                SlackMessage.objects.create(
-                    workspace=self.workspace,
-                    channel_id=slack_user_id,
-                    user_id=slack_user_id,
-                    message_ts=response['ts'],
-                    message_type='reminder',
-                    content=json.dumps(message),
-                    standup=standup
-                )
-                
-                return response['ts']
-            else:
-                logger.error(f"Failed to send reminder: {response.get('error')}")
-                return None
-                
-        except SlackApiError as e:
-            logger.error(f"Slack API error sending reminder: {e}")
-            return None
-        except Exception as e:
-            logger.error(f"Error sending reminder: {e}")
-            return None
+            for slack_user_id, reminder in zip(slack_user_ids, reminders)
+        ])
+    
+    def deliver(self, messages: List[SlackOutboxMessage]) -> List[DeliveryResult]:
+        """Send outbox messages now and record the outcome; failed messages stay queued for retry"""
+        if not messages:
+            return []
+        
+        results = self.delivery.post_messages([
+            (message.channel_id, message.payload) for message in messages
+        ])
+        
+        for result in results:
+            if not result.ok:
+                logger.error(f"Failed to send message to {result.channel}: {result.error}")
+        
+        record_results(messages, results)
+        return results
+    
+    def _create_reminder_message(self, standup: Standup, reminder_type: str) -> Dict[str, Any]:
+        """Create reminder message based on type"""
+        if reminder_type == 'initial':
+            return self._create_initial_reminder_message(standup)
+        elif reminder_type == 'follow_up':
+            return self._create_follow_up_reminder_message(standup)
+        else:
+            return self._create_final_reminder_message(standup)
     
     def _create_initial_reminder_message(self, standup: Standup) -> Dict[str, Any]:
         """Create initial stand-up reminder message"""
@@ -199,65 +225,44 @@ class SlackService:
             ]
         }
     
-    def send_standup_summary(self, standup: Standup) -> Optional[str]:
-        """Send stand-up summary to team channel"""
+    def queue_standup_summaries(self, standups: List[Standup]) -> List[SlackOutboxMessage]:
+        """Record stand-up summaries in the outbox, in the caller's transaction, leased for the summary task"""
         if not self.client:
             logger.error("No Slack client available")
-            return None
+            return []
         
-        try:
-            # Get team channel
-            channel_mapping = SlackChannelMapping.objects.filter(
-                team=standup.team,
+        # Team channels of all the stand-ups in one query
+        channels = dict(
+            SlackChannelMapping.objects.filter(
+                team_id__in={standup.team_id for standup in standups},
                 workspace=self.workspace,
                 is_active=True
-            ).first()
-            
-            if not channel_mapping:
+            ).values_list('team_id', 'channel_id')
+        )
+        # The drainer only takes over if the summary task never delivers them
+        leased_until = lease_expiry(len(standups))
+        
+        messages = []
+        for standup in standups:
+            channel_id = channels.get(standup.team_id)
+            if not channel_id:
                 logger.error(f"No channel mapping found for team {standup.team.name}")
-                return None
-            
-            # Create summary message
-            message = self._create_summary_message(standup)
+                continue
             
-            # Send to team channel
-            response = self.client.chat_postMessage(
-                channel=channel_mapping.channel_id,
-                **message
-            )
-            
-            if response['ok']:
-                # Log the message
-                SlackMessage.objects.create(
-                    workspace=self.workspace,
-                    channel_id=channel_mapping.channel_id,
-                    message_ts=response['ts'],
-                    message_type='summary',
-                    content=json.dumps(message),
-                    standup=standup
-                )
-                
-                # Update standup with thread timestamp
-                standup.slack_thread_ts = response['ts']
-                standup.save()
-                
-                return response['ts']
-            else:
-                logger.error(f"Failed to send summary: {response.get('error')}")
-                return None
-                
-        except SlackApiError as e:
-            logger.error(f"Slack API error sending summary: {e}")
-            return None
-        except Exception as e:
-            logger.error(f"Error sending summary: {e}")
-            return None
+            messages.append(SlackOutboxMessage(
+                workspace=self.workspace,
+                channel_id=channel_id,
+                message_type='summary',
+                payload=self._create_summary_message(standup),
+                standup=standup,
+                next_attempt_at=leased_until
+            ))
+        
+        return SlackOutboxMessage.objects.bulk_create(messages)
     
     def _create_summary_message(self, standup: Standup) -> Dict[str, Any]:
         """Create stand-up summary message"""
-        responses = standup.responses.all().order_by('submitted_at')
-        total_members = standup.team.teammember_set.filter(is_active=True).count()
-        completion_rate = standup.completion_rate
+        responses = list(standup.responses.select_related('user').order_by('submitted_at'))
         
         # Header section
         blocks = [
@@ -272,7 +277,7 @@ class SlackService:
                 "type": "section",
                 "text": {
                     "type": "mrkdwn",
-                    "text": f"*Team:* {standup.team.name}\n*Participation:* {len(responses)}/{total_members} members ({completion_rate:.1f}%)"
+                    "text": f"*Team:* {standup.team.name}\n*Participation:* {standup.response_count}/{standup.active_member_count} members ({standup.completion_rate:.1f}%)"
                 }
             }
         ]
@@ -302,8 +307,8 @@ class SlackService:
             })
         
         # Add missing members if any
-        missing_members = standup.missing_members
-        if missing_members.exists():
+        missing_members = list(standup.missing_members.select_related('user'))
+        if missing_members:
             missing_names = [m.user.get_full_name() or m.user.username for m in missing_members]
             blocks.append({
                 "type": "section",
@@ -347,7 +352,8 @@ class SlackService:
                 ]
             }
             
-            response = self.client.chat_postMessage(
+            response = self.delivery.call(
+                'chat.postMessage',
                 channel=user_mapping.slack_user_id,
                 **message
             )
@@ -504,7 +510,8 @@ class SlackService:
                 ]
             }
             
-            response = self.client.views_open(
+            response = self.delivery.call(
+                'views.open',
                 trigger_id=trigger_id,
                 view=modal
             )
@@ -0,0 +1,39 @@
+import logging
+
+from celery import shared_task
+from django.conf import settings
+
+from .models import SlackWorkspace
+from .outbox import claim_due_messages
+from .services import SlackService
+
+logger = logging.getLogger(__name__)
+
+
+@shared_task
+def drain_slack_outbox():
+    """Retry outbound Slack messages whose next attempt is due"""
+    sent = failed = 0
+    
+    # Each batch is leased, so several drainers can run side by side
+    while True:
+        messages = claim_due_messages(settings.SLACK_OUTBOX_BATCH_SIZE)
+        if not messages:
+            break
+        
+        workspaces = SlackWorkspace.objects.in_bulk({message.workspace_id for message in messages})
+        by_workspace = {}
+        for message in messages:
+            by_workspace.setdefault(message.workspace_id, []).append(message)
+        
+        for workspace_id, workspace_messages in by_workspace.items():
+            slack_service = SlackService(workspace=workspaces[workspace_id])
+            results = slack_service.deliver(workspace_messages)
+            delivered = sum(1 for result in results if result.ok)
+            sent += delivered
+            failed += len(results) - delivered
+        
+        if len(messages) < settings.SLACK_OUTBOX_BATCH_SIZE:
+            break
+    
+    return f"Delivered {sent} queued Slack messages, {failed} failed"
@@ -1,3 +1,269 @@
-from django.test import TestCase
+from datetime import date, datetime, time, timedelta
+from unittest import mock
 
-# Create your tests here.
+import pytz
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.test import SimpleTestCase, TestCase, override_settings
+from slack_sdk.errors import SlackApiError
+from django.utils import timezone
+
+from standups.models import Standup, StandupReminder
+from standups.tasks import _send_reminder_batch, end_standups, send_standup_summary
+from teams.models import Team, TeamMember, StandupSchedule
+from .delivery import RateLimiter, SlackDeliveryEngine
+from .models import SlackChannelMapping, SlackWorkspace, SlackOutboxMessage, SlackUserMapping
+from .outbox import claim_due_messages, lease_expiry, replay
+from .services import SlackService
+from .tasks import drain_slack_outbox
+
+
+class StubSlackClient:
+    """WebClient stand-in answering chat.postMessage with queued responses"""
+    responses = []
+
+    def __init__(self, *args, **kwargs):
+        pass
+
+    def chat_postMessage(self, channel, **kwargs):
+        return self.responses.pop(0)
+
+
+class FakeClock:
+    """Wall clock stand-in whose sleep() advances time instantly"""
+
+    def __init__(self):
+        self.now = 1_700_000_000.0
+        self.slept = []
+
+    def time(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.slept.append(seconds)
+        self.now += seconds
+
+
+class RateLimitedResponse:
+    """Slack response stand-in for a 429 carrying a Retry-After header"""
+    status_code = 429
+
+    def __init__(self, retry_after):
+        self.headers = {'Retry-After': str(retry_after)}
+
+    def get(self, key, default=None):
+        return {'ok': False, 'error': 'ratelimited'}.get(key, default)
+
+
+class RateLimiterTestCase(SimpleTestCase):
+    """Test case for the shared Slack rate limiters"""
+
+    def setUp(self):
+        cache.clear()
+        self.clock = FakeClock()
+
+    def limiter(self, rate_per_minute=120):
+        return RateLimiter('slack_rate:test', rate_per_minute, clock=self.clock.time, sleep=self.clock.sleep)
+
+    def test_limiters_with_same_key_share_windows(self):
+        """Test that two processes' limiters for one workspace count against the same window"""
+        first, second = self.limiter(), self.limiter()
+        first.acquire()
+        second.acquire()
+        self.assertEqual(self.clock.slept, [])
+
+        first.acquire()
+        self.assertEqual(self.clock.slept, [1.0])
+
+    def test_slow_tier_allows_one_call_per_window(self):
+        """Test that a rate under one call per second spaces calls a window apart"""
+        # The clock starts one second before the end of a three second window
+        limiter = self.limiter(rate_per_minute=20)
+        for _ in range(3):
+            limiter.acquire()
+        self.assertEqual(self.clock.slept, [1.0, 3.0])
+
+    def test_pause_holds_back_every_limiter(self):
+        """Test that a pause after a 429 delays callers on other limiters with the same key"""
+        self.limiter().pause(30)
+        self.limiter().acquire()
+        self.assertEqual(sum(self.clock.slept), 30)
+
+
+@override_settings(METRICS_ENABLED=False, SLACK_DELIVERY_MAX_RETRIES=1)
+class SlackDeliveryEngineTestCase(SimpleTestCase):
+    """Test case for retries of rate limited Slack calls"""
+
+    def setUp(self):
+        cache.clear()
+        self.clock = FakeClock()
+        for name in ('time', 'sleep'):
+            patcher = mock.patch(f'time.{name}', getattr(self.clock, name))
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        self.client = mock.Mock()
+        self.engine = SlackDeliveryEngine(self.client, 'T12345678')
+
+    def test_rate_limited_call_waits_for_retry_after(self):
+        """Test that a 429 is retried once the Retry-After delay has passed"""
+        self.client.chat_postMessage.side_effect = [
+            SlackApiError('ratelimited', RateLimitedResponse(7)),
+            {'ok': True, 'ts': '1.0001'},
+        ]
+
+        result = self.engine.post_message('U12345678', {'text': 'Hi'})
+
+        self.assertEqual((result.ok, result.ts), (True, '1.0001'))
+        self.assertEqual(sum(self.clock.slept), 7)
+
+    def test_rate_limit_beyond_retries_fails_message(self):
+        """Test that a message still rate limited after the retries is reported as failed"""
+        self.client.chat_postMessage.side_effect = SlackApiError('ratelimited', RateLimitedResponse(2))
+
+        result = self.engine.post_message('U12345678', {'text': 'Hi'})
+
+        self.assertEqual((result.ok, result.error), (False, 'ratelimited'))
+        self.assertEqual(self.client.chat_postMessage.call_count, 2)
+
+
+class SlackOutboxTestCase(TestCase):
+    """Test case for the outbound Slack message outbox"""
+
+    def setUp(self):
+        client = mock.patch('slack_integration.services.WebClient', StubSlackClient)
+        client.start()
+        self.addCleanup(client.stop)
+
+        self.workspace = SlackWorkspace.objects.create(
+            team_id='T12345678', team_name='Acme', bot_user_id='B12345678', bot_access_token='xoxb-test'
+        )
+        team = Team.objects.create(name='Platform', slack_channel_id='C12345678')
+        self.standup = Standup.objects.create(team=team, date=date(2024, 3, 7), status='in_progress')
+        user = User.objects.create(username='alice')
+        self.reminder = StandupReminder.objects.create(standup=self.standup, user=user, reminder_type='initial')
+        self.service = SlackService(workspace=self.workspace)
+        self.message = self.service.queue_standup_reminders(
+            ['U12345678'], self.standup, 'initial', [self.reminder]
+        )[0]
+
+    def deliver(self, response):
+        StubSlackClient.responses = [response]
+        self.service.deliver([self.message])
+        self.message.refresh_from_db()
+
+    def test_drainer_skips_messages_being_sent_inline(self):
+        """Test that a drain running during an inline delivery does not send its messages again"""
+        teammate = User.objects.create(username='bob')
+        sent = []
+
+        def post_message(client, channel, **kwargs):
+            sent.append(channel)
+            if len(sent) == 1:
+                drain_slack_outbox()
+            return {'ok': True, 'ts': f'1.000{len(sent)}'}
+
+        with mock.patch.object(StubSlackClient, 'chat_postMessage', post_message):
+            result = _send_reminder_batch(self.standup, [(teammate.id, 'U23456789')], 'initial')
+
+        self.assertEqual(result, {'sent': 1, 'failed': 0})
+        self.assertEqual(sent, ['U23456789'])
+
+    def test_abandoned_message_is_claimable_after_lease(self):
+        """Test that a message whose sender died is handed to the drainer once its lease ends"""
+        self.assertEqual(claim_due_messages(10), [])
+        later = lease_expiry(1) + timedelta(seconds=1)
+        self.assertEqual([message.id for message in claim_due_messages(10, now=later)], [self.message.id])
+
+    def test_failed_message_is_retried_by_drainer(self):
+        """Test that a transient failure is backed off and delivered by the drainer"""
+        self.deliver({'ok': False, 'error': 'service_unavailable'})
+        self.assertEqual(self.message.status, 'pending')
+        self.assertEqual(claim_due_messages(10), [])
+
+        SlackOutboxMessage.objects.update(next_attempt_at=timezone.now() - timedelta(seconds=1))
+        StubSlackClient.responses = [{'ok': True, 'ts': '1.0001'}]
+        drain_slack_outbox()
+
+        self.message.refresh_from_db()
+        self.reminder.refresh_from_db()
+        self.assertEqual((self.message.status, self.message.attempts), ('sent', 2))
+        self.assertEqual(self.reminder.slack_message_ts, '1.0001')
+
+    def test_permanent_error_dead_letters_until_replayed(self):
+        """Test that a permanent error dead-letters the message and replay requeues it"""
+        self.deliver({'ok': False, 'error': 'user_not_found'})
+        self.assertEqual(self.message.status, 'dead')
+
+        replay(SlackOutboxMessage.objects.filter(status='dead'))
+        self.assertEqual([message.id for message in claim_due_messages(10)], [self.message.id])
+
+
+    @mock.patch('standups.tasks.group')
+    def close_standup(self, group):
+        """End the stand-up through end_standups without running the tasks it dispatches"""
+        team = self.standup.team
+        SlackChannelMapping.objects.create(
+            team=team, workspace=self.workspace, channel_id='C12345678', channel_name='platform'
+        )
+        StandupSchedule.objects.create(
+            team=team, weekdays=[4], reminder_time=time(9, 0), end_time=time(16, 0), timezone='UTC'
+        )
+        end_standups()
+        return SlackOutboxMessage.objects.get(standup=self.standup, message_type='summary')
+
+    def test_summary_task_delivers_summary_queued_with_close(self):
+        """Test that closing a stand-up queues its summary for the summary task to deliver"""
+        summary = self.close_standup()
+        self.assertEqual(summary.status, 'pending')
+        self.assertEqual(claim_due_messages(10), [])
+
+        StubSlackClient.responses = [{'ok': True, 'ts': '1.0001'}]
+        send_standup_summary(summary.id, summary.next_attempt_at.isoformat())
+
+        self.standup.refresh_from_db()
+        self.assertEqual(self.standup.slack_thread_ts, '1.0001')
+
+    def test_summary_taken_by_drainer_is_not_sent_again(self):
+        """Test that a summary task running after the drainer took its summary over does not send it"""
+        summary = self.close_standup()
+        later = summary.next_attempt_at + timedelta(seconds=1)
+        self.assertIn(summary.id, [message.id for message in claim_due_messages(10, now=later)])
+
+        with mock.patch.object(StubSlackClient, 'chat_postMessage') as post_message:
+            send_standup_summary(summary.id, summary.next_attempt_at.isoformat())
+        post_message.assert_not_called()
+
+
+@override_settings(SLACK_SIGNING_SECRET=None)
+class SlashCommandTestCase(TestCase):
+    """Test case for the /standup slash commands"""
+
+    def test_status_uses_team_local_date(self):
+        """Test that "today" is the team's local date, not the UTC one"""
+        workspace = SlackWorkspace.objects.create(
+            team_id='T12345678', team_name='Acme', bot_user_id='B12345678', bot_access_token='xoxb-test'
+        )
+        team = Team.objects.create(name='Sydney', slack_channel_id='C12345678')
+        user = User.objects.create(username='alice')
+        TeamMember.objects.create(user=user, team=team, slack_user_id='U12345678')
+        SlackUserMapping.objects.create(
+            user=user, slack_user_id='U12345678', slack_username='alice', workspace=workspace
+        )
+
+        # 07:00 on Friday in Sydney is still Thursday in UTC
+        now = datetime(2024, 3, 7, 20, 0, tzinfo=pytz.UTC)
+        with mock.patch('django.utils.timezone.now', return_value=now):
+            StandupSchedule.objects.create(
+                team=team, weekdays=[5], reminder_time=time(7, 0), end_time=time(12, 0),
+                timezone='Australia/Sydney'
+            )
+            Standup.objects.create(team=team, date=date(2024, 3, 8), status='in_progress')
+
+            response = self.client.post('/api/slack/commands/', {
+                'command': '/standup-status', 'user_id': 'U12345678', 'team_id': 'T12345678'
+            })
+
+        self.assertEqual(
+            response.json()['text'],
+            "Your stand-up status for March 08, 2024:\n• Sydney: ⏳ In_Progress"
+        )
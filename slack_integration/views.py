@@ -7,6 +7,7 @@ from django.views.decorators.http import require_POST
 from django.utils.decorators import method_decorator
 from django.views import View
 from django.contrib.auth.models import User
+from django.db.models import Q
 from slack_sdk.signature import SignatureVerifier
 from django.conf import settings
 
@@ -14,6 +15,8 @@ from .models import SlackWorkspace, SlackInteraction, SlackUserMapping
 from .services import SlackService
 from standups.models import Standup
 from standups.tasks import process_standup_response
+from teams.membership import team_ids
+from teams.scheduling import team_local_dates
 
 logger = logging.getLogger(__name__)
 
@@ -384,16 +387,12 @@ class SlackSlashCommandView(View):
                     "text": "You're not registered for stand-ups. Please contact your administrator."
                 })
             
-            # Get user's active stand-ups for today
-            from django.utils import timezone
-            today = timezone.now().date()
+            # Get user's active stand-ups for today, in each team's own timezone
+            todays_standups = Q(pk__in=[])
+            for team_id, today in team_local_dates(team_ids(user_mapping.user)).items():
+                todays_standups |= Q(team_id=team_id, date=today)
             
-            active_standups = Standup.objects.filter(
-                team__teammember__user=user_mapping.user,
-                team__teammember__is_active=True,
-                date=today,
-                status='in_progress'
-            )
+            active_standups = Standup.objects.filter(todays_standups, status='in_progress')
             
             if not active_standups.exists():
                 return JsonResponse({
@@ -449,16 +448,14 @@ class SlackSlashCommandView(View):
                     "text": "You're not registered for stand-ups."
                 })
             
-            # Get today's stand-up status
-            from django.utils import timezone
-            today = timezone.now().date()
-            
-            user_teams = user_mapping.user.teammember_set.filter(is_active=True)
+            # Get today's stand-up status, "today" being each team's local date
+            user_teams = user_mapping.user.teammember_set.filter(is_active=True).select_related('team')
+            local_dates = team_local_dates([team_member.team_id for team_member in user_teams])
             status_lines = []
             
             for team_member in user_teams:
                 try:
-                    standup = Standup.objects.get(team=team_member.team, date=today)
+                    standup = Standup.objects.get(team=team_member.team, date=local_dates[team_member.team_id])
                     has_responded = standup.responses.filter(user=user_mapping.user).exists()
                     
                     status = "✅ Submitted" if has_responded else f"⏳ {standup.status.title()}"
@@ -467,7 +464,9 @@ class SlackSlashCommandView(View):
                     status_lines.append(f"• {team_member.team.name}: No stand-up today")
             
             if status_lines:
-                status_text = f"Your stand-up status for {today.strftime('%B %d, %Y')}:\n" + "\n".join(status_lines)
+                dates = set(local_dates.values())
+                day = dates.pop().strftime('%B %d, %Y') if len(dates) == 1 else "today"
+                status_text = f"Your stand-up status for {day}:\n" + "\n".join(status_lines)
             else:
                 status_text = "You're not part of any teams with stand-ups."
             
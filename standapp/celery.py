@@ -1,6 +1,8 @@
 import os
+import redis
 from celery import Celery
 from django.conf import settings
+from kombu import Queue
 
 # Set the default Django settings module for the 'celery' program.
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'standapp.settings')
@@ -14,16 +16,51 @@ app.config_from_object('django.conf:settings', namespace='CELERY')
 # Load task modules from all registered Django apps.
 app.autodiscover_tasks()
 
+# Separate queues so interactive work never waits behind the bulk fan-out.
+# Each queue is consumed by its own worker pool with its own concurrency and
+# prefetch settings (see docker-compose.yml).
+QUEUES = ('interactive', 'bulk', 'analytics')
+
+app.conf.task_queues = [Queue(name) for name in QUEUES]
+app.conf.task_default_queue = 'bulk'
+app.conf.task_routes = {
+    # Modal submissions and confirmation DMs
+    'standups.tasks.process_standup_response': {'queue': 'interactive'},
+    # Reminders, follow-ups, summaries and scheduling
+    'standups.tasks.send_standup_reminders': {'queue': 'bulk'},
+    'standups.tasks.refresh_schedule_index': {'queue': 'bulk'},
+    'standups.tasks.create_and_send_standup_reminder': {'queue': 'bulk'},
+    'standups.tasks.send_standup_reminder_chunk': {'queue': 'bulk'},
+    'standups.tasks.record_reminder_totals': {'queue': 'bulk'},
+    'standups.tasks.send_follow_up_reminders': {'queue': 'bulk'},
+    'standups.tasks.end_standups': {'queue': 'bulk'},
+    'standups.tasks.end_standup': {'queue': 'bulk'},
+    'standups.tasks.send_standup_summary': {'queue': 'bulk'},
+    'slack_integration.tasks.drain_slack_outbox': {'queue': 'bulk'},
+    # Metrics
+    'standups.tasks.generate_standup_metrics': {'queue': 'analytics'},
+    'standups.tasks.generate_standups_metrics': {'queue': 'analytics'},
+    'standups.tasks.generate_daily_metrics': {'queue': 'analytics'},
+}
+
 # Celery beat schedule for automated tasks
 app.conf.beat_schedule = {
     'send-standup-reminders': {
         'task': 'standups.tasks.send_standup_reminders',
-        'schedule': 60.0,  # Run every minute to check for scheduled reminders
+        'schedule': 60.0,  # Run every minute to claim due reminder occurrences
+    },
+    'refresh-schedule-index': {
+        'task': 'standups.tasks.refresh_schedule_index',
+        'schedule': 3600.0,  # Run every hour to extend the schedule index horizon
     },
     'send-follow-up-reminders': {
         'task': 'standups.tasks.send_follow_up_reminders',
         'schedule': 300.0,  # Run every 5 minutes
     },
+    'drain-slack-outbox': {
+        'task': 'slack_integration.tasks.drain_slack_outbox',
+        'schedule': 60.0,  # Run every minute to retry failed Slack messages
+    },
     'end-standups': {
         'task': 'standups.tasks.end_standups',
         'schedule': 300.0,  # Run every 5 minutes
@@ -37,6 +74,25 @@ app.conf.beat_schedule = {
 app.conf.timezone = 'UTC'
 
 
+def queue_depths():
+    """Number of messages waiting in each queue on the Redis broker"""
+    client = redis.Redis.from_url(app.conf.broker_url)
+    # Kombu keeps prioritised messages in extra lists next to the queue's own list
+    priority_lists = [''] + [f'\x06\x16{step}' for step in (3, 6, 9)]
+
+    pipeline = client.pipeline(transaction=False)
+    for name in QUEUES:
+        for suffix in priority_lists:
+            pipeline.llen(name + suffix)
+    lengths = pipeline.execute()
+
+    step = len(priority_lists)
+    return {
+        name: sum(lengths[index * step:(index + 1) * step])
+        for index, name in enumerate(QUEUES)
+    }
+
+
 @app.task(bind=True)
 def debug_task(self):
     print(f'Request: {self.request!r}')
\ No newline at end of file
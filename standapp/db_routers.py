@@ -0,0 +1,114 @@
+"""
+Routing of heavy reads to an optional read replica.
+
+Nothing goes to the replica unless a DATABASES alias named ``replica`` is
+configured and the code doing the reading opted in with replica_reads(), which
+the metrics views, admin list pages and daily metrics tasks do. Writes,
+migrations and reads inside a transaction on the primary always stay on
+``default``. The dashboard reads the primary: its payload is cached and
+stamped with the current team versions, so a lagging build would be served
+as current until the next change.
+
+The replica lags the primary slightly, so a user who just wrote is kept on the
+primary for DATABASE_REPLICA_STICKY_SECONDS: PrimaryStickinessMiddleware marks
+users after any unsafe request, and opted-in views skip the replica while the
+mark lasts so people always see their own changes.
+"""
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connections
+from rest_framework.permissions import SAFE_METHODS
+
+
+REPLICA = 'replica'
+
+_replica_reads = ContextVar('replica_reads', default=False)
+
+
+@contextmanager
+def replica_reads(enabled=True):
+    """Send reads made inside the block to the replica, when one is configured"""
+    token = _replica_reads.set(enabled)
+    try:
+        yield
+    finally:
+        _replica_reads.reset(token)
+
+
+def _sticky_key(user_id):
+    return f'replica:sticky:{user_id}'
+
+
+def mark_recent_write(user):
+    """Keep the user's reads on the primary until the replica has caught up with their write"""
+    if user.is_authenticated:
+        cache.set(_sticky_key(user.pk), True, settings.DATABASE_REPLICA_STICKY_SECONDS)
+
+
+def may_read_replica(request):
+    """Whether a request may be answered from the replica"""
+    user = request.user
+    return request.method in SAFE_METHODS and not (user.is_authenticated and cache.get(_sticky_key(user.pk)))
+
+
+class ReplicaRouter:
+    """Route opted-in reads to the replica alias and everything else to default"""
+
+    def db_for_read(self, model, **hints):
+        if _replica_reads.get() and REPLICA in settings.DATABASES and not connections['default'].in_atomic_block:
+            return REPLICA
+        return 'default'
+
+    def db_for_write(self, model, **hints):
+        return 'default'
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Both aliases hold the same data
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        return db == 'default'
+
+
+class PrimaryStickinessMiddleware:
+    """Mark users whose request may have written, so their next reads stay on the primary"""
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        response = self.get_response(request)
+        if request.method not in SAFE_METHODS and hasattr(request, 'user'):
+            mark_recent_write(request.user)
+        return response
+
+
+class ReplicaReadMixin:
+    """DRF view mixin answering safe requests from the replica unless the user just wrote"""
+
+    def initial(self, request, *args, **kwargs):
+        super().initial(request, *args, **kwargs)
+        # Authentication has run, so the stickiness check sees the real user
+        self._replica_token = _replica_reads.set(may_read_replica(request))
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        token = getattr(self, '_replica_token', None)
+        if token is not None:
+            _replica_reads.reset(token)
+            self._replica_token = None
+        return super().finalize_response(request, response, *args, **kwargs)
+
+
+class ReplicaChangeListMixin:
+    """ModelAdmin mixin rendering list pages from the replica unless the user just wrote"""
+
+    def changelist_view(self, request, extra_context=None):
+        with replica_reads(may_read_replica(request)):
+            response = super().changelist_view(request, extra_context)
+            # The list is queried while the template renders, so render inside the block
+            if hasattr(response, 'render'):
+                response.render()
+        return response
@@ -0,0 +1,242 @@
+"""
+Prometheus-style instrumentation for Celery tasks, Slack API calls and API views.
+
+Samples are accumulated in Redis hashes rather than process memory, so every
+gunicorn and Celery worker process adds to the same series and the /metrics
+endpoint reports correct totals no matter which worker serves the scrape.
+"""
+import logging
+import time
+from abc import ABC, abstractmethod
+from contextlib import ExitStack
+
+from celery.signals import task_postrun, task_prerun
+from django.conf import settings
+from django.db import connections
+from django.http import HttpResponse
+from django_redis import get_redis_connection
+
+logger = logging.getLogger(__name__)
+
+KEY_PREFIX = 'prometheus'
+
+DURATION_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 300.0)
+QUERY_COUNT_BUCKETS = (1, 2, 5, 10, 20, 50, 100, 200, 500)
+
+
+def _label_string(labels):
+    return ','.join(f'{name}="{_escape(value)}"' for name, value in sorted(labels.items()))
+
+
+def _series(name, labels):
+    return f'{name}{{{labels}}}' if labels else name
+
+
+def _escape(value):
+    return str(value).replace('\\', '\\\\').replace('\n', '\\n').replace('"', '\\"')
+
+
+def _redis():
+    return get_redis_connection('default')
+
+
+class Metric(ABC):
+    """Base class for a metric family stored in one Redis hash"""
+    type = None
+
+    def __init__(self, name, documentation, labelnames):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        REGISTRY.append(self)
+
+    @property
+    def key(self):
+        return f'{KEY_PREFIX}:{self.name}'
+
+    def _write(self, increments):
+        """Apply field increments in one pipeline; metrics must never break the caller"""
+        if not settings.METRICS_ENABLED:
+            return
+        try:
+            pipeline = _redis().pipeline(transaction=False)
+            for field, amount in increments:
+                pipeline.hincrbyfloat(self.key, field, amount)
+            pipeline.execute()
+        except Exception as e:
+            logger.debug(f"Could not record metric {self.name}: {e}")
+
+    @abstractmethod
+    def collect(self, fields):
+        """Render the stored fields of this metric in Prometheus text format"""
+
+
+class Counter(Metric):
+    """Monotonically increasing counter"""
+    type = 'counter'
+
+    def inc(self, amount=1, **labels):
+        self._write([(_label_string(labels), amount)])
+
+    def collect(self, fields):
+        return [
+            f'{_series(self.name + "_total", labels)} {value}'
+            for labels, value in sorted(fields.items())
+        ]
+
+
+class Histogram(Metric):
+    """Histogram with cumulative buckets, a sum and a count per label set"""
+    type = 'histogram'
+
+    def __init__(self, name, documentation, labelnames, buckets=DURATION_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = buckets
+
+    def observe(self, value, **labels):
+        labels = _label_string(labels)
+        increments = [
+            (f'{labels}|bucket|{bound}', 1) for bound in self.buckets if value <= bound
+        ]
+        increments += [
+            (f'{labels}|bucket|+Inf', 1),
+            (f'{labels}|sum', value),
+            (f'{labels}|count', 1),
+        ]
+        self._write(increments)
+
+    def collect(self, fields):
+        series = {}
+        for field, value in fields.items():
+            labels, _, suffix = field.partition('|')
+            series.setdefault(labels, {})[suffix] = value
+
+        lines = []
+        for labels, values in sorted(series.items()):
+            separator = ',' if labels else ''
+            for bound in [*self.buckets, '+Inf']:
+                count = values.get(f'bucket|{bound}', 0)
+                lines.append(f'{self.name}_bucket{{{labels}{separator}le="{bound}"}} {count}')
+            lines.append(f'{_series(self.name + "_sum", labels)} {values.get("sum", 0)}')
+            lines.append(f'{_series(self.name + "_count", labels)} {values.get("count", 0)}')
+        return lines
+
+
+class Gauge:
+    """Gauge whose values are read at scrape time from a callback returning {label value: value}"""
+    type = 'gauge'
+    key = None
+
+    def __init__(self, name, documentation, labelname, callback):
+        self.name = name
+        self.documentation = documentation
+        self.labelname = labelname
+        self.callback = callback
+        REGISTRY.append(self)
+
+    def collect(self, fields):
+        # A source that cannot be read leaves the family without samples instead of failing the scrape
+        try:
+            values = self.callback()
+        except Exception as e:
+            logger.warning(f"Could not read {self.name}: {e}")
+            return []
+        return [
+            f'{_series(self.name, _label_string({self.labelname: label}))} {value}'
+            for label, value in sorted(values.items())
+        ]
+
+
+def _queue_depths():
+    from standapp.celery import queue_depths
+    return queue_depths()
+
+
+REGISTRY = []
+
+CELERY_TASK_DURATION = Histogram(
+    'standapp_celery_task_duration_seconds', 'Celery task run time', ['task', 'state'])
+CELERY_TASKS = Counter(
+    'standapp_celery_tasks', 'Celery task runs by outcome', ['task', 'state'])
+SLACK_API_DURATION = Histogram(
+    'standapp_slack_api_duration_seconds', 'Slack Web API call latency', ['method'])
+SLACK_API_CALLS = Counter(
+    'standapp_slack_api_calls', 'Slack Web API calls by outcome', ['method', 'status'])
+HTTP_REQUEST_DURATION = Histogram(
+    'standapp_http_request_duration_seconds', 'API request latency per view', ['view', 'method', 'status'])
+HTTP_REQUEST_QUERIES = Histogram(
+    'standapp_http_request_queries', 'Database queries per API request', ['view'], buckets=QUERY_COUNT_BUCKETS)
+CELERY_QUEUE_DEPTH = Gauge(
+    'standapp_celery_queue_depth', 'Messages waiting in each Celery queue', 'queue', _queue_depths)
+
+
+def render_metrics():
+    """Render every registered metric in the Prometheus text exposition format"""
+    pipeline = _redis().pipeline(transaction=False)
+    stored_metrics = [metric for metric in REGISTRY if metric.key]
+    for metric in stored_metrics:
+        pipeline.hgetall(metric.key)
+    stored = dict(zip(stored_metrics, pipeline.execute()))
+
+    lines = []
+    for metric in REGISTRY:
+        lines.append(f'# HELP {metric.name} {metric.documentation}')
+        lines.append(f'# TYPE {metric.name} {metric.type}')
+        lines.extend(metric.collect({
+            field.decode(): float(value) for field, value in stored.get(metric, {}).items()
+        }))
+    return '\n'.join(lines) + '\n'
+
+
+def metrics_view(request):
+    """Expose the collected metrics for Prometheus to scrape"""
+    return HttpResponse(render_metrics(), content_type='text/plain; version=0.0.4; charset=utf-8')
+
+
+class PrometheusMiddleware:
+    """Record latency and database query counts for every request, per resolved view"""
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        queries = [0]
+
+        def count_queries(execute, sql, params, many, context):
+            queries[0] += 1
+            return execute(sql, params, many, context)
+
+        started = time.perf_counter()
+        with ExitStack() as stack:
+            # Every alias, so reads routed to the replica are counted too
+            for db in connections.all():
+                stack.enter_context(db.execute_wrapper(count_queries))
+            response = self.get_response(request)
+        duration = time.perf_counter() - started
+
+        match = request.resolver_match
+        view = match.view_name if match else 'unresolved'
+        if view != 'metrics':
+            HTTP_REQUEST_DURATION.observe(
+                duration, view=view, method=request.method, status=response.status_code)
+            HTTP_REQUEST_QUERIES.observe(queries[0], view=view)
+
+        return response
+
+
+_task_started = {}
+
+
+@task_prerun.connect
+def _record_task_start(task_id=None, **kwargs):
+    _task_started[task_id] = time.perf_counter()
+
+
+@task_postrun.connect
+def _record_task_finish(task_id=None, task=None, state=None, **kwargs):
+    started = _task_started.pop(task_id, None)
+    if started is None:
+        return
+    state = state or 'UNKNOWN'
+    CELERY_TASK_DURATION.observe(time.perf_counter() - started, task=task.name, state=state)
+    CELERY_TASKS.inc(task=task.name, state=state)
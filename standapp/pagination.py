@@ -0,0 +1,137 @@
+"""
+Keyset pagination for the API's list endpoints.
+
+Pages are addressed by an opaque cursor holding the full ordering key of the
+last row seen rather than an offset, so each page is an index range scan that
+costs the same however deep the client has scrolled, and rows inserted
+meanwhile never shift or repeat entries. Every ordering ends in the primary key
+so that the key is unique.
+
+DRF's own CursorPagination only compares the first ordering field and falls
+back to an offset for ties, which turns back into OFFSET paging on columns
+like ``date`` that many rows share; this subclass compares the whole key.
+"""
+import json
+from base64 import b64decode, b64encode
+from urllib import parse
+
+from django.conf import settings
+from django.core.exceptions import ValidationError
+from django.db.models import Q
+from rest_framework import pagination
+from rest_framework.exceptions import NotFound
+from rest_framework.utils.urls import replace_query_param
+
+
+def _reverse_ordering(ordering):
+    return tuple(field[1:] if field.startswith('-') else f'-{field}' for field in ordering)
+
+
+class CursorPagination(pagination.CursorPagination):
+    """Keyset cursor pagination, newest rows first by default"""
+    ordering = ('-id',)
+    page_size_query_param = 'page_size'
+    max_page_size = settings.API_MAX_PAGE_SIZE
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        self.page_size = self.get_page_size(request)
+        if not self.page_size:
+            return None
+
+        self.base_url = request.build_absolute_uri()
+        self.ordering = self.get_ordering(request, queryset, view)
+        self.cursor = self.decode_cursor(request)
+        reverse, position = (self.cursor.reverse, self.cursor.position) if self.cursor else (False, None)
+
+        ordering = _reverse_ordering(self.ordering) if reverse else self.ordering
+        queryset = queryset.order_by(*ordering)
+        if position is not None:
+            queryset = queryset.filter(self._following(ordering, position))
+
+        try:
+            results = list(queryset[:self.page_size + 1])
+        except ValidationError:
+            raise NotFound(self.invalid_cursor_message)
+        self.page = results[:self.page_size]
+        has_more = len(results) > self.page_size
+
+        if reverse:
+            self.page.reverse()
+            self.has_next, self.has_previous = True, has_more
+        else:
+            self.has_next, self.has_previous = has_more, position is not None
+
+        if (self.has_previous or self.has_next) and self.template is not None:
+            self.display_page_controls = True
+
+        return self.page
+
+    def _following(self, ordering, position):
+        """Filter for the rows that sort after ``position`` in ``ordering``"""
+        condition = Q()
+        equal = {}
+        for field, value in zip(ordering, position):
+            name = field.lstrip('-')
+            lookup = 'lt' if field.startswith('-') else 'gt'
+            condition |= Q(**equal, **{f'{name}__{lookup}': value})
+            equal[name] = value
+        return condition
+
+    def get_next_link(self):
+        if not self.has_next:
+            return None
+        position = self._get_position_from_instance(self.page[-1], self.ordering) if self.page else self.cursor.position
+        return self.encode_cursor(pagination.Cursor(offset=0, reverse=False, position=position))
+
+    def get_previous_link(self):
+        if not self.has_previous:
+            return None
+        position = self._get_position_from_instance(self.page[0], self.ordering) if self.page else self.cursor.position
+        return self.encode_cursor(pagination.Cursor(offset=0, reverse=True, position=position))
+
+    def decode_cursor(self, request):
+        encoded = request.query_params.get(self.cursor_query_param)
+        if encoded is None:
+            return None
+
+        try:
+            tokens = parse.parse_qs(b64decode(encoded.encode('ascii')).decode('ascii'))
+            reverse = bool(int(tokens.get('r', ['0'])[0]))
+            position = json.loads(tokens['p'][0])
+        except (KeyError, TypeError, ValueError):
+            raise NotFound(self.invalid_cursor_message)
+
+        if not isinstance(position, list) or len(position) != len(self.ordering):
+            raise NotFound(self.invalid_cursor_message)
+        return pagination.Cursor(offset=0, reverse=reverse, position=position)
+
+    def encode_cursor(self, cursor):
+        tokens = {'p': json.dumps(cursor.position)}
+        if cursor.reverse:
+            tokens['r'] = '1'
+        encoded = b64encode(parse.urlencode(tokens).encode('ascii')).decode('ascii')
+        return replace_query_param(self.base_url, self.cursor_query_param, encoded)
+
+    def _get_position_from_instance(self, instance, ordering):
+        values = []
+        for field in ordering:
+            name = field.lstrip('-')
+            value = instance[name] if isinstance(instance, dict) else getattr(instance, name)
+            values.append(value if isinstance(value, (int, str)) else str(value))
+        return values
+
+
+class DateCursorPagination(CursorPagination):
+    """Cursor pagination for per-day rows such as stand-ups and metrics"""
+    ordering = ('-date', 'id')
+
+
+class SubmittedAtCursorPagination(CursorPagination):
+    """Cursor pagination for stand-up responses, most recently submitted first"""
+    ordering = ('-submitted_at', 'id')
+
+
+class NameCursorPagination(CursorPagination):
+    """Cursor pagination in alphabetical order of a unique name"""
+    ordering = ('name', 'id')
@@ -13,6 +13,8 @@ https://docs.djangoproject.com/en/5.2/ref/settings/
 from pathlib import Path
 import os
 
+from corsheaders.defaults import default_headers
+
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
 BASE_DIR = Path(__file__).resolve().parent.parent
 
@@ -58,12 +60,14 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    'standapp.instrumentation.PrometheusMiddleware',
     'corsheaders.middleware.CorsMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
+    'standapp.db_routers.PrimaryStickinessMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
 ]
@@ -78,6 +82,10 @@ CORS_ALLOWED_ORIGINS = [
 
 CORS_ALLOW_CREDENTIALS = True
 
+# Let the frontend revalidate API responses with If-None-Match
+CORS_ALLOW_HEADERS = (*default_headers, 'if-none-match')
+CORS_EXPOSE_HEADERS = ['ETag']
+
 # Trust proxy headers from nginx
 USE_X_FORWARDED_HOST = True
 USE_X_FORWARDED_PORT = True
@@ -123,6 +131,18 @@ DATABASES = {
     }
 }
 
+# Optional streaming replica for analytics and dashboard reads (see standapp.db_routers)
+if os.environ.get('DB_REPLICA_HOST'):
+    DATABASES['replica'] = {
+        **DATABASES['default'],
+        'HOST': os.environ['DB_REPLICA_HOST'],
+        'PORT': os.environ.get('DB_REPLICA_PORT', DATABASES['default']['PORT']),
+        'TEST': {'MIRROR': 'default'},
+    }
+
+DATABASE_ROUTERS = ['standapp.db_routers.ReplicaRouter']
+DATABASE_REPLICA_STICKY_SECONDS = int(os.environ.get('DATABASE_REPLICA_STICKY_SECONDS', '10'))  # primary-only reads after a user's write
+
 # Redis Configuration
 REDIS_URL = os.environ.get('REDIS_URL', 'redis://localhost:6379/0')
 
@@ -137,6 +157,9 @@ CACHES = {
     }
 }
 
+# Prometheus metrics are accumulated in Redis so all worker processes share them
+METRICS_ENABLED = os.environ.get('METRICS_ENABLED', 'True') == 'True'
+
 # Session engine using Redis
 SESSION_ENGINE = 'django.contrib.sessions.backends.cache'
 SESSION_CACHE_ALIAS = 'default'
@@ -190,6 +213,9 @@ STATICFILES_FINDERS = [
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
 # REST Framework configuration
+API_PAGE_SIZE = int(os.environ.get('API_PAGE_SIZE', '50'))  # rows per page when the client does not ask
+API_MAX_PAGE_SIZE = int(os.environ.get('API_MAX_PAGE_SIZE', '200'))  # cap on the page_size query parameter
+
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': [
         'rest_framework.authentication.SessionAuthentication',
@@ -198,6 +224,8 @@ REST_FRAMEWORK = {
         'rest_framework.permissions.IsAuthenticated',
     ],
     'DEFAULT_SCHEMA_CLASS': 'drf_spectacular.openapi.AutoSchema',
+    'DEFAULT_PAGINATION_CLASS': 'standapp.pagination.CursorPagination',
+    'PAGE_SIZE': API_PAGE_SIZE,
 }
 
 # drf-spectacular settings
@@ -224,8 +252,23 @@ CELERY_TIMEZONE = TIME_ZONE
 SLACK_BOT_TOKEN = os.environ.get('SLACK_BOT_TOKEN')
 SLACK_SIGNING_SECRET = os.environ.get('SLACK_SIGNING_SECRET')
 SLACK_APP_TOKEN = os.environ.get('SLACK_APP_TOKEN')
+SLACK_DELIVERY_MAX_WORKERS = int(os.environ.get('SLACK_DELIVERY_MAX_WORKERS', '8'))  # concurrent Slack calls per task
+SLACK_DELIVERY_MAX_RETRIES = int(os.environ.get('SLACK_DELIVERY_MAX_RETRIES', '3'))  # retries after a 429
+SLACK_POST_MESSAGE_RATE_PER_MINUTE = int(os.environ.get('SLACK_POST_MESSAGE_RATE_PER_MINUTE', '300'))  # per workspace
+SLACK_OUTBOX_BATCH_SIZE = int(os.environ.get('SLACK_OUTBOX_BATCH_SIZE', '500'))  # messages per drain batch
+SLACK_OUTBOX_MAX_ATTEMPTS = int(os.environ.get('SLACK_OUTBOX_MAX_ATTEMPTS', '8'))  # attempts before a message is dead-lettered
+SLACK_OUTBOX_BACKOFF_SECONDS = int(os.environ.get('SLACK_OUTBOX_BACKOFF_SECONDS', '30'))  # first retry delay, doubled per attempt
+SLACK_OUTBOX_MAX_BACKOFF_SECONDS = int(os.environ.get('SLACK_OUTBOX_MAX_BACKOFF_SECONDS', '3600'))  # longest retry delay
+SLACK_OUTBOX_LEASE_SECONDS = int(os.environ.get('SLACK_OUTBOX_LEASE_SECONDS', '300'))  # how long a sender owns a batch before the drainer may retry it
 
 # Stand-up App Configuration
 STANDUP_REMINDER_TIME = os.environ.get('STANDUP_REMINDER_TIME', '09:00')
 STANDUP_END_TIME = os.environ.get('STANDUP_END_TIME', '16:00')
 STANDUP_FOLLOW_UP_INTERVAL = int(os.environ.get('STANDUP_FOLLOW_UP_INTERVAL', '60'))  # minutes
+STANDUP_REMINDER_CHUNK_SIZE = int(os.environ.get('STANDUP_REMINDER_CHUNK_SIZE', '200'))  # members per reminder task
+STANDUP_SCHEDULE_INDEX_DAYS = int(os.environ.get('STANDUP_SCHEDULE_INDEX_DAYS', '14'))  # days of precomputed fire times
+STANDUP_SCHEDULE_GRACE_MINUTES = int(os.environ.get('STANDUP_SCHEDULE_GRACE_MINUTES', '15'))  # how late an occurrence may still fire
+STANDUP_IDEMPOTENCY_TTL = int(os.environ.get('STANDUP_IDEMPOTENCY_TTL', str(36 * 3600)))  # seconds a dispatch key is kept
+DASHBOARD_CACHE_TTL = int(os.environ.get('DASHBOARD_CACHE_TTL', '300'))  # seconds a dashboard payload is served
+DASHBOARD_CACHE_LOCK_SECONDS = int(os.environ.get('DASHBOARD_CACHE_LOCK_SECONDS', '5'))  # how long others wait for a rebuild
+MEMBERSHIP_CACHE_TTL = int(os.environ.get('MEMBERSHIP_CACHE_TTL', '3600'))  # seconds a user's team roles are cached
@@ -0,0 +1,90 @@
+from unittest import mock
+
+import redis
+from django.contrib.auth.models import User
+from django.db import connection, connections
+from django.http import HttpResponse
+from django.test import RequestFactory, SimpleTestCase, TestCase
+
+from . import instrumentation
+from .instrumentation import (
+    CELERY_QUEUE_DEPTH, HTTP_REQUEST_QUERIES, SLACK_API_CALLS, SLACK_API_DURATION, PrometheusMiddleware,
+    render_metrics
+)
+
+
+class FakePipeline:
+    """Redis pipeline stand-in answering HGETALL from fixed hashes"""
+
+    def __init__(self, hashes):
+        self.hashes = hashes
+        self.keys = []
+
+    def hgetall(self, key):
+        self.keys.append(key)
+
+    def execute(self):
+        return [self.hashes.get(key, {}) for key in self.keys]
+
+
+class MetricsExpositionTestCase(SimpleTestCase):
+    """Test case for rendering the Prometheus /metrics exposition"""
+
+    def setUp(self):
+        connection = mock.Mock()
+        connection.pipeline.return_value = FakePipeline({
+            SLACK_API_CALLS.key: {b'method="chat.postMessage",status="ok"': b'3'},
+            SLACK_API_DURATION.key: {
+                b'method="chat.postMessage"|bucket|0.25': b'2',
+                b'method="chat.postMessage"|bucket|+Inf': b'2',
+                b'method="chat.postMessage"|sum': b'0.3',
+                b'method="chat.postMessage"|count': b'2',
+            },
+        })
+        patcher = mock.patch.object(instrumentation, '_redis', return_value=connection)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_renders_counters_histograms_and_gauges(self):
+        """Test that stored samples and queue depths are rendered in the text format"""
+        with mock.patch.object(CELERY_QUEUE_DEPTH, 'callback', return_value={'bulk': 2}):
+            lines = render_metrics().splitlines()
+
+        self.assertIn('# TYPE standapp_slack_api_calls counter', lines)
+        self.assertIn('standapp_slack_api_calls_total{method="chat.postMessage",status="ok"} 3.0', lines)
+        self.assertIn('standapp_slack_api_duration_seconds_bucket{method="chat.postMessage",le="0.1"} 0', lines)
+        self.assertIn('standapp_slack_api_duration_seconds_bucket{method="chat.postMessage",le="0.25"} 2.0', lines)
+        self.assertIn('standapp_slack_api_duration_seconds_count{method="chat.postMessage"} 2.0', lines)
+        self.assertIn('standapp_celery_queue_depth{queue="bulk"} 2', lines)
+
+    def test_unreachable_broker_omits_queue_depths(self):
+        """Test that the scrape still succeeds without queue depths when the broker is down"""
+        with mock.patch.object(CELERY_QUEUE_DEPTH, 'callback', side_effect=redis.ConnectionError('refused')):
+            response = self.client.get('/metrics')
+
+        self.assertEqual(response.status_code, 200)
+        lines = response.content.decode().splitlines()
+        self.assertIn('# TYPE standapp_celery_queue_depth gauge', lines)
+        self.assertFalse([line for line in lines if line.startswith('standapp_celery_queue_depth{')])
+        self.assertIn('standapp_slack_api_calls_total{method="chat.postMessage",status="ok"} 3.0', lines)
+
+
+class PrometheusMiddlewareTestCase(TestCase):
+    """Test case for the per-request latency and query count metrics"""
+
+    def test_queries_on_every_connection_are_counted(self):
+        """Test that queries routed to another alias, such as the replica, count towards the request"""
+        replica = connections.create_connection('default')
+        self.addCleanup(replica.close)
+
+        def get_response(request):
+            User.objects.exists()
+            with replica.cursor() as cursor:
+                cursor.execute('SELECT 1')
+            return HttpResponse()
+
+        with mock.patch.object(connections, 'all', return_value=[connection, replica]), \
+                mock.patch.object(HTTP_REQUEST_QUERIES, 'observe') as observe:
+            PrometheusMiddleware(get_response)(RequestFactory().get('/'))
+
+        self.assertEqual(observe.call_args.args[0], 2)
@@ -21,6 +21,7 @@ from django.conf.urls.static import static
 from django.shortcuts import redirect
 from django.views.decorators.csrf import csrf_exempt
 from django.http import JsonResponse
+from standapp.instrumentation import metrics_view
 from drf_spectacular.views import SpectacularAPIView, SpectacularRedocView, SpectacularSwaggerView
 
 
@@ -31,6 +32,7 @@ def root_view(request):
 urlpatterns = [
     path('', root_view, name='root'),
     path('admin/', admin.site.urls),
+    path('metrics', metrics_view, name='metrics'),
     # API endpoints
     path('api/auth/', include('authentication.urls')),
     path('api/teams/', include('teams.urls')),
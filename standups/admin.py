@@ -1,13 +1,18 @@
 from django.contrib import admin
-from .models import Standup, StandupResponse, StandupReminder, StandupMetrics
+
+from standapp.db_routers import ReplicaChangeListMixin
+from .models import Standup, StandupResponse, StandupReminder, StandupMetrics, UserStreak
 
 
 @admin.register(Standup)
-class StandupAdmin(admin.ModelAdmin):
+class StandupAdmin(ReplicaChangeListMixin, admin.ModelAdmin):
     list_display = ['team', 'date', 'status', 'completion_rate_display', 'started_at', 'ended_at']
     list_filter = ['status', 'date', 'team', 'created_at']
     search_fields = ['team__name']
-    readonly_fields = ['created_at', 'updated_at', 'completion_rate_display']
+    readonly_fields = [
+        'active_member_count', 'response_count', 'completion_rate',
+        'created_at', 'updated_at', 'completion_rate_display'
+    ]
     date_hierarchy = 'date'
     
     def completion_rate_display(self, obj):
@@ -16,7 +21,7 @@ class StandupAdmin(admin.ModelAdmin):
 
 
 @admin.register(StandupResponse)
-class StandupResponseAdmin(admin.ModelAdmin):
+class StandupResponseAdmin(ReplicaChangeListMixin, admin.ModelAdmin):
     list_display = ['user', 'standup', 'mood', 'submitted_at']
     list_filter = ['mood', 'submitted_at', 'standup__team']
     search_fields = ['user__username', 'standup__team__name', 'yesterday_work', 'today_work']
@@ -25,7 +30,7 @@ class StandupResponseAdmin(admin.ModelAdmin):
 
 
 @admin.register(StandupReminder)
-class StandupReminderAdmin(admin.ModelAdmin):
+class StandupReminderAdmin(ReplicaChangeListMixin, admin.ModelAdmin):
     list_display = ['user', 'standup', 'reminder_type', 'sent_at', 'responded']
     list_filter = ['reminder_type', 'responded', 'sent_at', 'standup__team']
     search_fields = ['user__username', 'standup__team__name']
@@ -34,9 +39,17 @@ class StandupReminderAdmin(admin.ModelAdmin):
 
 
 @admin.register(StandupMetrics)
-class StandupMetricsAdmin(admin.ModelAdmin):
+class StandupMetricsAdmin(ReplicaChangeListMixin, admin.ModelAdmin):
     list_display = ['team', 'date', 'completion_rate', 'responses_count', 'total_members']
     list_filter = ['date', 'team']
     search_fields = ['team__name']
     readonly_fields = ['created_at']
     date_hierarchy = 'date'
+
+
+@admin.register(UserStreak)
+class UserStreakAdmin(admin.ModelAdmin):
+    list_display = ['user', 'team', 'current_streak', 'longest_streak', 'last_standup_date']
+    list_filter = ['team']
+    search_fields = ['user__username', 'team__name']
+    readonly_fields = ['updated_at']
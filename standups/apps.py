@@ -4,3 +4,8 @@ from django.apps import AppConfig
 class StandupsConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'standups'
+
+    def ready(self):
+        # Registers the Celery task signal handlers in web and worker processes
+        import standapp.instrumentation  # noqa: F401
+        from . import signals  # noqa: F401
@@ -0,0 +1,43 @@
+"""
+Conditional GET support for the stand-up API.
+
+ETags are derived from the version tokens in standups.versions rather than from
+the rows themselves, so deciding that a client's copy is still current costs at
+most one membership query and one cache read, and a match is answered with
+304 Not Modified before the queryset is evaluated or anything is serialized.
+"""
+import hashlib
+
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.http import quote_etag
+
+from .versions import ALL_TEAMS_KEY, get_versions, member_keys, user_key
+
+
+def not_modified(request, etag):
+    """A 304 response when the request's If-None-Match matches etag, otherwise None"""
+    response = get_conditional_response(request, etag=etag)
+    if response is not None:
+        patch_cache_control(response, private=True, no_cache=True)
+    return response
+
+
+def with_etag(response, etag):
+    """Tag a response so clients revalidate it with If-None-Match instead of reusing it blindly"""
+    response['ETag'] = etag
+    patch_cache_control(response, private=True, no_cache=True)
+    return response
+
+
+class ConditionalListMixin:
+    """Answer list requests with 304 Not Modified while none of the visible teams has changed"""
+
+    def get_list_etag(self, request):
+        user = request.user
+        keys = [ALL_TEAMS_KEY, user_key(user.id)] if user.is_superuser else member_keys(user)
+        versions = sorted(get_versions(keys).items())
+        return quote_etag(hashlib.md5(f'{user.id}:{request.get_full_path()}:{versions}'.encode()).hexdigest())
+
+    def list(self, request, *args, **kwargs):
+        etag = self.get_list_etag(request)
+        return not_modified(request, etag) or with_etag(super().list(request, *args, **kwargs), etag)
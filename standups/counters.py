@@ -0,0 +1,97 @@
+"""
+Participation counters denormalized onto Standup.
+
+``response_count`` and ``completion_rate`` move with every response, in a
+single UPDATE computed from the row's current values so concurrent responses
+cannot lose increments. ``active_member_count`` is the team's active
+membership while the stand-up is open and is frozen once it closes, so later
+joiners and leavers do not rewrite past completion rates. Writes that bypass
+model signals (bulk loads, raw SQL) are repaired by reconcile_counters().
+"""
+from django.db.models import Case, Count, ExpressionWrapper, F, FloatField, OuterRef, Subquery, Value, When
+from django.db.models.functions import Cast, Coalesce
+from django.db.models.lookups import GreaterThan
+
+from teams.models import TeamMember
+from .models import Standup, StandupResponse
+
+
+# Stand-ups whose member count still follows the team's membership
+OPEN_STATUSES = ('pending', 'in_progress')
+
+
+def completion_rate(responses, members):
+    """SQL expression for the percentage of members who responded"""
+    return Case(
+        When(
+            GreaterThan(members, 0),
+            then=ExpressionWrapper(Cast(responses, FloatField()) * 100 / members, output_field=FloatField())
+        ),
+        default=Value(0.0),
+        output_field=FloatField()
+    )
+
+
+def active_member_count(team_id):
+    return TeamMember.objects.filter(team_id=team_id, is_active=True).count()
+
+
+def add_responses(standup_id, delta):
+    """Move a stand-up's response count, and its completion rate with it, by delta"""
+    responses = F('response_count') + delta
+    Standup.objects.filter(id=standup_id).update(
+        response_count=responses,
+        completion_rate=completion_rate(responses, F('active_member_count'))
+    )
+
+
+def refresh_member_counts(team_id):
+    """Recount the active members behind a team's open stand-ups"""
+    members = Value(active_member_count(team_id))
+    Standup.objects.filter(team_id=team_id, status__in=OPEN_STATUSES).update(
+        active_member_count=members,
+        completion_rate=completion_rate(F('response_count'), members)
+    )
+
+
+def reconcile_counters(standups, snapshot_closed=False, batch_size=1000):
+    """Recompute the counters of the given stand-ups from their rows and return how many had drifted.
+
+    Member counts of closed stand-ups are snapshots and are only retaken from
+    the current membership when snapshot_closed is set.
+    """
+    responses = Coalesce(Subquery(
+        StandupResponse.objects.filter(
+            standup=OuterRef('pk')
+        ).order_by().values('standup').annotate(total=Count('id')).values('total')
+    ), 0)
+    members = Coalesce(Subquery(
+        TeamMember.objects.filter(
+            team=OuterRef('team'),
+            is_active=True
+        ).order_by().values('team').annotate(total=Count('id')).values('total')
+    ), 0)
+    if not snapshot_closed:
+        members = Case(
+            When(status__in=OPEN_STATUSES, then=members),
+            default=F('active_member_count')
+        )
+
+    drifted = list(
+        standups.annotate(
+            actual_responses=responses,
+            actual_members=members
+        ).exclude(
+            response_count=F('actual_responses'),
+            active_member_count=F('actual_members')
+        ).order_by().values_list('id', flat=True)
+    )
+
+    for start in range(0, len(drifted), batch_size):
+        Standup.objects.filter(id__in=drifted[start:start + batch_size]).update(
+            response_count=responses,
+            active_member_count=members,
+            completion_rate=completion_rate(responses, members)
+        )
+
+    return len(drifted)
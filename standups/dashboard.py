@@ -0,0 +1,57 @@
+"""
+Per-user cache of the dashboard payload.
+
+Each cached payload is stamped with the version tokens of the user and of every
+team they belong to (see standups.versions), read just before the payload was
+built, and is only served while all of them still match. A miss is rebuilt by
+a single request per user; concurrent requests wait for that result instead of
+running the same queries.
+"""
+import hashlib
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+from django.utils import timezone
+
+from .locks import task_lock
+from .versions import get_versions, is_current, member_keys
+
+
+def _is_current(entry):
+    return entry is not None and is_current(entry['versions'])
+
+
+def _rebuild(user, key, build):
+    # Versions are read before building, so a change made meanwhile leaves the entry stale
+    versions = get_versions(member_keys(user))
+    etag = hashlib.md5(f'{key}:{sorted(versions.items())}'.encode()).hexdigest()
+
+    data = build()
+    cache.set(key, {'versions': versions, 'etag': etag, 'data': data}, settings.DASHBOARD_CACHE_TTL)
+    return data, etag
+
+
+def get_dashboard(user, build):
+    """Return the user's dashboard payload and its ETag, calling build() only on a cache miss.
+
+    The ETag is None when the payload had to be built without the cache.
+    """
+    key = f'dashboard:{user.id}:{timezone.now().date()}'
+    entry = cache.get(key)
+    if _is_current(entry):
+        return entry['data'], entry['etag']
+
+    with task_lock(f'dashboard:{user.id}', settings.DASHBOARD_CACHE_LOCK_SECONDS) as acquired:
+        if acquired:
+            return _rebuild(user, key, build)
+
+    # Another request is already rebuilding this dashboard
+    deadline = time.monotonic() + settings.DASHBOARD_CACHE_LOCK_SECONDS
+    while time.monotonic() < deadline:
+        time.sleep(0.05)
+        entry = cache.get(key)
+        if _is_current(entry):
+            return entry['data'], entry['etag']
+
+    return build(), None
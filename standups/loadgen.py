@@ -0,0 +1,390 @@
+"""
+Reproducible synthetic data for capacity planning and benchmarks.
+
+Everything is derived from one seeded random generator, so the same arguments
+always produce the same workspaces, teams, members and stand-up history. Parent
+rows are written with bulk_create; the high-volume rows (responses, reminders,
+Slack messages and interactions) are streamed with COPY on PostgreSQL and fall
+back to bulk_create elsewhere.
+"""
+import io
+import json
+import math
+import random
+from collections import Counter
+from contextlib import contextmanager
+from datetime import date, datetime, time, timedelta
+
+import pytz
+from django.contrib.auth.hashers import make_password
+from django.contrib.auth.models import User
+from django.db import connection, transaction
+
+from slack_integration.models import (
+    SlackChannelMapping, SlackInteraction, SlackMessage, SlackUserMapping, SlackWorkspace
+)
+from teams.models import Team, TeamMember, StandupSchedule
+from teams.scheduling import extend_schedule_index
+from .counters import reconcile_counters
+from .models import Standup, StandupReminder, StandupResponse
+
+
+TIMEZONES = [
+    ('America/New_York', 30), ('America/Los_Angeles', 20), ('Europe/London', 15),
+    ('Europe/Berlin', 15), ('Asia/Kolkata', 10), ('Australia/Sydney', 5), ('UTC', 5),
+]
+MOODS = [('great', 20), ('good', 45), ('okay', 20), ('stressed', 10), ('blocked', 5)]
+WORK_ITEMS = [
+    'Reviewed pull requests', 'Fixed flaky integration tests', 'Paired on the billing migration',
+    'Worked on the onboarding flow', 'Investigated a production alert', 'Wrote the design doc',
+    'Refactored the notification service', 'Updated API documentation', 'Planned the next sprint',
+    'Triaged support tickets', 'Improved dashboard load time', 'Added metrics to the export job',
+]
+BLOCKERS = [
+    'Waiting on access to the staging database', 'Blocked by the pending security review',
+    'Need a decision on the API contract', 'CI has been failing on main',
+]
+
+# Follow-ups go out 30 minutes after the start and hourly after that
+FOLLOW_UP_DELAY = timedelta(minutes=30)
+FOLLOW_UP_INTERVAL = timedelta(minutes=60)
+
+
+def _weighted(rng, choices):
+    values, weights = zip(*choices)
+    return rng.choices(values, weights)[0]
+
+
+@contextmanager
+def _historical_timestamps(*models):
+    """Let bulk_create keep generated created/sent timestamps instead of stamping now()"""
+    fields = [
+        field for model in models for field in model._meta.concrete_fields
+        if getattr(field, 'auto_now', False) or getattr(field, 'auto_now_add', False)
+    ]
+    saved = [(field, field.auto_now, field.auto_now_add) for field in fields]
+    for field in fields:
+        field.auto_now = field.auto_now_add = False
+    try:
+        yield
+    finally:
+        for field, auto_now, auto_now_add in saved:
+            field.auto_now, field.auto_now_add = auto_now, auto_now_add
+
+
+def _copy_value(value):
+    """Encode one value for COPY ... FROM STDIN in text format"""
+    if value is None:
+        return '\\N'
+    if isinstance(value, bool):
+        return 't' if value else 'f'
+    if isinstance(value, (dict, list)):
+        value = json.dumps(value)
+    elif isinstance(value, (datetime, date, time)):
+        value = value.isoformat()
+    return str(value).replace('\\', '\\\\').replace('\t', '\\t').replace('\n', '\\n').replace('\r', '\\r')
+
+
+class RowWriter:
+    """Buffer rows of one model and flush them with COPY or bulk_create"""
+
+    def __init__(self, model, fields, batch_size, use_copy):
+        self.model = model
+        self.fields = fields
+        self.batch_size = batch_size
+        self.use_copy = use_copy
+        self.rows = []
+        self.written = 0
+
+    def add(self, *values):
+        self.rows.append(values)
+        if len(self.rows) >= self.batch_size:
+            self.flush()
+
+    def flush(self):
+        if not self.rows:
+            return
+        if self.use_copy:
+            self._copy()
+        else:
+            self.model.objects.bulk_create(
+                [self.model(**dict(zip(self.fields, row))) for row in self.rows],
+                batch_size=self.batch_size
+            )
+        self.written += len(self.rows)
+        self.rows = []
+
+    def _copy(self):
+        columns = ', '.join(
+            connection.ops.quote_name(self.model._meta.get_field(name).column) for name in self.fields
+        )
+        buffer = io.StringIO()
+        for row in self.rows:
+            buffer.write('\t'.join(_copy_value(value) for value in row))
+            buffer.write('\n')
+        buffer.seek(0)
+        with connection.cursor() as cursor:
+            cursor.copy_expert(
+                f'COPY {connection.ops.quote_name(self.model._meta.db_table)} ({columns}) FROM STDIN',
+                buffer
+            )
+
+
+class LoadGenerator:
+    """Generate a synthetic tenant population and its stand-up history"""
+
+    def __init__(self, workspaces=1, teams=10, members=8, days=30, seed=0,
+                 end_date=None, batch_size=10000, log=None):
+        self.workspaces = workspaces
+        self.teams = teams
+        self.members = members
+        self.days = days
+        self.seed = seed
+        self.end_date = end_date or date.today() - timedelta(days=1)
+        self.batch_size = batch_size
+        self.log = log or (lambda message: None)
+        self.rng = random.Random(seed)
+        self.prefix = f'load{seed}'
+        self.message_seq = 0
+        self.counts = Counter()
+
+    def run(self):
+        """Write the whole dataset and return the number of rows per model"""
+        if User.objects.filter(username__startswith=f'{self.prefix}-').exists():
+            raise ValueError(f"Data for seed {self.seed} already exists")
+
+        use_copy = connection.vendor == 'postgresql'
+        self.writers = {
+            'responses': RowWriter(StandupResponse, [
+                'standup_id', 'user_id', 'yesterday_work', 'today_work', 'blockers', 'mood',
+                'submitted_at', 'updated_at',
+            ], self.batch_size, use_copy),
+            'reminders': RowWriter(StandupReminder, [
+                'standup_id', 'user_id', 'reminder_type', 'sent_at', 'slack_message_ts', 'responded',
+            ], self.batch_size, use_copy),
+            'messages': RowWriter(SlackMessage, [
+                'workspace_id', 'channel_id', 'user_id', 'message_ts', 'message_type', 'content',
+                'standup_id', 'sent_at',
+            ], self.batch_size, use_copy),
+            'interactions': RowWriter(SlackInteraction, [
+                'workspace_id', 'user_id', 'interaction_type', 'trigger_id', 'callback_id', 'payload',
+                'standup_id', 'created_at',
+            ], self.batch_size, use_copy),
+        }
+
+        with _historical_timestamps(Standup, StandupResponse, StandupReminder, SlackMessage, SlackInteraction):
+            for index in range(self.workspaces):
+                with transaction.atomic():
+                    self._generate_workspace(index)
+                self.log(f"Workspace {index + 1}/{self.workspaces}: {sum(self.counts.values())} rows")
+
+        # bulk_create skips the signals that index new schedules and count participation
+        extend_schedule_index()
+        reconcile_counters(Standup.objects.filter(team__name__startswith=f'Load {self.seed} team '), snapshot_closed=True)
+
+        return self.counts
+
+    def _generate_workspace(self, index):
+        rng = self.rng
+        workspace = SlackWorkspace.objects.create(
+            team_id=f'T{self.seed:04X}{index:05X}',
+            team_name=f'Load {self.seed} workspace {index}',
+            bot_user_id=f'B{self.seed:04X}{index:05X}',
+            bot_access_token='xoxb-load-test'
+        )
+        self.counts['workspaces'] += 1
+
+        # Team sizes are skewed: most teams are small, a few are large
+        sizes = [
+            max(2, round(rng.lognormvariate(math.log(self.members), 0.5)))
+            for _ in range(self.teams)
+        ]
+
+        password = make_password(None)
+        users = User.objects.bulk_create([
+            User(
+                username=f'{self.prefix}-{index}-{number}',
+                email=f'{self.prefix}-{index}-{number}@example.com',
+                first_name='Load',
+                last_name=f'User {number}',
+                password=password
+            )
+            for number in range(sum(sizes))
+        ], batch_size=self.batch_size)
+        slack_ids = {
+            user.id: f'U{self.seed:04X}{index:04X}{number:06X}' for number, user in enumerate(users)
+        }
+        SlackUserMapping.objects.bulk_create([
+            SlackUserMapping(
+                user=user,
+                slack_user_id=slack_ids[user.id],
+                slack_username=user.username,
+                slack_email=user.email,
+                workspace=workspace
+            )
+            for user in users
+        ], batch_size=self.batch_size)
+
+        teams = Team.objects.bulk_create([
+            Team(
+                name=f'Load {self.seed} team {index}-{number}',
+                slack_channel_id=f'C{self.seed:04X}{index:04X}{number:06X}'
+            )
+            for number in range(self.teams)
+        ])
+        SlackChannelMapping.objects.bulk_create([
+            SlackChannelMapping(
+                team=team,
+                workspace=workspace,
+                channel_id=team.slack_channel_id,
+                channel_name=team.name.lower().replace(' ', '-')
+            )
+            for team in teams
+        ])
+
+        rosters = []
+        members = []
+        offset = 0
+        for team, size in zip(teams, sizes):
+            roster = []
+            for position, user in enumerate(users[offset:offset + size]):
+                members.append(TeamMember(
+                    user=user,
+                    team=team,
+                    role='lead' if position == 0 else 'member',
+                    slack_user_id=slack_ids[user.id],
+                    # A few people have left the team since
+                    is_active=rng.random() > 0.03
+                ))
+                # Each person answers reliably or rarely, the team average is ~80%
+                roster.append((user.id, slack_ids[user.id], members[-1].is_active, rng.betavariate(8, 2)))
+            rosters.append(roster)
+            offset += size
+        TeamMember.objects.bulk_create(members, batch_size=self.batch_size)
+
+        schedules = []
+        for team in teams:
+            reminder_time = time(rng.choice([8, 9, 9, 9, 10]), rng.choice([0, 0, 15, 30, 45]))
+            schedules.append(StandupSchedule(
+                team=team,
+                weekdays=[1, 2, 3, 4, 5] if rng.random() < 0.9 else [1, 2, 3, 4],
+                reminder_time=reminder_time,
+                end_time=time(reminder_time.hour + 7, reminder_time.minute),
+                timezone=_weighted(rng, TIMEZONES)
+            ))
+        StandupSchedule.objects.bulk_create(schedules)
+
+        self.counts['users'] += len(users)
+        self.counts['teams'] += len(teams)
+        self.counts['members'] += len(members)
+        self.counts['schedules'] += len(schedules)
+
+        start_date = self.end_date - timedelta(days=self.days - 1)
+        for day in range(self.days):
+            self._generate_day(workspace, teams, schedules, rosters, start_date + timedelta(days=day))
+
+        for writer in self.writers.values():
+            writer.flush()
+        for name, writer in self.writers.items():
+            self.counts[name] = writer.written
+
+    def _generate_day(self, workspace, teams, schedules, rosters, day):
+        planned = []
+        for team, schedule, roster in zip(teams, schedules, rosters):
+            if day.isoweekday() not in schedule.weekdays:
+                continue
+            team_tz = pytz.timezone(schedule.timezone)
+            started_at = team_tz.localize(datetime.combine(day, schedule.reminder_time)).astimezone(pytz.UTC)
+            ended_at = team_tz.localize(datetime.combine(day, schedule.end_time)).astimezone(pytz.UTC)
+            summary_ts = self._message_ts(ended_at)
+            planned.append((team, roster, started_at, ended_at, summary_ts))
+
+        standups = Standup.objects.bulk_create([
+            Standup(
+                team=team,
+                date=day,
+                status='completed',
+                started_at=started_at,
+                ended_at=ended_at,
+                slack_thread_ts=summary_ts,
+                created_at=started_at,
+                updated_at=ended_at
+            )
+            for team, _, started_at, ended_at, summary_ts in planned
+        ])
+        self.counts['standups'] += len(standups)
+
+        for standup, (team, roster, started_at, ended_at, summary_ts) in zip(standups, planned):
+            responses = self._generate_standup(workspace, standup, roster, started_at, ended_at)
+            self.writers['messages'].add(
+                workspace.id, team.slack_channel_id, None, summary_ts, 'summary',
+                json.dumps({'text': f'Stand-up summary: {responses} responses'}), standup.id, ended_at
+            )
+
+    def _generate_standup(self, workspace, standup, roster, started_at, ended_at):
+        rng = self.rng
+        writers = self.writers
+        window = ended_at - started_at
+        responses = 0
+
+        for user_id, slack_user_id, is_active, reliability in roster:
+            if not is_active:
+                continue
+
+            responded_at = None
+            if rng.random() < reliability:
+                # Most answers come within half an hour, with a long tail
+                delay = timedelta(minutes=rng.lognormvariate(math.log(25), 0.9))
+                if delay < window:
+                    responded_at = started_at + delay
+
+            # Initial reminder, then hourly follow-ups until the member answers
+            sent_at = started_at
+            reminder_type = 'initial'
+            while sent_at < (responded_at or ended_at):
+                ts = self._message_ts(sent_at)
+                writers['reminders'].add(
+                    standup.id, user_id, reminder_type, sent_at, ts, responded_at is not None
+                )
+                writers['messages'].add(
+                    workspace.id, slack_user_id, slack_user_id, ts,
+                    'reminder' if reminder_type == 'initial' else 'follow_up',
+                    '{"text": "Time for your daily stand-up!"}', standup.id, sent_at
+                )
+                sent_at += FOLLOW_UP_DELAY if reminder_type == 'initial' else FOLLOW_UP_INTERVAL
+                reminder_type = 'follow_up'
+
+            if responded_at is None:
+                continue
+
+            responses += 1
+            mood = _weighted(rng, MOODS)
+            blocked = mood == 'blocked' or rng.random() < 0.1
+            writers['responses'].add(
+                standup.id, user_id,
+                '. '.join(rng.sample(WORK_ITEMS, rng.randint(1, 3))),
+                '. '.join(rng.sample(WORK_ITEMS, rng.randint(1, 3))),
+                rng.choice(BLOCKERS) if blocked else '',
+                mood, responded_at, responded_at
+            )
+
+            # Opening the modal and submitting it
+            opened_at = responded_at - timedelta(seconds=rng.randint(20, 300))
+            trigger_id = f'{standup.id}.{user_id}.{rng.getrandbits(32):x}'
+            writers['interactions'].add(
+                workspace.id, slack_user_id, 'button_click', trigger_id, None,
+                {'type': 'block_actions', 'actions': [{'action_id': 'submit_standup', 'value': str(standup.id)}]},
+                standup.id, opened_at
+            )
+            writers['interactions'].add(
+                workspace.id, slack_user_id, 'modal_submission', None, f'standup_submission_{standup.id}',
+                {'type': 'view_submission', 'view': {'callback_id': f'standup_submission_{standup.id}'}},
+                standup.id, responded_at
+            )
+
+        return responses
+
+    def _message_ts(self, sent_at):
+        """Unique Slack-style message timestamp for a send time"""
+        self.message_seq += 1
+        return f'{int(sent_at.timestamp())}.{self.seed % 1000:03d}{self.message_seq:09d}'
@@ -0,0 +1,47 @@
+import hashlib
+import uuid
+from contextlib import contextmanager
+
+from django.conf import settings
+from django.core.cache import cache
+from django.utils import timezone
+
+
+def idempotency_key(*parts):
+    """Build the cache key identifying one unit of outbound work, e.g. (team, date, reminder_type)"""
+    return 'idempotency:' + ':'.join(str(part) for part in parts)
+
+
+def members_digest(members):
+    """Stable digest of a chunk of (user_id, slack_user_id) pairs"""
+    user_ids = ','.join(str(user_id) for user_id in sorted(user_id for user_id, _ in members))
+    return hashlib.sha1(user_ids.encode()).hexdigest()
+
+
+def claim_once(key, timeout=None):
+    """Atomically claim an idempotency key; False means the work was already claimed.
+
+    Backed by Redis SET NX through the cache, so overlapping or retried tasks
+    racing for the same key see exactly one winner.
+    """
+    return cache.add(key, timezone.now().isoformat(), timeout or settings.STANDUP_IDEMPOTENCY_TTL)
+
+
+def release(key):
+    """Give up a claimed key so the work can be retried"""
+    cache.delete(key)
+
+
+@contextmanager
+def task_lock(name, timeout):
+    """Non-blocking distributed lock; yields whether this caller holds it"""
+    key = f'lock:{name}'
+    token = uuid.uuid4().hex
+    acquired = cache.add(key, token, timeout)
+    try:
+        yield acquired
+    finally:
+        # The timeout bounds how long a crashed holder can block others;
+        # only the holder clears the lock before it expires
+        if acquired and cache.get(key) == token:
+            cache.delete(key)
@@ -0,0 +1,164 @@
+import json
+import multiprocessing
+import os
+import time
+from contextlib import nullcontext
+from datetime import date, timedelta
+
+import django
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections
+from django.db.models import Count
+from django.db.models.functions import TruncMonth
+
+from standapp.db_routers import replica_reads
+from standups.metrics import build_metrics, upsert_metrics
+from standups.models import Standup
+
+# Seconds between progress lines
+PROGRESS_INTERVAL = 5
+
+
+def _month_end(month):
+    return (month.replace(day=28) + timedelta(days=4)).replace(day=1) - timedelta(days=1)
+
+
+def _init_worker():
+    """Give each pool process its own Django setup and database connections"""
+    django.setup()
+    connections.close_all()
+
+
+def _backfill_chunk(chunk):
+    """Recompute and upsert the metrics of one (team, month) chunk"""
+    team_id, month, start, end = chunk
+    standups = Standup.objects.filter(
+        team_id=team_id,
+        date__gte=max(start, month),
+        date__lte=min(end, _month_end(month)),
+        status='completed'
+    ).only('id', 'team_id', 'date', 'active_member_count')
+
+    with replica_reads():
+        metrics = build_metrics(standups)
+    created, updated = upsert_metrics(metrics)
+    return team_id, month, len(metrics), created, updated
+
+
+class Command(BaseCommand):
+    help = "Recompute StandupMetrics for completed stand-ups in a date range"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--start', required=True, type=date.fromisoformat, help='First stand-up date (YYYY-MM-DD)')
+        parser.add_argument('--end', type=date.fromisoformat, help='Last stand-up date (YYYY-MM-DD), defaults to today')
+        parser.add_argument('--team', type=int, action='append', dest='teams', help='Only this team id (repeatable)')
+        parser.add_argument('--workers', type=int, default=os.cpu_count() or 1, help='Worker processes')
+        parser.add_argument(
+            '--checkpoint',
+            help='File recording finished chunks; rerunning with the same file resumes where it stopped'
+        )
+        parser.add_argument('--restart', action='store_true', help='Ignore and overwrite an existing checkpoint')
+
+    def handle(self, *args, **options):
+        start = options['start']
+        end = options['end'] or date.today()
+        teams = sorted(options['teams'] or [])
+        if end < start:
+            raise CommandError('--end must not be before --start')
+
+        standups = Standup.objects.filter(date__gte=start, date__lte=end, status='completed')
+        if teams:
+            standups = standups.filter(team_id__in=teams)
+
+        chunk_sizes = {
+            (row['team_id'], row['month']): row['standups']
+            for row in standups.order_by().annotate(
+                month=TruncMonth('date')
+            ).values('team_id', 'month').annotate(standups=Count('id'))
+        }
+
+        done = self._load_checkpoint(options, start, end, teams)
+        pending = sorted(key for key in chunk_sizes if self._chunk_key(*key) not in done)
+        total = sum(chunk_sizes[key] for key in pending)
+
+        self.stdout.write(
+            f"Backfilling {total} stand-ups in {len(pending)} chunks "
+            f"({len(chunk_sizes) - len(pending)} already done) with {options['workers']} workers"
+        )
+        if not pending:
+            return
+
+        chunks = [(team_id, month, start, end) for team_id, month in pending]
+        processed = created = updated = 0
+        started = reported_at = time.monotonic()
+
+        with self._open_checkpoint(options, start, end, teams) as checkpoint:
+            for index, (team_id, month, count, chunk_created, chunk_updated) in enumerate(
+                self._run(chunks, options['workers']), start=1
+            ):
+                processed += count
+                created += chunk_created
+                updated += chunk_updated
+                if checkpoint:
+                    checkpoint.write(self._chunk_key(team_id, month) + '\n')
+                    checkpoint.flush()
+
+                now = time.monotonic()
+                if now - reported_at >= PROGRESS_INTERVAL or index == len(chunks):
+                    reported_at = now
+                    elapsed = now - started
+                    self.stdout.write(
+                        f"[{index}/{len(chunks)} chunks] {processed}/{total} stand-ups, "
+                        f"{processed / elapsed if elapsed else 0:.0f} stand-ups/s"
+                    )
+
+        elapsed = time.monotonic() - started
+        self.stdout.write(self.style.SUCCESS(
+            f"Backfilled {processed} stand-ups in {elapsed:.1f}s: {created} created, {updated} updated"
+        ))
+
+    def _run(self, chunks, workers):
+        """Yield chunk results as they finish, in-process when a single worker is requested"""
+        if workers <= 1:
+            for chunk in chunks:
+                yield _backfill_chunk(chunk)
+            return
+
+        # Forked children must not share the parent's database connections
+        connections.close_all()
+        with multiprocessing.Pool(workers, initializer=_init_worker) as pool:
+            yield from pool.imap_unordered(_backfill_chunk, chunks)
+
+    @staticmethod
+    def _chunk_key(team_id, month):
+        return f'{team_id}:{month:%Y-%m}'
+
+    @staticmethod
+    def _header(start, end, teams):
+        return json.dumps({'start': start.isoformat(), 'end': end.isoformat(), 'teams': teams})
+
+    def _load_checkpoint(self, options, start, end, teams):
+        """Return the chunk keys a previous run of the same backfill finished"""
+        path = options['checkpoint']
+        if not path or options['restart'] or not os.path.exists(path):
+            return set()
+
+        with open(path) as f:
+            lines = f.read().splitlines()
+        if lines and lines[0] != self._header(start, end, teams):
+            raise CommandError(
+                f'{path} belongs to a backfill with other arguments; use --restart to overwrite it'
+            )
+        return set(lines[1:])
+
+    def _open_checkpoint(self, options, start, end, teams):
+        path = options['checkpoint']
+        if not path:
+            return nullcontext()
+
+        resume = not options['restart'] and os.path.exists(path) and os.path.getsize(path)
+        checkpoint = open(path, 'a' if resume else 'w')
+        if not resume:
+            checkpoint.write(self._header(start, end, teams) + '\n')
+        return checkpoint
+
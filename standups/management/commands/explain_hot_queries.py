@@ -0,0 +1,106 @@
+import re
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+
+from slack_integration.models import SlackUserMapping
+from standups.loadgen import LoadGenerator
+from standups.models import Standup, StandupReminder, StandupResponse
+from teams.models import TeamMember
+
+
+def hot_queries():
+    """The filters the reminder, dashboard and Slack paths run most, bound to sample rows"""
+    response = StandupResponse.objects.select_related('standup').order_by('-submitted_at').first()
+    member = TeamMember.objects.filter(is_active=True).first()
+    mapping = SlackUserMapping.objects.first()
+    if not (response and member and mapping):
+        raise CommandError("No data to explain; run generate_load_data first or pass --generate")
+    day = response.standup.date
+
+    return [
+        ('open stand-ups', Standup.objects.filter(status='in_progress', date__gte=day - timedelta(days=1))),
+        ('stand-ups of a day by status', Standup.objects.filter(date=day, status='completed')),
+        ('recent responses of a user', StandupResponse.objects.filter(
+            user_id=response.user_id, submitted_at__gte=response.submitted_at - timedelta(days=7)
+        )),
+        ('latest follow-up to a member', StandupReminder.objects.filter(
+            standup_id=response.standup_id, user_id=response.user_id, reminder_type='follow_up'
+        ).order_by('-sent_at')[:1]),
+        ('active members of a team', TeamMember.objects.filter(team_id=member.team_id, is_active=True)),
+        ('Slack user lookup', SlackUserMapping.objects.filter(
+            slack_user_id=mapping.slack_user_id, workspace_id=mapping.workspace_id, is_active=True
+        )),
+    ]
+
+
+def index_used(plan, table):
+    """Name of the index a query plan reads ``table`` through, or None for a full table scan"""
+    if connection.vendor == 'postgresql':
+        match = (
+            re.search(rf'Index (?:Only )?Scan(?: Backward)? using (\w+) on {table}\b', plan)
+            # A bitmap heap scan names its table, the index scans feeding it are nested below
+            or re.search(rf'Bitmap Heap Scan on {table}\b.*?Bitmap Index Scan on (\w+)', plan, re.DOTALL)
+        )
+    elif connection.vendor == 'sqlite':
+        if re.search(rf'(?:SEARCH|SCAN) {table}\b.*USING INTEGER PRIMARY KEY', plan):
+            return 'primary key'
+        match = re.search(rf'(?:SEARCH|SCAN) {table}\b.*?USING (?:COVERING )?INDEX (\w+)', plan)
+    else:
+        raise CommandError(f"Reading {connection.vendor} query plans is not supported")
+    return match.group(1) if match else None
+
+
+class Command(BaseCommand):
+    help = "EXPLAIN the hot filter queries and fail unless each one is answered from an index"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--generate', action='store_true',
+            help='Explain against a generated dataset that is rolled back afterwards'
+        )
+        parser.add_argument('--teams', type=int, default=200, help='Teams to generate')
+        parser.add_argument('--members', type=int, default=25, help='Median members per generated team')
+        parser.add_argument('--days', type=int, default=60, help='Days of generated history')
+        parser.add_argument('--seed', type=int, default=0, help='Random seed of the generated dataset')
+        parser.add_argument('--verbose-plans', action='store_true', help='Print every query plan')
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            if options['generate']:
+                LoadGenerator(
+                    teams=options['teams'],
+                    members=options['members'],
+                    days=options['days'],
+                    seed=options['seed'],
+                    log=self.stdout.write
+                ).run()
+
+                # The planner only prefers indexes once it has statistics for the new rows
+                with connection.cursor() as cursor:
+                    cursor.execute('ANALYZE')
+
+            failures = self.explain_all(options['verbose_plans'])
+
+            transaction.set_rollback(True)
+
+        if failures:
+            raise CommandError(f"{len(failures)} hot queries scan a whole table: {', '.join(failures)}")
+        self.stdout.write(self.style.SUCCESS("Every hot query uses an index"))
+
+    def explain_all(self, verbose):
+        failures = []
+        for name, queryset in hot_queries():
+            plan = queryset.explain()
+            index = index_used(plan, queryset.model._meta.db_table)
+
+            if index:
+                self.stdout.write(f"{name:<32} {index}")
+            else:
+                failures.append(name)
+                self.stdout.write(self.style.ERROR(f"{name:<32} full table scan"))
+            if verbose or not index:
+                self.stdout.write(plan)
+
+        return failures
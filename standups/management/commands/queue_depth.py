@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from standapp.celery import queue_depths
+
+
+class Command(BaseCommand):
+    help = "Show how many messages are waiting in each Celery queue"
+
+    def handle(self, *args, **options):
+        for queue, depth in queue_depths().items():
+            self.stdout.write(f"{queue:<12} {depth}")
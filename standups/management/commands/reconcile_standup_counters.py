@@ -0,0 +1,31 @@
+from datetime import date
+
+from django.core.management.base import BaseCommand
+
+from standups.counters import reconcile_counters
+from standups.models import Standup
+
+
+class Command(BaseCommand):
+    help = "Recount the participation counters of stand-ups and repair any that have drifted"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--start', type=date.fromisoformat, help='First stand-up date (YYYY-MM-DD)')
+        parser.add_argument('--end', type=date.fromisoformat, help='Last stand-up date (YYYY-MM-DD)')
+        parser.add_argument('--team', type=int, action='append', dest='teams', help='Only this team id (repeatable)')
+        parser.add_argument(
+            '--snapshot-closed', action='store_true',
+            help="Also retake closed stand-ups' member counts from the current membership"
+        )
+
+    def handle(self, *args, **options):
+        standups = Standup.objects.all()
+        if options['start']:
+            standups = standups.filter(date__gte=options['start'])
+        if options['end']:
+            standups = standups.filter(date__lte=options['end'])
+        if options['teams']:
+            standups = standups.filter(team_id__in=options['teams'])
+
+        fixed = reconcile_counters(standups, snapshot_closed=options['snapshot_closed'])
+        self.stdout.write(self.style.SUCCESS(f"Repaired {fixed} of {standups.count()} stand-ups"))
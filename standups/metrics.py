@@ -0,0 +1,180 @@
+from django.db import transaction
+from django.db.models import Avg, Count, DurationField, ExpressionWrapper, F, IntegerField, Max, Min, Q, Sum
+from django.db.models.fields.json import KeyTextTransform
+from django.db.models.functions import Cast
+
+from .models import StandupResponse, StandupMetrics
+from .versions import invalidate_teams
+
+
+MOODS = [mood for mood, _ in StandupResponse._meta.get_field('mood').choices]
+
+# StandupMetrics columns recomputed on every upsert
+METRIC_FIELDS = [
+    'total_members', 'responses_count', 'completion_rate', 'average_response_time',
+    'first_response_time', 'last_response_time', 'mood_distribution',
+]
+
+# Decimal places of float metrics that count as a change
+FLOAT_PRECISION = 6
+
+
+def response_aggregates():
+    """Aggregate expressions over StandupResponse rows that make up StandupMetrics"""
+    aggregates = {
+        'responses_count': Count('id'),
+        'first_submitted_at': Min('submitted_at'),
+        'last_submitted_at': Max('submitted_at'),
+        # NULL when the stand-up has no start time, which Avg skips
+        'average_response_time': Avg(ExpressionWrapper(
+            F('submitted_at') - F('standup__started_at'),
+            output_field=DurationField()
+        )),
+    }
+    for mood in MOODS:
+        aggregates[f'mood_{mood}'] = Count('id', filter=Q(mood=mood))
+    return aggregates
+
+
+def metrics_values(aggregated, total_members):
+    """Turn one row of response_aggregates() into StandupMetrics field values"""
+    responses_count = aggregated['responses_count']
+    first_submitted_at = aggregated['first_submitted_at']
+    last_submitted_at = aggregated['last_submitted_at']
+
+    return {
+        'total_members': total_members,
+        'responses_count': responses_count,
+        'completion_rate': (responses_count / total_members * 100) if total_members > 0 else 0,
+        'average_response_time': aggregated['average_response_time'],
+        'first_response_time': first_submitted_at.time() if first_submitted_at else None,
+        'last_response_time': last_submitted_at.time() if last_submitted_at else None,
+        'mood_distribution': {
+            mood: aggregated[f'mood_{mood}']
+            for mood in MOODS if aggregated[f'mood_{mood}']
+        },
+    }
+
+
+def build_metrics(standups):
+    """Compute unsaved StandupMetrics for many stand-ups with grouped aggregate queries.
+
+    Team size is the stand-up's own member count, frozen when it closed, so
+    recomputing old metrics never rewrites them with today's membership.
+    """
+    standups = list(standups)
+
+    aggregated_by_standup = {
+        row['standup_id']: row
+        for row in StandupResponse.objects.filter(
+            standup_id__in=[standup.id for standup in standups]
+        ).order_by().values('standup_id').annotate(**response_aggregates())
+    }
+
+    # Stand-ups without responses have no group row
+    empty = {
+        'responses_count': 0,
+        'first_submitted_at': None,
+        'last_submitted_at': None,
+        'average_response_time': None,
+        **{f'mood_{mood}': 0 for mood in MOODS},
+    }
+
+    return [
+        StandupMetrics(
+            team_id=standup.team_id,
+            date=standup.date,
+            **metrics_values(
+                aggregated_by_standup.get(standup.id, empty),
+                standup.active_member_count
+            )
+        )
+        for standup in standups
+    ]
+
+
+def stored_values(values):
+    """Metric values as their columns hold them, so a recomputed row compares equal to the stored one.
+
+    Durations and times are already whole microseconds on both sides, but a
+    completion rate computed again can differ from the stored float in its
+    last bits, so floats are compared at the precision they are reported with.
+    """
+    return {
+        field: round(value, FLOAT_PRECISION) if isinstance(value, float) else value
+        for field, value in values.items()
+    }
+
+
+def upsert_metrics(metrics, batch_size=1000):
+    """Write new or changed metrics with INSERT ... ON CONFLICT (team, date), returning (created, updated) counts.
+
+    Rows whose values did not move are skipped, so recomputing unchanged
+    metrics neither writes nor expires the teams' cached views.
+    """
+    if not metrics:
+        return 0, 0
+
+    # Exact (team, date) pairs, narrowed per team rather than crossing every team with every date
+    dates_by_team = {}
+    for metric in metrics:
+        dates_by_team.setdefault(metric.team_id, set()).add(metric.date)
+    pairs = Q(pk__in=[])
+    for team_id, dates in dates_by_team.items():
+        pairs |= Q(team_id=team_id, date__in=dates)
+
+    with transaction.atomic():
+        existing = {
+            (row.pop('team_id'), row.pop('date')): stored_values(row)
+            for row in StandupMetrics.objects.filter(pairs).values('team_id', 'date', *METRIC_FIELDS)
+        }
+
+        changed = [
+            metric for metric in metrics
+            if existing.get((metric.team_id, metric.date)) != stored_values(
+                {field: getattr(metric, field) for field in METRIC_FIELDS}
+            )
+        ]
+        if not changed:
+            return 0, 0
+
+        StandupMetrics.objects.bulk_create(
+            changed,
+            batch_size=batch_size,
+            update_conflicts=True,
+            unique_fields=['team', 'date'],
+            update_fields=METRIC_FIELDS
+        )
+
+        invalidate_teams({metric.team_id for metric in changed})
+
+    updated = sum(1 for metric in changed if (metric.team_id, metric.date) in existing)
+    return len(changed) - updated, updated
+
+
+def summarize_team_metrics(metrics):
+    """Average completion, stand-up count and mood totals per team, grouped in one query"""
+    rows = metrics.order_by('team__name').values('team_id', 'team__name').annotate(
+        avg_completion_rate=Avg('completion_rate'),
+        total_standups=Count('id'),
+        **{
+            f'mood_{mood}': Sum(Cast(KeyTextTransform(mood, 'mood_distribution'), IntegerField()))
+            for mood in MOODS
+        }
+    )
+
+    return [
+        {
+            'team': {
+                'id': row['team_id'],
+                'name': row['team__name']
+            },
+            'avg_completion_rate': row['avg_completion_rate'],
+            'total_standups': row['total_standups'],
+            'mood_trends': {
+                mood: row[f'mood_{mood}']
+                for mood in MOODS if row[f'mood_{mood}'] is not None
+            }
+        }
+        for row in rows
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 5.2.18 on 2026-10-16 23:29
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('standups', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='standup',
+            name='reminders_failed',
+            field=models.IntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='standup',
+            name='reminders_sent',
+            field=models.IntegerField(default=0),
+        ),
+    ]
@@ -0,0 +1,33 @@
+# Generated by Django 5.2.18 on 2026-10-16 23:46
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('standups', '0002_standup_reminder_totals'),
+        ('teams', '0002_standupscheduleoccurrence'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='UserStreak',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('current_streak', models.IntegerField(default=0)),
+                ('longest_streak', models.IntegerField(default=0)),
+                ('last_standup_date', models.DateField(blank=True, null=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('team', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='streaks', to='teams.team')),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='standup_streaks', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'ordering': ['team__name', 'user__username'],
+                'unique_together': {('user', 'team')},
+            },
+        ),
+    ]
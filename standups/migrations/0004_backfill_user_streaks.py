@@ -0,0 +1,67 @@
+from datetime import timedelta
+
+from django.db import migrations
+from django.db.models import Max
+
+
+def backfill_user_streaks(apps, schema_editor):
+    """Seed UserStreak from the existing response history in one ordered pass"""
+    StandupResponse = apps.get_model('standups', 'StandupResponse')
+    Standup = apps.get_model('standups', 'Standup')
+    StandupSchedule = apps.get_model('teams', 'StandupSchedule')
+    UserStreak = apps.get_model('standups', 'UserStreak')
+
+    weekdays_by_team = {}
+    for team_id, weekdays in StandupSchedule.objects.filter(is_active=True).values_list('team_id', 'weekdays'):
+        weekdays_by_team.setdefault(team_id, set()).update(weekdays)
+
+    last_closed_by_team = dict(
+        Standup.objects.filter(status='completed').order_by().values('team_id').annotate(
+            last=Max('date')
+        ).values_list('team_id', 'last')
+    )
+
+    def previous_standup_date(day, weekdays):
+        for offset in range(1, 8):
+            candidate = day - timedelta(days=offset)
+            if candidate.isoweekday() in weekdays:
+                return candidate
+        return day - timedelta(days=7)
+
+    streaks = {}
+    history = StandupResponse.objects.order_by(
+        'user_id', 'standup__team_id', 'standup__date'
+    ).values_list('user_id', 'standup__team_id', 'standup__date').iterator()
+
+    for user_id, team_id, day in history:
+        streak = streaks.get((user_id, team_id))
+        if streak is None:
+            streak = streaks[(user_id, team_id)] = UserStreak(user_id=user_id, team_id=team_id)
+
+        weekdays = weekdays_by_team.get(team_id) or set(range(1, 8))
+        if streak.last_standup_date == previous_standup_date(day, weekdays):
+            streak.current_streak += 1
+        else:
+            streak.current_streak = 1
+        streak.longest_streak = max(streak.longest_streak, streak.current_streak)
+        streak.last_standup_date = day
+
+    # A stand-up closed after the last answer has already broken the streak
+    for (_, team_id), streak in streaks.items():
+        last_closed = last_closed_by_team.get(team_id)
+        if last_closed and last_closed > streak.last_standup_date:
+            streak.current_streak = 0
+
+    UserStreak.objects.bulk_create(streaks.values(), batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('standups', '0003_userstreak'),
+        ('teams', '0002_standupscheduleoccurrence'),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill_user_streaks, migrations.RunPython.noop),
+    ]
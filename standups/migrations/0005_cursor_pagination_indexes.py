@@ -0,0 +1,28 @@
+# Generated by Django 5.2.18 on 2026-10-16 23:49
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('standups', '0004_backfill_user_streaks'),
+        ('teams', '0002_standupscheduleoccurrence'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='standup',
+            index=models.Index(fields=['-date', 'id'], name='standup_date_cursor_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='standupmetrics',
+            index=models.Index(fields=['-date', 'id'], name='metrics_date_cursor_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='standupresponse',
+            index=models.Index(fields=['-submitted_at', 'id'], name='response_submitted_cursor_idx'),
+        ),
+    ]
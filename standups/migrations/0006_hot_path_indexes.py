@@ -0,0 +1,32 @@
+# Generated by Django 5.2.18 on 2026-10-16 23:57
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('standups', '0005_cursor_pagination_indexes'),
+        ('teams', '0003_hot_path_indexes'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='standup',
+            index=models.Index(fields=['date', 'status'], name='standup_date_status_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='standup',
+            index=models.Index(condition=models.Q(('status', 'in_progress')), fields=['date'], name='standup_in_progress_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='standupreminder',
+            index=models.Index(fields=['standup', 'user', 'reminder_type', 'sent_at'], name='reminder_lookup_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='standupresponse',
+            index=models.Index(fields=['user', 'submitted_at'], name='response_user_submitted_idx'),
+        ),
+    ]
@@ -0,0 +1,28 @@
+# Generated by Django 5.2.18 on 2026-10-16 23:59
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('standups', '0006_hot_path_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='standup',
+            name='active_member_count',
+            field=models.IntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='standup',
+            name='completion_rate',
+            field=models.FloatField(default=0),
+        ),
+        migrations.AddField(
+            model_name='standup',
+            name='response_count',
+            field=models.IntegerField(default=0),
+        ),
+    ]
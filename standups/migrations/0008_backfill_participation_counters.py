@@ -0,0 +1,48 @@
+from django.db import migrations
+from django.db.models import Case, Count, ExpressionWrapper, FloatField, OuterRef, Subquery, Value, When
+from django.db.models.functions import Cast, Coalesce
+from django.db.models.lookups import GreaterThan
+
+
+def backfill_participation_counters(apps, schema_editor):
+    """Count responses and current active members for every existing stand-up in one UPDATE"""
+    Standup = apps.get_model('standups', 'Standup')
+    StandupResponse = apps.get_model('standups', 'StandupResponse')
+    TeamMember = apps.get_model('teams', 'TeamMember')
+
+    responses = Coalesce(Subquery(
+        StandupResponse.objects.filter(
+            standup=OuterRef('pk')
+        ).order_by().values('standup').annotate(total=Count('id')).values('total')
+    ), 0)
+    members = Coalesce(Subquery(
+        TeamMember.objects.filter(
+            team=OuterRef('team'),
+            is_active=True
+        ).order_by().values('team').annotate(total=Count('id')).values('total')
+    ), 0)
+
+    Standup.objects.update(
+        response_count=responses,
+        active_member_count=members,
+        completion_rate=Case(
+            When(
+                GreaterThan(members, 0),
+                then=ExpressionWrapper(Cast(responses, FloatField()) * 100 / members, output_field=FloatField())
+            ),
+            default=Value(0.0),
+            output_field=FloatField()
+        )
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('standups', '0007_standup_participation_counters'),
+        ('teams', '0003_hot_path_indexes'),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill_participation_counters, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,21 @@
+# Generated by Django 5.2.18 on 2026-10-17 00:39
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('standups', '0008_backfill_participation_counters'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TaskWatermark',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=100, unique=True)),
+                ('value', models.DateTimeField()),
+            ],
+        ),
+    ]
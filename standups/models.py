@@ -18,22 +18,33 @@ class Standup(models.Model):
     started_at = models.DateTimeField(null=True, blank=True)
     ended_at = models.DateTimeField(null=True, blank=True)
     slack_thread_ts = models.CharField(max_length=50, null=True, blank=True)
+    reminders_sent = models.IntegerField(default=0)
+    reminders_failed = models.IntegerField(default=0)
+    # Participation counters, maintained by standups.counters
+    active_member_count = models.IntegerField(default=0)
+    response_count = models.IntegerField(default=0)
+    completion_rate = models.FloatField(default=0)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
     class Meta:
         unique_together = ['team', 'date']
         ordering = ['-date', 'team__name']
+        indexes = [
+            # Matches the cursor ordering of the API list endpoints
+            models.Index(fields=['-date', 'id'], name='standup_date_cursor_idx'),
+            models.Index(fields=['date', 'status'], name='standup_date_status_idx'),
+            # Reminder and end-of-day scans only ever look at open stand-ups
+            models.Index(fields=['date'], condition=models.Q(status='in_progress'), name='standup_in_progress_idx'),
+        ]
 
     def __str__(self):
         return f"{self.team.name} - {self.date}"
 
     @property
-    def completion_rate(self):
-        """Calculate the percentage of team members who submitted stand-ups"""
-        total_members = self.team.teammember_set.filter(is_active=True).count()
-        submitted_count = self.responses.count()
-        return (submitted_count / total_members * 100) if total_members > 0 else 0
+    def missing_count(self):
+        """Number of counted members who haven't submitted stand-ups"""
+        return max(self.active_member_count - self.response_count, 0)
 
     @property
     def missing_members(self):
@@ -74,6 +85,10 @@ class StandupResponse(models.Model):
     class Meta:
         unique_together = ['standup', 'user']
         ordering = ['-submitted_at']
+        indexes = [
+            models.Index(fields=['-submitted_at', 'id'], name='response_submitted_cursor_idx'),
+            models.Index(fields=['user', 'submitted_at'], name='response_user_submitted_idx'),
+        ]
 
     def __str__(self):
         return f"{self.user.username} - {self.standup.date}"
@@ -96,6 +111,10 @@ class StandupReminder(models.Model):
 
     class Meta:
         ordering = ['-sent_at']
+        indexes = [
+            # Latest reminder of a type sent to a member for a stand-up
+            models.Index(fields=['standup', 'user', 'reminder_type', 'sent_at'], name='reminder_lookup_idx'),
+        ]
 
     def __str__(self):
         return f"{self.reminder_type} - {self.user.username} - {self.standup.date}"
@@ -124,6 +143,35 @@ class StandupMetrics(models.Model):
     class Meta:
         unique_together = ['team', 'date']
         ordering = ['-date', 'team__name']
+        indexes = [
+            models.Index(fields=['-date', 'id'], name='metrics_date_cursor_idx'),
+        ]
 
     def __str__(self):
         return f"{self.team.name} metrics - {self.date}"
+
+
+class UserStreak(models.Model):
+    """Consecutive scheduled stand-ups a user has answered in a team, maintained incrementally"""
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='standup_streaks')
+    team = models.ForeignKey(Team, on_delete=models.CASCADE, related_name='streaks')
+    current_streak = models.IntegerField(default=0)
+    longest_streak = models.IntegerField(default=0)
+    last_standup_date = models.DateField(null=True, blank=True)  # last stand-up answered
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        unique_together = ['user', 'team']
+        ordering = ['team__name', 'user__username']
+
+    def __str__(self):
+        return f"{self.user.username} - {self.team.name} ({self.current_streak})"
+
+
+class TaskWatermark(models.Model):
+    """When a periodic task last started, so its next run only picks up what changed since"""
+    name = models.CharField(max_length=100, unique=True)
+    value = models.DateTimeField()
+
+    def __str__(self):
+        return f"{self.name} - {self.value}"
@@ -1,27 +1,28 @@
 from rest_framework import serializers
 from django.contrib.auth.models import User
+from django.db.models import Prefetch
 from .models import Standup, StandupResponse, StandupReminder, StandupMetrics
-from teams.serializers import UserSerializer, TeamSerializer
+from teams.models import Team
+from teams.serializers import UserSerializer, TeamSerializer, annotate_member_count
+
+
+def prefetch_standup_teams(queryset):
+    """Load each stand-up's team with its member count, so a page of stand-ups costs a fixed number of queries"""
+    return queryset.prefetch_related(
+        Prefetch('team', queryset=annotate_member_count(Team.objects.all()))
+    )
 
 
 class StandupSerializer(serializers.ModelSerializer):
     """Serializer for Standup model"""
     team = TeamSerializer(read_only=True)
-    completion_rate = serializers.ReadOnlyField()
-    response_count = serializers.SerializerMethodField()
-    missing_count = serializers.SerializerMethodField()
+    missing_count = serializers.IntegerField(read_only=True)
     
     class Meta:
         model = Standup
         fields = ['id', 'team', 'date', 'status', 'started_at', 'ended_at',
                  'completion_rate', 'response_count', 'missing_count', 'created_at']
-        read_only_fields = ['created_at', 'updated_at']
-    
-    def get_response_count(self, obj):
-        return obj.responses.count()
-    
-    def get_missing_count(self, obj):
-        return obj.missing_members.count()
+        read_only_fields = ['completion_rate', 'response_count', 'created_at', 'updated_at']
 
 
 class StandupResponseSerializer(serializers.ModelSerializer):
@@ -0,0 +1,58 @@
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+
+from teams.models import Team, TeamMember
+from .counters import active_member_count, add_responses, refresh_member_counts
+from .models import Standup, StandupResponse
+from .versions import invalidate_teams, invalidate_user
+
+
+@receiver(pre_save, sender=Standup)
+def count_members_of_new_standup(sender, instance, raw=False, **kwargs):
+    """A new stand-up starts out counting the team's current active members"""
+    if instance._state.adding and not raw:
+        instance.active_member_count = active_member_count(instance.team_id)
+
+
+@receiver(post_save, sender=StandupResponse)
+def count_new_response(sender, instance, created, raw=False, **kwargs):
+    """Count a response towards its stand-up as it is created"""
+    if created and not raw:
+        add_responses(instance.standup_id, 1)
+
+
+@receiver(post_delete, sender=StandupResponse)
+def uncount_deleted_response(sender, instance, **kwargs):
+    """Take a deleted response out of its stand-up's counts"""
+    add_responses(instance.standup_id, -1)
+
+
+@receiver([post_save, post_delete], sender=TeamMember)
+def recount_members_on_membership_change(sender, instance, **kwargs):
+    """Follow membership changes in the team's open stand-ups"""
+    refresh_member_counts(instance.team_id)
+
+
+@receiver([post_save, post_delete], sender=StandupResponse)
+def expire_versions_on_response_change(sender, instance, **kwargs):
+    """A response changes its team's counts, streaks and recent responses"""
+    invalidate_teams([instance.standup.team_id])
+
+
+@receiver([post_save, post_delete], sender=Standup)
+def expire_versions_on_standup_change(sender, instance, **kwargs):
+    """Stand-ups are saved when they open and when their status changes"""
+    invalidate_teams([instance.team_id])
+
+
+@receiver([post_save, post_delete], sender=TeamMember)
+def expire_versions_on_membership_change(sender, instance, **kwargs):
+    """Membership changes the member's own teams and the team's missing counts"""
+    invalidate_teams([instance.team_id])
+    invalidate_user(instance.user_id)
+
+
+@receiver(post_save, sender=Team)
+def expire_versions_on_team_change(sender, instance, **kwargs):
+    """Team names and descriptions are embedded in stand-up and metrics payloads"""
+    invalidate_teams([instance.id])
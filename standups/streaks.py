@@ -0,0 +1,64 @@
+from datetime import timedelta
+
+from django.db import transaction
+from django.db.models import Exists, OuterRef
+
+from teams.models import StandupSchedule
+from .models import Standup, UserStreak
+
+
+def scheduled_weekdays(team_id):
+    """ISO weekdays on which a team holds stand-ups; every day when it has no active schedule"""
+    weekdays = set()
+    for schedule_weekdays in StandupSchedule.objects.filter(
+        team_id=team_id,
+        is_active=True
+    ).values_list('weekdays', flat=True):
+        weekdays.update(schedule_weekdays)
+    return weekdays or set(range(1, 8))
+
+
+def previous_standup_date(day, weekdays):
+    """The scheduled stand-up day before ``day``"""
+    for offset in range(1, 8):
+        candidate = day - timedelta(days=offset)
+        if candidate.isoweekday() in weekdays:
+            return candidate
+    return day - timedelta(days=7)
+
+
+def record_response(user_id, standup):
+    """Extend or restart the user's streak for a stand-up they just answered"""
+    with transaction.atomic():
+        streak, _ = UserStreak.objects.select_for_update().get_or_create(
+            user_id=user_id,
+            team_id=standup.team_id
+        )
+
+        # Repeated submissions and late answers to older stand-ups leave the streak alone
+        if streak.last_standup_date and streak.last_standup_date >= standup.date:
+            return streak
+
+        expected = previous_standup_date(standup.date, scheduled_weekdays(standup.team_id))
+        if streak.last_standup_date == expected:
+            streak.current_streak += 1
+        else:
+            streak.current_streak = 1
+        streak.longest_streak = max(streak.longest_streak, streak.current_streak)
+        streak.last_standup_date = standup.date
+        streak.save()
+
+    return streak
+
+
+def reset_missed_streaks(standup_ids):
+    """Break the streak of every member who did not answer one of the given closed stand-ups"""
+    return UserStreak.objects.filter(
+        current_streak__gt=0
+    ).filter(
+        Exists(Standup.objects.filter(
+            id__in=standup_ids,
+            team_id=OuterRef('team_id'),
+            date__gt=OuterRef('last_standup_date')
+        ))
+    ).update(current_streak=0)
@@ -1,45 +1,60 @@
-from celery import shared_task
+import logging
+
+from celery import chord, group, shared_task
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Exists, F, Max, OuterRef, Q, Subquery
 from django.utils import timezone
+from django.utils.dateparse import parse_datetime
 from django.contrib.auth.models import User
-from datetime import datetime, time, timedelta
-import pytz
+from datetime import date, timedelta
 
-from teams.models import Team, TeamMember, StandupSchedule
-from standups.models import Standup, StandupResponse, StandupReminder, StandupMetrics
+from teams.models import Team, TeamMember, StandupScheduleOccurrence
+from standups.models import Standup, StandupResponse, StandupReminder, TaskWatermark
+from standups.metrics import build_metrics, upsert_metrics
+from slack_integration.outbox import claim_message
 from slack_integration.services import SlackService
+from teams.scheduling import claim_due_occurrences, extend_schedule_index, team_local_dates
+from standups.locks import claim_once, idempotency_key, members_digest, release, task_lock
+from standups.streaks import record_response, reset_missed_streaks
+from standups.versions import invalidate_teams
+from standapp.db_routers import replica_reads
+
+logger = logging.getLogger(__name__)
 
 
 @shared_task
 def send_standup_reminders():
-    """Send initial stand-up reminders based on team schedules"""
-    now = timezone.now()
-    current_weekday = now.weekday() + 1  # Django uses 1-7 for Monday-Sunday
-    
-    # Get all active schedules for today
-    schedules = StandupSchedule.objects.filter(
-        is_active=True,
-        weekdays__contains=current_weekday,
-        team__is_active=True
-    )
-    
-    for schedule in schedules:
-        # Convert schedule time to UTC
-        team_tz = pytz.timezone(schedule.timezone)
-        schedule_time = team_tz.localize(
-            datetime.combine(now.date(), schedule.reminder_time)
-        ).astimezone(pytz.UTC)
-        
-        # Check if it's time to send reminder (within 1 minute window)
-        if abs((now - schedule_time).total_seconds()) <= 60:
-            create_and_send_standup_reminder.delay(schedule.team.id)
+    """Send initial stand-up reminders whose scheduled time has come"""
+    with task_lock('send_standup_reminders', timeout=55) as acquired:
+        if not acquired:
+            return "Another beat tick is dispatching reminders"
+        
+        # Each due occurrence is claimed exactly once, so a delayed or duplicated
+        # beat tick cannot fire a team twice or skip a minute
+        for occurrence in claim_due_occurrences('reminder'):
+            create_and_send_standup_reminder.delay(occurrence.team_id, occurrence.date.isoformat())
+
+
+@shared_task
+def refresh_schedule_index():
+    """Extend the precomputed schedule fire times over the configured horizon"""
+    count = extend_schedule_index()
+    return f"Indexed {count} upcoming schedule occurrences"
 
 
 @shared_task
-def create_and_send_standup_reminder(team_id):
+def create_and_send_standup_reminder(team_id, standup_date=None):
     """Create stand-up session and send reminders to team members"""
+    today = date.fromisoformat(standup_date) if standup_date else timezone.now().date()
+    
+    # Overlapping or retried dispatches for the same team and day become no-ops
+    dispatch_key = idempotency_key('reminder', team_id, today, 'initial')
+    if not claim_once(dispatch_key):
+        return f"Reminders for team {team_id} on {today} already dispatched"
+    
     try:
         team = Team.objects.get(id=team_id, is_active=True)
-        today = timezone.now().date()
         
         # Get or create today's stand-up
         standup, created = Standup.objects.get_or_create(
@@ -55,143 +70,251 @@ def create_and_send_standup_reminder(team_id):
         if standup.status == 'pending':
             standup.status = 'in_progress'
             standup.started_at = timezone.now()
-            standup.save()
+            standup.save(update_fields=['status', 'started_at', 'updated_at'])
         
-        # Get active team members
-        active_members = TeamMember.objects.filter(
-            team=team,
-            is_active=True,
-            user__is_active=True
+        # Get active team members who haven't submitted yet, in one query
+        pending_members = list(
+            TeamMember.objects.filter(
+                team=team,
+                is_active=True,
+                user__is_active=True
+            ).exclude(
+                user_id__in=StandupResponse.objects.filter(standup=standup).values('user_id')
+            ).values_list('user_id', 'slack_user_id')
         )
         
-        slack_service = SlackService()
+        if not pending_members:
+            return f"No reminders needed for {team.name} stand-up"
         
-        for member in active_members:
-            # Check if user already submitted stand-up
-            if not StandupResponse.objects.filter(standup=standup, user=member.user).exists():
-                # Send reminder
-                reminder = StandupReminder.objects.create(
-                    standup=standup,
-                    user=member.user,
-                    reminder_type='initial'
-                )
-                
-                # Send Slack message
-                message_ts = slack_service.send_standup_reminder(
-                    member.slack_user_id,
-                    standup,
-                    reminder.reminder_type
-                )
-                
-                if message_ts:
-                    reminder.slack_message_ts = message_ts
-                    reminder.save()
-        
-        return f"Sent reminders for {team.name} stand-up"
+        # Fan out fixed-size member chunks so large teams spread across workers
+        chunk_size = settings.STANDUP_REMINDER_CHUNK_SIZE
+        chunks = [
+            pending_members[i:i + chunk_size]
+            for i in range(0, len(pending_members), chunk_size)
+        ]
+        chord(
+            send_standup_reminder_chunk.s(standup.id, chunk, 'initial')
+            for chunk in chunks
+        )(record_reminder_totals.s(standup.id))
+        
+        return f"Dispatched {len(chunks)} reminder chunks for {team.name} stand-up"
         
     except Team.DoesNotExist:
         return f"Team {team_id} not found"
     except Exception as e:
+        release(dispatch_key)
         return f"Error sending reminders: {str(e)}"
 
 
-@shared_task
-def send_follow_up_reminders():
-    """Send follow-up reminders to users who haven't submitted stand-ups"""
-    now = timezone.now()
-    cutoff_time = now - timedelta(minutes=30)  # Send follow-up after 30 minutes
+def _send_reminder_batch(standup, members, reminder_type):
+    """Create reminders for (user_id, slack_user_id) pairs and deliver them in bulk"""
+    slack_service = SlackService()
     
-    # Get active stand-ups from today
-    active_standups = Standup.objects.filter(
-        date=now.date(),
-        status='in_progress',
-        started_at__lte=cutoff_time
-    )
+    # Reminders and their outbound messages commit together, so a Slack outage
+    # leaves queued messages for the outbox drainer instead of lost reminders
+    with transaction.atomic():
+        reminders = StandupReminder.objects.bulk_create([
+            StandupReminder(standup=standup, user_id=user_id, reminder_type=reminder_type)
+            for user_id, _ in members
+        ])
+        messages = slack_service.queue_standup_reminders(
+            [slack_user_id for _, slack_user_id in members],
+            standup,
+            reminder_type,
+            reminders
+        )
     
-    slack_service = SlackService()
+    # Send Slack messages; delivered timestamps are written back to the reminders
+    results = slack_service.deliver(messages)
+    sent = sum(1 for result in results if result.ok)
     
-    for standup in active_standups:
-        # Get missing members
-        missing_members = standup.missing_members
-        
-        for member in missing_members:
-            # Check if we've already sent a follow-up reminder
-            last_reminder = StandupReminder.objects.filter(
-                standup=standup,
-                user=member.user,
-                reminder_type='follow_up'
-            ).first()
-            
-            if not last_reminder or (now - last_reminder.sent_at).total_seconds() > 3600:  # 1 hour
-                reminder = StandupReminder.objects.create(
-                    standup=standup,
-                    user=member.user,
-                    reminder_type='follow_up'
-                )
-                
-                message_ts = slack_service.send_standup_reminder(
-                    member.slack_user_id,
-                    standup,
-                    reminder.reminder_type
-                )
-                
-                if message_ts:
-                    reminder.slack_message_ts = message_ts
-                    reminder.save()
+    return {'sent': sent, 'failed': len(reminders) - sent}
 
 
 @shared_task
-def end_standups():
-    """End stand-ups based on team schedules and send summaries"""
-    now = timezone.now()
+def send_standup_reminder_chunk(standup_id, members, reminder_type):
+    """Send reminders to one chunk of a team's members"""
+    # A retried chunk must not DM its members a second time
+    chunk_key = idempotency_key('reminder_chunk', standup_id, reminder_type, members_digest(members))
+    if not claim_once(chunk_key):
+        return {'sent': 0, 'failed': 0}
+    
+    try:
+        standup = Standup.objects.select_related('team').get(id=standup_id)
+        return _send_reminder_batch(standup, members, reminder_type)
+    except Exception as e:
+        release(chunk_key)
+        logger.error(f"Error sending reminder chunk for stand-up {standup_id}: {e}")
+        return {'sent': 0, 'failed': len(members)}
+
+
+@shared_task
+def record_reminder_totals(results, standup_id):
+    """Chord callback recording how many reminders a fan-out delivered"""
+    sent = sum(result['sent'] for result in results)
+    failed = sum(result['failed'] for result in results)
     
-    # Get active stand-ups from today
-    active_standups = Standup.objects.filter(
-        date=now.date(),
-        status='in_progress'
+    Standup.objects.filter(id=standup_id).update(
+        reminders_sent=F('reminders_sent') + sent,
+        reminders_failed=F('reminders_failed') + failed
     )
     
-    for standup in active_standups:
-        # Get team's schedule for today
-        current_weekday = now.weekday() + 1
-        schedule = StandupSchedule.objects.filter(
-            team=standup.team,
+    return f"Recorded {sent} sent and {failed} failed reminders for stand-up {standup_id}"
+
+
+@shared_task
+def send_follow_up_reminders():
+    """Send follow-up reminders to users who haven't submitted stand-ups"""
+    with task_lock('send_follow_up_reminders', timeout=290) as acquired:
+        if not acquired:
+            return "Another run is sending follow-up reminders"
+        
+        now = timezone.now()
+        cutoff_time = now - timedelta(minutes=30)  # Send follow-up after 30 minutes
+        
+        follow_up_cutoff = now - timedelta(hours=1)  # At most one follow-up per hour
+        
+        # Latest follow-up sent to the member for the joined stand-up
+        last_follow_up = StandupReminder.objects.filter(
+            standup_id=OuterRef('standup_id'),
+            user_id=OuterRef('user_id'),
+            reminder_type='follow_up'
+        ).order_by().values('standup_id', 'user_id').annotate(
+            last_sent_at=Max('sent_at')
+        ).values('last_sent_at')
+        
+        # Only stand-ups of each team's current local date; one left open from an
+        # earlier day must not keep nudging its members
+        open_standups = list(
+            Standup.objects.filter(
+                status='in_progress',
+                started_at__lte=cutoff_time
+            ).values_list('id', 'team_id', 'date')
+        )
+        local_dates = team_local_dates({team_id for _, team_id, _ in open_standups}, now)
+        current_ids = [
+            standup_id for standup_id, team_id, standup_date in open_standups
+            if standup_date == local_dates[team_id]
+        ]
+        
+        # Members of those stand-ups who haven't responded and are due a nudge, selected in one query
+        candidates = TeamMember.objects.filter(
             is_active=True,
-            weekdays__contains=current_weekday
-        ).first()
-        
-        if schedule:
-            # Convert end time to UTC
-            team_tz = pytz.timezone(schedule.timezone)
-            end_time = team_tz.localize(
-                datetime.combine(now.date(), schedule.end_time)
-            ).astimezone(pytz.UTC)
+            team__standups__id__in=current_ids
+        ).annotate(
+            standup_id=F('team__standups__id'),
+            last_follow_up_at=Subquery(last_follow_up)
+        ).exclude(
+            Exists(StandupResponse.objects.filter(
+                standup_id=OuterRef('standup_id'),
+                user_id=OuterRef('user_id')
+            ))
+        ).filter(
+            Q(last_follow_up_at__isnull=True) | Q(last_follow_up_at__lte=follow_up_cutoff)
+        ).order_by().values_list('standup_id', 'user_id', 'slack_user_id')
+        
+        due_members = {}
+        for standup_id, user_id, slack_user_id in candidates:
+            due_members.setdefault(standup_id, []).append((user_id, slack_user_id))
+        
+        standups = Standup.objects.select_related('team').in_bulk(list(due_members))
+        for standup_id, members in due_members.items():
+            _send_reminder_batch(standups[standup_id], members, 'follow_up')
+
+
+@shared_task
+def end_standups():
+    """End stand-ups based on team schedules and send summaries"""
+    with task_lock('end_standups', timeout=290) as acquired:
+        if not acquired:
+            return "Another run is ending stand-ups"
+        
+        now = timezone.now()
+        
+        with transaction.atomic():
+            # Join in-progress stand-ups to the end times compiled in the schedule index
+            due = dict(
+                Standup.objects.select_for_update(skip_locked=True, of=('self',)).filter(
+                    status='in_progress',
+                    team__schedule_occurrences__kind='end',
+                    team__schedule_occurrences__date=F('date'),
+                    team__schedule_occurrences__fire_at__lte=now
+                ).order_by().values_list('id', 'team_id')
+            )
+            due_ids = set(due)
+        
+            # Close every due stand-up in a single statement
+            Standup.objects.filter(id__in=due_ids, status='in_progress').update(
+                status='completed',
+                ended_at=now
+            )
+        
+            StandupScheduleOccurrence.objects.filter(
+                kind='end',
+                dispatched_at__isnull=True,
+                fire_at__lte=now
+            ).update(dispatched_at=now)
+            
+            # Members who let a closed stand-up pass lose their streak
+            reset_missed_streaks(due_ids)
+            
+            # The bulk update bypasses the model signals that expire cached views
+            invalidate_teams(due.values())
             
-            # Check if it's time to end (within 5 minute window)
-            if now >= end_time:
-                end_standup.delay(standup.id)
+            # Summaries are queued with the close, so a crash after commit only delays them
+            summaries = SlackService().queue_standup_summaries(
+                list(Standup.objects.select_related('team').filter(id__in=due_ids))
+            ) if due_ids else []
+        
+        if due_ids:
+            # Dispatch summaries and metrics for the closed stand-ups as one batch
+            group(
+                [send_standup_summary.s(message.id, message.next_attempt_at.isoformat()) for message in summaries]
+                + [generate_standups_metrics.s(list(due_ids))]
+            ).apply_async()
+        
+        return f"Ended {len(due_ids)} stand-ups"
+
+
+@shared_task
+def send_standup_summary(message_id, leased_until):
+    """Deliver a queued stand-up summary to its team channel"""
+    # The drainer takes over summaries whose lease ran out before this task ran
+    message = claim_message(message_id, parse_datetime(leased_until))
+    if message is None:
+        return f"Summary {message_id} already taken by the outbox"
+    
+    result = SlackService(workspace=message.workspace).deliver([message])[0]
+    if not result.ok:
+        return f"Summary for stand-up {message.standup_id} failed and stays queued: {result.error}"
+    
+    return f"Sent summary for stand-up {message.standup_id}"
 
 
 @shared_task
 def end_standup(standup_id):
     """End a specific stand-up and send summary"""
     try:
-        standup = Standup.objects.get(id=standup_id)
+        standup = Standup.objects.select_related('team').get(id=standup_id)
         
         if standup.status != 'in_progress':
             return f"Stand-up {standup_id} not in progress"
         
-        # Update standup status
-        standup.status = 'completed'
-        standup.ended_at = timezone.now()
-        standup.save()
+        slack_service = SlackService()
+        with transaction.atomic():
+            # Update standup status
+            standup.status = 'completed'
+            standup.ended_at = timezone.now()
+            # Saving only what changed leaves the participation counters to their atomic updates
+            standup.save(update_fields=['status', 'ended_at', 'updated_at'])
+            reset_missed_streaks([standup.id])
+            summaries = slack_service.queue_standup_summaries([standup])
         
         # Generate metrics
         generate_standup_metrics.delay(standup.id)
         
         # Send summary to team channel
-        slack_service = SlackService()
-        slack_service.send_standup_summary(standup)
+        slack_service.deliver(summaries)
         
         return f"Ended stand-up for {standup.team.name} on {standup.date}"
         
@@ -205,54 +328,10 @@ def end_standup(standup_id):
 def generate_standup_metrics(standup_id):
     """Generate metrics for a completed stand-up"""
     try:
-        standup = Standup.objects.get(id=standup_id)
+        standup = Standup.objects.select_related('team').get(id=standup_id)
         
-        # Calculate metrics
-        total_members = standup.team.teammember_set.filter(is_active=True).count()
-        responses = standup.responses.all()
-        responses_count = responses.count()
-        completion_rate = (responses_count / total_members * 100) if total_members > 0 else 0
-        
-        # Calculate timing metrics
-        if responses.exists():
-            response_times = [r.submitted_at for r in responses]
-            first_response_time = min(response_times).time()
-            last_response_time = max(response_times).time()
-            
-            # Calculate average response time from standup start
-            if standup.started_at:
-                total_duration = sum([
-                    (r.submitted_at - standup.started_at).total_seconds() 
-                    for r in responses
-                ], 0)
-                average_response_time = timedelta(seconds=total_duration / responses_count)
-            else:
-                average_response_time = None
-        else:
-            first_response_time = None
-            last_response_time = None
-            average_response_time = None
-        
-        # Calculate mood distribution
-        mood_distribution = {}
-        for response in responses:
-            mood = response.mood
-            mood_distribution[mood] = mood_distribution.get(mood, 0) + 1
-        
-        # Create or update metrics
-        metrics, created = StandupMetrics.objects.update_or_create(
-            team=standup.team,
-            date=standup.date,
-            defaults={
-                'total_members': total_members,
-                'responses_count': responses_count,
-                'completion_rate': completion_rate,
-                'average_response_time': average_response_time,
-                'first_response_time': first_response_time,
-                'last_response_time': last_response_time,
-                'mood_distribution': mood_distribution,
-            }
-        )
+        # Calculate participation, timing and mood metrics with aggregate queries
+        upsert_metrics(build_metrics([standup]))
         
         return f"Generated metrics for {standup.team.name} on {standup.date}"
         
@@ -262,20 +341,45 @@ def generate_standup_metrics(standup_id):
         return f"Error generating metrics: {str(e)}"
 
 
+@shared_task
+def generate_standups_metrics(standup_ids):
+    """Generate metrics for a batch of stand-ups"""
+    standups = Standup.objects.filter(id__in=standup_ids).only('id', 'team_id', 'date', 'active_member_count')
+    created, updated = upsert_metrics(build_metrics(standups))
+    return f"Generated metrics for {len(standup_ids)} stand-ups: {created} created, {updated} updated"
+
+
 @shared_task
 def generate_daily_metrics():
-    """Generate daily metrics for all teams"""
-    yesterday = (timezone.now() - timedelta(days=1)).date()
+    """Generate metrics for stand-ups that closed since the previous run"""
+    now = timezone.now()
+    # Without a recorded run, cover the last two days; the overlap catches
+    # stand-ups whose closing transaction committed after the previous run read
+    since = TaskWatermark.objects.filter(
+        name='generate_daily_metrics'
+    ).values_list('value', flat=True).first() or now - timedelta(days=2)
     
     completed_standups = Standup.objects.filter(
-        date=yesterday,
-        status='completed'
+        status='completed',
+        ended_at__gte=since - timedelta(minutes=10)
+    ).only('id', 'team_id', 'date', 'active_member_count')
+    
+    # Grouped aggregates for every team, read from the replica when there is one:
+    # the stand-ups are closed, so its slight lag cannot change them
+    with replica_reads():
+        metrics = build_metrics(completed_standups)
+    # Only rows whose values moved are written and expire cached views
+    created, updated = upsert_metrics(metrics)
+    
+    # Kept in the database: a watermark lost to cache eviction would skip stand-ups closed before it
+    TaskWatermark.objects.bulk_create(
+        [TaskWatermark(name='generate_daily_metrics', value=now)],
+        update_conflicts=True,
+        unique_fields=['name'],
+        update_fields=['value']
     )
     
-    for standup in completed_standups:
-        # Check if metrics already exist
-        if not StandupMetrics.objects.filter(team=standup.team, date=standup.date).exists():
-            generate_standup_metrics.delay(standup.id)
+    return f"Generated metrics for {len(metrics)} stand-ups closed since {since:%Y-%m-%d %H:%M}: {created} created, {updated} updated"
 
 
 @shared_task
@@ -298,6 +402,9 @@ def process_standup_response(user_id, standup_id, response_data):
             }
         )
         
+        if created:
+            record_response(user.id, standup)
+        
         # Mark any reminders as responded
         StandupReminder.objects.filter(
             standup=standup,
@@ -0,0 +1,183 @@
+"""
+Query-count and timing benchmarks for the stand-up Celery tasks.
+
+Each task runs against generated datasets of increasing size with a stubbed
+Slack client. Query ceilings are fixed per task (plus a fixed amount per team
+where a task necessarily does per-team work), so an N+1 over members or
+responses fails the build as soon as the larger scale points exceed them.
+Wall time and peak memory of every scale point are written as JSON to the
+file named by the BENCHMARK_REPORT environment variable.
+"""
+import gc
+import itertools
+import json
+import os
+import time
+import tracemalloc
+from contextlib import contextmanager
+from datetime import date, datetime, timedelta
+from unittest import mock
+
+import pytz
+from django.core.cache import cache
+from django.db import connection, transaction
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+
+from standapp.celery import app
+from teams.models import Team, TeamMember, StandupSchedule, StandupScheduleOccurrence
+from .loadgen import LoadGenerator
+from .models import Standup, StandupReminder, StandupResponse
+from . import tasks
+
+
+# A Thursday; the generated history ends on the Wednesday before
+NOW = datetime(2024, 3, 7, 18, 0, tzinfo=pytz.UTC)
+TODAY = NOW.date()
+HISTORY_END = date(2024, 3, 6)
+
+# (teams, median members per team)
+SCALES = [(2, 5), (4, 20), (8, 60)]
+
+RESULTS = []
+
+
+class StubSlackClient:
+    """WebClient stand-in that accepts every message"""
+    sequence = itertools.count(1)
+
+    def __init__(self, *args, **kwargs):
+        pass
+
+    def chat_postMessage(self, channel, **kwargs):
+        return {'ok': True, 'ts': f'{NOW.timestamp():.0f}.{next(self.sequence):06d}'}
+
+
+@mock.patch('slack_integration.services.WebClient', StubSlackClient)
+@override_settings(METRICS_ENABLED=False, SLACK_POST_MESSAGE_RATE_PER_MINUTE=10 ** 9)
+class TaskBenchmarkTestCase(TestCase):
+    """Benchmark the stand-up tasks at increasing dataset sizes"""
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.task_always_eager = app.conf.task_always_eager
+        app.conf.task_always_eager = True
+
+    @classmethod
+    def tearDownClass(cls):
+        app.conf.task_always_eager = cls.task_always_eager
+        report = os.environ.get('BENCHMARK_REPORT')
+        if report:
+            with open(report, 'w') as f:
+                json.dump(RESULTS, f, indent=2)
+        super().tearDownClass()
+
+    def setUp(self):
+        # Idempotency keys, locks and rate limit windows would carry over between runs
+        cache.clear()
+        clock = mock.patch('django.utils.timezone.now', return_value=NOW)
+        clock.start()
+        self.addCleanup(clock.stop)
+
+    @contextmanager
+    def scale_point(self, teams, members):
+        """Generate a dataset for one scale point and roll it back afterwards"""
+        with self.subTest(teams=teams, members=members), transaction.atomic():
+            LoadGenerator(teams=teams, members=members, days=1, seed=teams, end_date=HISTORY_END).run()
+            cache.clear()
+            yield TeamMember.objects.filter(is_active=True).count()
+            transaction.set_rollback(True)
+
+    def measure(self, name, teams, members, ceiling, func):
+        """Run func, recording queries, wall time and peak memory, and enforce the query ceiling"""
+        gc.collect()
+        tracemalloc.start()
+        started = time.perf_counter()
+        with CaptureQueriesContext(connection) as queries:
+            func()
+        elapsed = time.perf_counter() - started
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+        RESULTS.append({
+            'task': name,
+            'teams': teams,
+            'members': members,
+            'queries': len(queries),
+            'seconds': round(elapsed, 4),
+            'peak_memory_kb': round(peak / 1024, 1),
+        })
+        self.assertLessEqual(
+            len(queries), ceiling,
+            f"{name} ran {len(queries)} queries for {teams} teams / {members} members, ceiling is {ceiling}"
+        )
+
+    def start_todays_standups(self, started_at, respond_every=2):
+        """Open an in-progress stand-up for every team, with every n-th member already answered"""
+        standups = Standup.objects.bulk_create([
+            Standup(team=team, date=TODAY, status='in_progress', started_at=started_at)
+            for team in Team.objects.all()
+        ])
+        by_team = {standup.team_id: standup for standup in standups}
+        members = TeamMember.objects.filter(is_active=True).order_by('id')
+        StandupResponse.objects.bulk_create([
+            StandupResponse(standup=by_team[member.team_id], user_id=member.user_id,
+                            yesterday_work='Work', today_work='More work')
+            for member in itertools.islice(members, 0, None, respond_every)
+        ])
+        return standups
+
+    def test_create_and_send_standup_reminder(self):
+        """Initial reminders for one team use a constant number of queries"""
+        for teams, members in SCALES:
+            with self.scale_point(teams, members) as active:
+                team = Team.objects.order_by('-id').first()
+                self.measure('create_and_send_standup_reminder', teams, active, 19, lambda: (
+                    tasks.create_and_send_standup_reminder(team.id, TODAY.isoformat())
+                ))
+                self.assertEqual(
+                    Standup.objects.get(team=team, date=TODAY).reminders_sent,
+                    team.teammember_set.filter(is_active=True).count()
+                )
+
+    def test_send_follow_up_reminders(self):
+        """Follow-ups use a fixed number of queries per stand-up, independent of team size"""
+        for teams, members in SCALES:
+            with self.scale_point(teams, members) as active:
+                self.start_todays_standups(NOW - timedelta(hours=2))
+                self.measure('send_follow_up_reminders', teams, active, 4 + 10 * teams, (
+                    tasks.send_follow_up_reminders
+                ))
+                self.assertTrue(StandupReminder.objects.filter(reminder_type='follow_up').exists())
+
+    def test_end_standups(self):
+        """Ending stand-ups uses a fixed number of queries per stand-up"""
+        for teams, members in SCALES:
+            with self.scale_point(teams, members) as active:
+                self.start_todays_standups(NOW - timedelta(hours=7))
+                StandupScheduleOccurrence.objects.filter(kind='end', date=TODAY).delete()
+                StandupScheduleOccurrence.objects.bulk_create([
+                    StandupScheduleOccurrence(schedule=schedule, team_id=schedule.team_id, kind='end',
+                                              date=TODAY, fire_at=NOW - timedelta(minutes=1))
+                    for schedule in StandupSchedule.objects.all()
+                ])
+                self.measure('end_standups', teams, active, 13 + 11 * teams, tasks.end_standups)
+                self.assertFalse(Standup.objects.filter(status='in_progress').exists())
+
+    def test_generate_standup_metrics(self):
+        """Metrics for one stand-up use a constant number of queries"""
+        for teams, members in SCALES:
+            with self.scale_point(teams, members) as active:
+                standup = Standup.objects.filter(date=HISTORY_END).order_by('-id').first()
+                self.measure('generate_standup_metrics', teams, active, 7, lambda: (
+                    tasks.generate_standup_metrics(standup.id)
+                ))
+
+    def test_generate_daily_metrics(self):
+        """Metrics for every recently closed stand-up use a constant number of queries"""
+        for teams, members in SCALES:
+            with self.scale_point(teams, members) as active:
+                # Without a previous run the task covers the last two days, which hold the generated history;
+                # reading and writing the run's watermark row are two of the queries
+                self.measure('generate_daily_metrics', teams, active, 9, tasks.generate_daily_metrics)
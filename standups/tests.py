@@ -1,3 +1,515 @@
-from django.test import TestCase
+import os
+import tempfile
+from datetime import date, datetime, time, timedelta
+from io import StringIO
+from unittest import mock
 
-# Create your tests here.
+import pytz
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.management import call_command
+from django.test import RequestFactory, SimpleTestCase, TestCase, override_settings
+from rest_framework.test import APITestCase
+from django.contrib.auth.models import User
+from django.db.models import F
+from django.utils import timezone
+
+from slack_integration.models import SlackWorkspace
+from standapp.celery import app
+from standapp.db_routers import ReplicaRouter, _replica_reads, may_read_replica, replica_reads
+from teams.models import Team, TeamMember, StandupSchedule
+from .loadgen import LoadGenerator
+from .models import Standup, StandupMetrics, StandupResponse, TaskWatermark, UserStreak
+from .streaks import record_response, reset_missed_streaks
+from . import tasks
+from .locks import task_lock
+from .tasks import generate_standup_metrics
+from .versions import get_versions, team_key
+
+
+class RecordingSlackClient:
+    """WebClient stand-in recording every DM and failing those sent to ``failing`` channels"""
+    sent = []
+    failing = set()
+
+    def __init__(self, *args, **kwargs):
+        pass
+
+    def chat_postMessage(self, channel, **kwargs):
+        self.sent.append(channel)
+        if channel in self.failing:
+            return {'ok': False, 'error': 'service_unavailable'}
+        return {'ok': True, 'ts': f'1.{len(self.sent):04d}'}
+
+
+@mock.patch('slack_integration.services.WebClient', RecordingSlackClient)
+@override_settings(METRICS_ENABLED=False)
+class ReminderDispatchTestCase(TestCase):
+    """Test case for dispatching reminders exactly once"""
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.task_always_eager = app.conf.task_always_eager
+        app.conf.task_always_eager = True
+
+    @classmethod
+    def tearDownClass(cls):
+        app.conf.task_always_eager = cls.task_always_eager
+        super().tearDownClass()
+
+    def setUp(self):
+        cache.clear()
+        RecordingSlackClient.sent = []
+        RecordingSlackClient.failing = set()
+        SlackWorkspace.objects.create(
+            team_id='T12345678', team_name='Acme', bot_user_id='B12345678', bot_access_token='xoxb-test'
+        )
+        self.team = Team.objects.create(name='Platform', slack_channel_id='C12345678')
+        self.members = [
+            (TeamMember.objects.create(
+                user=User.objects.create(username=f'user-{i}'), team=self.team, slack_user_id=f'U1234567{i}'
+            ).user_id, f'U1234567{i}')
+            for i in range(5)
+        ]
+        self.today = date(2024, 3, 7)
+
+    def test_repeated_dispatch_sends_once(self):
+        """Test that running the same reminder task twice DMs every member once"""
+        tasks.create_and_send_standup_reminder(self.team.id, self.today.isoformat())
+        result = tasks.create_and_send_standup_reminder(self.team.id, self.today.isoformat())
+
+        self.assertIn('already dispatched', result)
+        self.assertEqual(sorted(RecordingSlackClient.sent), [slack_user_id for _, slack_user_id in self.members])
+
+    def test_repeated_chunk_sends_once(self):
+        """Test that a retried chunk does not DM its members a second time"""
+        standup = Standup.objects.create(team=self.team, date=self.today, status='in_progress')
+
+        first = tasks.send_standup_reminder_chunk(standup.id, self.members, 'initial')
+        second = tasks.send_standup_reminder_chunk(standup.id, self.members, 'initial')
+
+        self.assertEqual((first, second), ({'sent': 5, 'failed': 0}, {'sent': 0, 'failed': 0}))
+        self.assertEqual(len(RecordingSlackClient.sent), 5)
+
+    @override_settings(STANDUP_REMINDER_CHUNK_SIZE=2)
+    def test_fan_out_records_chunk_totals(self):
+        """Test that members are split into fixed-size chunks whose totals reach the stand-up"""
+        RecordingSlackClient.failing = {self.members[-1][1]}
+
+        with mock.patch.object(tasks, '_send_reminder_batch', wraps=tasks._send_reminder_batch) as send_batch:
+            tasks.create_and_send_standup_reminder(self.team.id, self.today.isoformat())
+
+        self.assertEqual([len(call.args[1]) for call in send_batch.call_args_list], [2, 2, 1])
+        standup = Standup.objects.get(team=self.team, date=self.today)
+        self.assertEqual((standup.reminders_sent, standup.reminders_failed), (4, 1))
+
+    def test_follow_ups_skip_standups_of_earlier_days(self):
+        """Test that a stand-up left open from yesterday gets no follow-ups, today's does"""
+        now = datetime(2024, 3, 7, 12, 0, tzinfo=pytz.UTC)
+        stale = Standup.objects.create(
+            team=self.team, date=self.today - timedelta(days=1), status='in_progress',
+            started_at=now - timedelta(days=1)
+        )
+        current = Standup.objects.create(
+            team=self.team, date=self.today, status='in_progress', started_at=now - timedelta(hours=2)
+        )
+
+        with mock.patch('django.utils.timezone.now', return_value=now):
+            tasks.send_follow_up_reminders()
+
+        self.assertEqual(stale.reminders.count(), 0)
+        self.assertEqual(current.reminders.filter(reminder_type='follow_up').count(), 5)
+
+    def test_held_lock_skips_run(self):
+        """Test that a beat tick is skipped while another run holds the task lock"""
+        with task_lock('send_standup_reminders', timeout=55) as acquired:
+            self.assertTrue(acquired)
+            self.assertEqual(tasks.send_standup_reminders(), "Another beat tick is dispatching reminders")
+
+
+class BackfillMetricsTestCase(TestCase):
+    """Test case for the backfill_metrics management command"""
+
+    def setUp(self):
+        self.team = Team.objects.create(name='Platform', slack_channel_id='C12345678')
+        for day in (date(2024, 1, 30), date(2024, 2, 1), date(2024, 2, 2)):
+            Standup.objects.create(team=self.team, date=day, status='completed')
+
+    def test_backfill_resumes_from_checkpoint(self):
+        """Test that a rerun with the same checkpoint skips finished chunks"""
+        with tempfile.TemporaryDirectory() as directory:
+            checkpoint = os.path.join(directory, 'backfill.checkpoint')
+            args = ['backfill_metrics', '--start', '2024-01-01', '--end', '2024-02-29',
+                    '--workers', '1', '--checkpoint', checkpoint]
+
+            call_command(*args, stdout=StringIO())
+            self.assertEqual(StandupMetrics.objects.filter(team=self.team).count(), 3)
+
+            output = StringIO()
+            call_command(*args, stdout=output)
+            self.assertIn('0 stand-ups in 0 chunks (2 already done)', output.getvalue())
+
+    def test_backfill_keeps_historical_team_size(self):
+        """Test that recomputed metrics use each stand-up's member count, not today's team"""
+        Standup.objects.filter(date=date(2024, 1, 30)).update(active_member_count=4)
+        Standup.objects.exclude(date=date(2024, 1, 30)).update(active_member_count=5)
+        TeamMember.objects.create(
+            user=User.objects.create(username='alice'), team=self.team, slack_user_id='U12345678'
+        )
+
+        call_command('backfill_metrics', '--start', '2024-01-01', '--end', '2024-02-29',
+                     '--workers', '1', stdout=StringIO())
+
+        self.assertEqual(
+            list(StandupMetrics.objects.filter(team=self.team).order_by('date').values_list('total_members', flat=True)),
+            [4, 5, 5]
+        )
+
+
+class DailyMetricsTestCase(TestCase):
+    """Test case for the hourly generate_daily_metrics run"""
+
+    def test_rerun_without_changes_keeps_versions(self):
+        """Test that only newly closed stand-ups are recomputed and unchanged metrics expire nothing"""
+        cache.clear()
+        team = Team.objects.create(name='Platform', slack_channel_id='C12345678')
+        standup = Standup.objects.create(
+            team=team, date=date.today(), status='completed',
+            started_at=timezone.now() - timedelta(hours=1), ended_at=timezone.now()
+        )
+        StandupResponse.objects.create(
+            standup=standup, user=User.objects.create(username='alice'), yesterday_work='a', today_work='b'
+        )
+        Standup.objects.create(
+            team=team, date=date.today() - timedelta(days=5), status='completed',
+            ended_at=timezone.now() - timedelta(days=5)
+        )
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.assertIn('1 created, 0 updated', tasks.generate_daily_metrics())
+        versions = get_versions([team_key(team.id)])
+
+        # Float noise from recomputing is not a change
+        StandupMetrics.objects.update(completion_rate=F('completion_rate') + 1e-12)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.assertIn('0 created, 0 updated', tasks.generate_daily_metrics())
+        self.assertEqual(get_versions([team_key(team.id)]), versions)
+
+    def test_watermark_survives_cache_loss(self):
+        """Test that the previous run's start is read from the database, not the cache"""
+        team = Team.objects.create(name='Platform', slack_channel_id='C12345678')
+        for days_ago in (0, 5):
+            Standup.objects.create(
+                team=team, date=date.today() - timedelta(days=days_ago), status='completed',
+                ended_at=timezone.now() - timedelta(days=days_ago)
+            )
+        TaskWatermark.objects.create(name='generate_daily_metrics', value=timezone.now() - timedelta(days=7))
+        cache.clear()
+
+        self.assertIn('2 created, 0 updated', tasks.generate_daily_metrics())
+        self.assertGreater(
+            TaskWatermark.objects.get(name='generate_daily_metrics').value, timezone.now() - timedelta(minutes=1)
+        )
+
+
+class ParticipationCountersTestCase(TestCase):
+    """Test case for the participation counters maintained on Standup"""
+
+    def setUp(self):
+        self.team = Team.objects.create(name='Platform', slack_channel_id='C12345678')
+        self.users = [User.objects.create(username=f'user-{i}') for i in range(4)]
+        self.members = [
+            TeamMember.objects.create(user=user, team=self.team, slack_user_id=f'U1234567{i}')
+            for i, user in enumerate(self.users)
+        ]
+        self.standup = Standup.objects.create(team=self.team, date=date(2024, 3, 7), status='in_progress')
+
+    def test_counters_follow_responses_and_membership(self):
+        """Test that responses and membership changes update the counters"""
+        StandupResponse.objects.create(standup=self.standup, user=self.users[0], yesterday_work='a', today_work='b')
+        self.members[3].is_active = False
+        self.members[3].save()
+
+        self.standup.refresh_from_db()
+        self.assertEqual((self.standup.active_member_count, self.standup.response_count), (3, 1))
+        self.assertAlmostEqual(self.standup.completion_rate, 100 / 3)
+        self.assertEqual(self.standup.missing_count, 2)
+
+    def test_metrics_use_member_count_of_the_standup(self):
+        """Test that metrics of a closed stand-up keep its team size after membership changes"""
+        StandupResponse.objects.create(standup=self.standup, user=self.users[0], yesterday_work='a', today_work='b')
+        self.standup.status = 'completed'
+        self.standup.save(update_fields=['status', 'updated_at'])
+        TeamMember.objects.create(
+            user=User.objects.create(username='late-joiner'), team=self.team, slack_user_id='U23456789'
+        )
+
+        generate_standup_metrics(self.standup.id)
+
+        metrics = StandupMetrics.objects.get(team=self.team, date=self.standup.date)
+        self.assertEqual((metrics.total_members, metrics.completion_rate), (4, 25.0))
+
+    def test_reconcile_repairs_drift(self):
+        """Test that the reconcile command recounts stand-ups whose counters drifted"""
+        StandupResponse.objects.bulk_create([
+            StandupResponse(standup=self.standup, user=user, yesterday_work='a', today_work='b')
+            for user in self.users[:2]
+        ])
+
+        output = StringIO()
+        call_command('reconcile_standup_counters', stdout=output)
+        self.assertIn('Repaired 1 of 1 stand-ups', output.getvalue())
+
+        self.standup.refresh_from_db()
+        self.assertEqual((self.standup.response_count, self.standup.completion_rate), (2, 50.0))
+
+
+class ExplainHotQueriesTestCase(TestCase):
+    """Test case for the explain_hot_queries management command"""
+
+    def test_hot_queries_use_indexes(self):
+        """Test that every hot query is planned as an index scan on a generated dataset"""
+        output = StringIO()
+        call_command('explain_hot_queries', '--generate', '--teams', '20', '--members', '8', '--days', '10',
+                     stdout=output)
+
+        self.assertIn('Every hot query uses an index', output.getvalue())
+        self.assertFalse(Team.objects.exists())
+
+
+class LoadGeneratorTestCase(TestCase):
+    """Test case for the synthetic load dataset generator"""
+
+    def _generate(self):
+        LoadGenerator(teams=3, members=4, days=7, seed=42, end_date=date(2024, 3, 10)).run()
+        return list(StandupResponse.objects.order_by('submitted_at', 'user__username').values_list(
+            'standup__team__name', 'standup__date', 'user__username', 'mood', 'submitted_at'
+        ))
+
+    def test_same_seed_reproduces_dataset(self):
+        """Test that regenerating with the same seed yields identical rows"""
+        first = self._generate()
+        self.assertTrue(first)
+
+        SlackWorkspace.objects.all().delete()
+        Team.objects.all().delete()
+        User.objects.all().delete()
+
+        self.assertEqual(self._generate(), first)
+
+
+class UserStreakTestCase(TestCase):
+    """Test case for incrementally maintained stand-up streaks"""
+
+    def setUp(self):
+        self.team = Team.objects.create(name='Platform', slack_channel_id='C12345678')
+        StandupSchedule.objects.create(
+            team=self.team, weekdays=[1, 2, 3, 4, 5], reminder_time=time(9, 0), end_time=time(16, 0)
+        )
+        self.user = User.objects.create(username='alice')
+
+    def standup(self, day):
+        return Standup.objects.create(team=self.team, date=day, status='in_progress')
+
+    def test_streak_skips_unscheduled_days(self):
+        """Test that answering Friday and then Monday continues the streak"""
+        record_response(self.user.id, self.standup(date(2024, 3, 8)))
+        streak = record_response(self.user.id, self.standup(date(2024, 3, 11)))
+
+        self.assertEqual((streak.current_streak, streak.longest_streak), (2, 2))
+
+    def test_missed_standup_resets_streak(self):
+        """Test that closing a stand-up the user did not answer breaks the streak"""
+        record_response(self.user.id, self.standup(date(2024, 3, 11)))
+        missed = self.standup(date(2024, 3, 12))
+
+        reset_missed_streaks([missed.id])
+        streak = UserStreak.objects.get(user=self.user, team=self.team)
+        self.assertEqual((streak.current_streak, streak.longest_streak), (0, 1))
+
+        streak = record_response(self.user.id, self.standup(date(2024, 3, 13)))
+        self.assertEqual(streak.current_streak, 1)
+
+
+class StandupListQueryTestCase(APITestCase):
+    """Test case for the annotated stand-up list endpoint"""
+
+    def setUp(self):
+        self.user = User.objects.create(username='alice', is_superuser=True)
+        self.client.force_authenticate(user=self.user)
+
+    def add_standups(self, count, day=date(2024, 3, 7)):
+        existing = Team.objects.count()
+        for number in range(existing, existing + count):
+            team = Team.objects.create(name=f'Team {number}', slack_channel_id=f'C{number:08d}')
+            members = [User.objects.create(username=f'member-{number}-{i}') for i in range(4)]
+            for i, member in enumerate(members):
+                TeamMember.objects.create(user=member, team=team, slack_user_id=f'U{number:04d}{i:04d}')
+            standup = Standup.objects.create(team=team, date=day, status='in_progress')
+            StandupResponse.objects.create(standup=standup, user=members[0], yesterday_work='a', today_work='b')
+
+    def test_list_uses_constant_queries(self):
+        """Test that listing stand-ups costs the same queries regardless of row count"""
+        self.add_standups(2)
+        with self.assertNumQueries(2):
+            self.client.get('/api/standups/standups/')
+
+        self.add_standups(5)
+        with self.assertNumQueries(2):
+            response = self.client.get('/api/standups/standups/')
+
+        row = response.json()['results'][0]
+        self.assertEqual((row['response_count'], row['missing_count'], row['completion_rate']), (1, 3, 25.0))
+        self.assertEqual(row['team']['member_count'], 4)
+
+    def test_cursor_pages_are_stable_under_inserts(self):
+        """Test that following cursors visits every stand-up once while newer ones are created"""
+        self.add_standups(7)
+        expected = list(Standup.objects.order_by('-date', 'id').values_list('id', flat=True))
+
+        seen = []
+        url = '/api/standups/standups/?page_size=3'
+        while url:
+            page = self.client.get(url).json()
+            seen.extend(row['id'] for row in page['results'])
+            url = page['next']
+            self.add_standups(1, day=date(2024, 3, 8))
+
+        self.assertEqual(seen, expected)
+
+
+class DashboardCacheTestCase(APITestCase):
+    """Test case for the cached dashboard payload and conditional GETs"""
+
+    def setUp(self):
+        cache.clear()
+        self.team = Team.objects.create(name='Platform', slack_channel_id='C12345678')
+        self.user = User.objects.create(username='alice')
+        self.teammate = User.objects.create(username='bob')
+        for i, user in enumerate((self.user, self.teammate)):
+            TeamMember.objects.create(user=user, team=self.team, slack_user_id=f'U1234567{i}')
+        self.standup = Standup.objects.create(team=self.team, date=date.today(), status='in_progress')
+        self.client.force_authenticate(user=self.user)
+
+    def test_teammate_response_expires_cached_dashboard(self):
+        """Test that the dashboard is served from cache until a teammate responds"""
+        self.client.get('/api/standups/dashboard/')
+        with self.assertNumQueries(0):
+            response = self.client.get('/api/standups/dashboard/')
+        self.assertEqual(response.json()['recent_responses'], [])
+
+        with self.captureOnCommitCallbacks(execute=True):
+            StandupResponse.objects.create(
+                standup=self.standup, user=self.teammate, yesterday_work='a', today_work='b'
+            )
+
+        response = self.client.get('/api/standups/dashboard/')
+        self.assertEqual(len(response.json()['recent_responses']), 1)
+
+    @mock.patch.dict(settings.DATABASES, {'replica': settings.DATABASES['default']})
+    def test_dashboard_is_built_from_primary(self):
+        """Test that the cached dashboard never reads the replica, whose lag it would serve as current"""
+        opted_in = []
+
+        def record(router, model, **hints):
+            # The test transaction keeps every read on default, so check the opt-in itself
+            opted_in.append(_replica_reads.get())
+            return 'default'
+
+        with mock.patch.object(ReplicaRouter, 'db_for_read', record):
+            response = self.client.get('/api/standups/dashboard/')
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(set(opted_in), {False})
+
+    def test_evicted_version_expires_etag(self):
+        """Test that an ETag recorded before a team's token was evicted no longer matches"""
+        etag = self.client.get('/api/standups/standups/')['ETag']
+        cache.delete(team_key(self.team.id))
+
+        response = self.client.get('/api/standups/standups/', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(self.client.get('/api/standups/standups/', HTTP_IF_NONE_MATCH=response['ETag']).status_code,
+                         304)
+
+    def test_unchanged_standup_list_is_not_modified(self):
+        """Test that a matching If-None-Match gets 304 until the team changes"""
+        etag = self.client.get('/api/standups/standups/')['ETag']
+        with self.assertNumQueries(0):
+            response = self.client.get('/api/standups/standups/', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.standup.status = 'completed'
+            self.standup.save()
+
+        response = self.client.get('/api/standups/standups/', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response['ETag'], etag)
+
+
+class ReplicaRouterTestCase(SimpleTestCase):
+    """Test case for routing reads to the read replica"""
+
+    @mock.patch.dict(settings.DATABASES, {'replica': settings.DATABASES['default']})
+    def test_only_opted_in_reads_use_replica(self):
+        """Test that reads go to the replica inside replica_reads() and writes never do"""
+        router = ReplicaRouter()
+        self.assertEqual(router.db_for_read(Standup), 'default')
+        with replica_reads():
+            self.assertEqual(router.db_for_read(Standup), 'replica')
+            self.assertEqual(router.db_for_write(Standup), 'default')
+
+    def test_without_replica_reads_use_default(self):
+        """Test that opted-in reads stay on default when no replica is configured"""
+        with replica_reads():
+            self.assertEqual(ReplicaRouter().db_for_read(Standup), 'default')
+
+
+class ReplicaStickinessTestCase(APITestCase):
+    """Test case for keeping a user's reads on the primary after their own writes"""
+
+    def test_write_keeps_user_on_primary(self):
+        """Test that an unsafe request pins the user's reads to the primary"""
+        cache.clear()
+        user = User.objects.create(username='alice')
+        request = RequestFactory().get('/api/standups/dashboard/')
+        request.user = user
+        self.assertTrue(may_read_replica(request))
+
+        self.client.force_login(user)
+        self.client.post('/api/standups/standups/', {})
+
+        self.assertFalse(may_read_replica(request))
+
+
+class TeamSummaryTestCase(APITestCase):
+    """Test case for the aggregated team metrics summary"""
+
+    def setUp(self):
+        self.client.force_authenticate(user=User.objects.create(username='alice', is_superuser=True))
+        self.team = Team.objects.create(name='Platform', slack_channel_id='C12345678')
+        today = date.today()
+        for days_ago, completion_rate, moods in ((0, 50.0, {'good': 2, 'blocked': 1}), (1, 100.0, {'good': 3}),
+                                                 (40, 0.0, {'stressed': 4})):
+            StandupMetrics.objects.create(
+                team=self.team, date=today - timedelta(days=days_ago), total_members=4,
+                responses_count=sum(moods.values()), completion_rate=completion_rate, mood_distribution=moods
+            )
+
+    def test_summary_is_one_query_over_the_window(self):
+        """Test that the summary aggregates the window's metrics per team in a single query"""
+        with self.assertNumQueries(1):
+            response = self.client.get('/api/standups/metrics/team_summary/')
+
+        self.assertEqual(response.json(), [{
+            'team': {'id': self.team.id, 'name': 'Platform'},
+            'avg_completion_rate': 75.0,
+            'total_standups': 2,
+            'mood_trends': {'good': 5, 'blocked': 1},
+        }])
+
+        response = self.client.get('/api/standups/metrics/team_summary/?days=60')
+        self.assertEqual(response.json()[0]['mood_trends'], {'good': 5, 'stressed': 4, 'blocked': 1})
@@ -0,0 +1,68 @@
+"""
+Cache version tokens for data derived from stand-up activity.
+
+Every team has a token that is replaced whenever its stand-ups, responses,
+metrics or membership change, and every user has one for their own
+memberships; a global token changes along with any team. Anything computed
+from that data (a cached dashboard, an ETag) records the tokens it was built
+from and is stale as soon as one of them differs. Invalidation is one cache
+write per team however many members it has. A token lost to eviction is
+replaced by a fresh one on the next read, so it only makes dependants look
+stale, never fresh.
+"""
+import uuid
+
+from django.core.cache import cache
+from django.db import transaction
+
+from teams.membership import team_ids
+
+
+ALL_TEAMS_KEY = 'version:all'
+
+
+def team_key(team_id):
+    return f'version:team:{team_id}'
+
+
+def user_key(user_id):
+    return f'version:user:{user_id}'
+
+
+def _bump(keys):
+    cache.set_many({key: uuid.uuid4().hex for key in keys}, timeout=None)
+
+
+def invalidate_teams(team_ids):
+    """Replace the tokens of the given teams once the current transaction commits"""
+    keys = [team_key(team_id) for team_id in set(team_ids)]
+    if keys:
+        transaction.on_commit(lambda: _bump(keys + [ALL_TEAMS_KEY]))
+
+
+def invalidate_user(user_id):
+    """Replace a user's membership token once the current transaction commits"""
+    keys = [user_key(user_id)]
+    transaction.on_commit(lambda: _bump(keys))
+
+
+def member_keys(user):
+    """Version keys covering a user and the teams they are an active member of"""
+    return [user_key(user.id)] + [team_key(team_id) for team_id in team_ids(user)]
+
+
+def get_versions(keys):
+    """Current token of every key, issuing a fresh one where none exists or it was evicted"""
+    current = cache.get_many(keys)
+    missing = [key for key in keys if key not in current]
+    if missing:
+        # add() keeps whichever token a concurrent reader issued first
+        for key in missing:
+            cache.add(key, uuid.uuid4().hex, timeout=None)
+        current.update(cache.get_many(missing))
+    return {key: current.get(key) for key in keys}
+
+
+def is_current(versions):
+    """Whether none of the recorded tokens has been replaced since"""
+    return None not in versions.values() and get_versions(list(versions)) == versions
@@ -4,18 +4,27 @@ from rest_framework.decorators import action
 from rest_framework.response import Response
 from rest_framework.views import APIView
 from django.contrib.auth.models import User
+from django.db import transaction
 from django.utils import timezone
-from django.db.models import Q, Count, Avg
-from datetime import timedelta
+from django.utils.http import quote_etag
+from django.db.models import Q, Count, Avg, Max
+from datetime import datetime, time, timedelta
 from drf_spectacular.utils import extend_schema, extend_schema_view, OpenApiParameter
 from drf_spectacular.types import OpenApiTypes
 
-from .models import Standup, StandupResponse, StandupReminder, StandupMetrics
+from .models import Standup, StandupResponse, StandupReminder, StandupMetrics, UserStreak
 from .serializers import (
     StandupSerializer, StandupResponseSerializer, StandupReminderSerializer,
-    StandupMetricsSerializer, DashboardSerializer
+    StandupMetricsSerializer, DashboardSerializer, prefetch_standup_teams
 )
+from .conditional import ConditionalListMixin, not_modified, with_etag
+from .dashboard import get_dashboard
+from .metrics import summarize_team_metrics
+from .streaks import record_response, reset_missed_streaks
+from teams.membership import can_manage, team_ids
 from teams.models import TeamMember
+from standapp.db_routers import ReplicaReadMixin
+from standapp.pagination import DateCursorPagination, SubmittedAtCursorPagination
 
 
 @extend_schema_view(
@@ -45,23 +54,21 @@ from teams.models import TeamMember
         tags=["Standups"]
     ),
 )
-class StandupViewSet(viewsets.ModelViewSet):
+class StandupViewSet(ConditionalListMixin, viewsets.ModelViewSet):
     """API viewset for managing standups"""
     queryset = Standup.objects.all()
     serializer_class = StandupSerializer
     permission_classes = [permissions.IsAuthenticated]
+    pagination_class = DateCursorPagination
 
     def get_queryset(self):
         """Filter standups based on user's teams"""
         user = self.request.user
         if user.is_superuser:
-            return Standup.objects.all()
+            return prefetch_standup_teams(Standup.objects.all())
         
         # Return standups for teams where user is a member
-        return Standup.objects.filter(
-            team__teammember__user=user,
-            team__teammember__is_active=True
-        ).distinct().order_by('-date')
+        return prefetch_standup_teams(Standup.objects.filter(team_id__in=team_ids(user)).order_by('-date'))
 
     @extend_schema(
         description="Get all responses for a specific standup",
@@ -109,14 +116,7 @@ class StandupViewSet(viewsets.ModelViewSet):
         standup = self.get_object()
         
         # Check permissions
-        user_membership = TeamMember.objects.filter(
-            team=standup.team,
-            user=request.user,
-            role__in=['lead', 'admin'],
-            is_active=True
-        ).first()
-        
-        if not user_membership and not request.user.is_superuser:
+        if not can_manage(request.user, standup.team_id):
             return Response(
                 {"error": "Permission denied"}, 
                 status=status.HTTP_403_FORBIDDEN
@@ -128,14 +128,21 @@ class StandupViewSet(viewsets.ModelViewSet):
                 status=status.HTTP_400_BAD_REQUEST
             )
         
-        # End the standup
-        standup.status = 'completed'
-        standup.ended_at = timezone.now()
-        standup.save()
+        from slack_integration.services import SlackService
+        from .tasks import generate_standup_metrics, send_standup_summary
+        
+        # End the standup and queue its summary together
+        with transaction.atomic():
+            standup.status = 'completed'
+            standup.ended_at = timezone.now()
+            standup.save(update_fields=['status', 'ended_at', 'updated_at'])
+            reset_missed_streaks([standup.id])
+            summaries = SlackService().queue_standup_summaries([standup])
         
-        # Trigger summary generation
-        from .tasks import end_standup
-        end_standup.delay(standup.id)
+        # Deliver the summary and compute metrics
+        for message in summaries:
+            send_standup_summary.delay(message.id, message.next_attempt_at.isoformat())
+        generate_standup_metrics.delay(standup.id)
         
         serializer = self.get_serializer(standup)
         return Response(serializer.data)
@@ -146,6 +153,7 @@ class StandupResponseViewSet(viewsets.ModelViewSet):
     queryset = StandupResponse.objects.all()
     serializer_class = StandupResponseSerializer
     permission_classes = [permissions.IsAuthenticated]
+    pagination_class = SubmittedAtCursorPagination
 
     def get_queryset(self):
         """Filter responses based on user permissions"""
@@ -156,20 +164,21 @@ class StandupResponseViewSet(viewsets.ModelViewSet):
         # Users can see responses from their teams
         return StandupResponse.objects.filter(
             Q(user=user) |  # Own responses
-            Q(standup__team__teammember__user=user,
-              standup__team__teammember__is_active=True)  # Team responses
-        ).distinct().order_by('-submitted_at')
+            Q(standup__team_id__in=team_ids(user))  # Team responses
+        ).order_by('-submitted_at')
 
     def perform_create(self, serializer):
         """Set the user when creating a response"""
-        serializer.save(user=self.request.user)
+        response = serializer.save(user=self.request.user)
+        record_response(response.user_id, response.standup)
 
 
-class StandupMetricsViewSet(viewsets.ReadOnlyModelViewSet):
+class StandupMetricsViewSet(ReplicaReadMixin, ConditionalListMixin, viewsets.ReadOnlyModelViewSet):
     """API viewset for viewing standup metrics"""
     queryset = StandupMetrics.objects.all()
     serializer_class = StandupMetricsSerializer
     permission_classes = [permissions.IsAuthenticated]
+    pagination_class = DateCursorPagination
 
     def get_queryset(self):
         """Filter metrics based on user's teams"""
@@ -177,52 +186,34 @@ class StandupMetricsViewSet(viewsets.ReadOnlyModelViewSet):
         if user.is_superuser:
             return StandupMetrics.objects.all()
         
-        return StandupMetrics.objects.filter(
-            team__teammember__user=user,
-            team__teammember__is_active=True
-        ).distinct().order_by('-date')
+        return StandupMetrics.objects.filter(team_id__in=team_ids(user)).order_by('-date')
 
+    @extend_schema(
+        description="Per-team completion and mood totals over a trailing window of days",
+        summary="Get team metrics summary",
+        parameters=[
+            OpenApiParameter('days', OpenApiTypes.INT, description="Window length in days (default 30, at most 365)")
+        ],
+        tags=["Metrics"]
+    )
     @action(detail=False, methods=['get'])
     def team_summary(self, request):
         """Get metrics summary for user's teams"""
-        user = request.user
-        
-        # Get last 30 days of metrics for user's teams
-        thirty_days_ago = timezone.now().date() - timedelta(days=30)
+        try:
+            days = int(request.query_params.get('days', 30))
+        except ValueError:
+            days = 0
         
-        metrics = self.get_queryset().filter(date__gte=thirty_days_ago)
-        
-        # Aggregate by team
-        team_summaries = {}
-        for metric in metrics:
-            team_id = metric.team.id
-            if team_id not in team_summaries:
-                team_summaries[team_id] = {
-                    'team': {
-                        'id': metric.team.id,
-                        'name': metric.team.name
-                    },
-                    'avg_completion_rate': 0,
-                    'total_standups': 0,
-                    'mood_trends': {}
-                }
-            
-            summary = team_summaries[team_id]
-            summary['total_standups'] += 1
-            summary['avg_completion_rate'] += metric.completion_rate
-            
-            # Aggregate mood data
-            for mood, count in metric.mood_distribution.items():
-                if mood not in summary['mood_trends']:
-                    summary['mood_trends'][mood] = 0
-                summary['mood_trends'][mood] += count
+        if not 1 <= days <= 365:
+            return Response(
+                {"error": "days must be a whole number between 1 and 365"}, 
+                status=status.HTTP_400_BAD_REQUEST
+            )
         
-        # Calculate averages
-        for summary in team_summaries.values():
-            if summary['total_standups'] > 0:
-                summary['avg_completion_rate'] /= summary['total_standups']
+        since = timezone.now().date() - timedelta(days=days)
+        metrics = self.get_queryset().filter(date__gte=since)
         
-        return Response(list(team_summaries.values()))
+        return Response(summarize_team_metrics(metrics))
 
 
 class DashboardView(APIView):
@@ -231,6 +222,15 @@ class DashboardView(APIView):
 
     def get(self, request):
         user = request.user
+        data, etag = get_dashboard(user, lambda: self._build_dashboard(user))
+        if etag is None:
+            return Response(data)
+
+        etag = quote_etag(etag)
+        return not_modified(request, etag) or with_etag(Response(data), etag)
+
+    def _build_dashboard(self, user):
+        """Compute the dashboard payload for a user"""
         today = timezone.now().date()
         last_week = today - timedelta(days=7)
         
@@ -238,13 +238,16 @@ class DashboardView(APIView):
         user_teams = TeamMember.objects.filter(user=user, is_active=True)
         user_responses = StandupResponse.objects.filter(
             user=user,
-            submitted_at__date__gte=last_week
+            # A range on the column itself, unlike __date, can use the (user, submitted_at) index
+            submitted_at__gte=datetime.combine(last_week, time.min, tzinfo=timezone.get_current_timezone())
         )
         
         user_stats = {
             'teams_count': user_teams.count(),
             'responses_this_week': user_responses.count(),
-            'current_streak': self._calculate_streak(user),
+            'current_streak': UserStreak.objects.filter(user=user).aggregate(
+                streak=Max('current_streak')
+            )['streak'] or 0,
             'avg_mood_this_week': self._calculate_avg_mood(user_responses)
         }
         
@@ -256,32 +259,30 @@ class DashboardView(APIView):
                 team=team,
                 date__gte=last_week
             )
+            completion_rates = list(recent_standups.values_list('completion_rate', flat=True))
             
-            if recent_standups.exists():
-                avg_completion = sum(s.completion_rate for s in recent_standups) / len(recent_standups)
+            if completion_rates:
                 team_stats.append({
                     'team': {
                         'id': team.id,
                         'name': team.name
                     },
-                    'standups_this_week': recent_standups.count(),
-                    'avg_completion_rate': avg_completion,
+                    'standups_this_week': len(completion_rates),
+                    'avg_completion_rate': sum(completion_rates) / len(completion_rates),
                     'user_participation': recent_standups.filter(
                         responses__user=user
                     ).count()
                 })
         
         # Recent standups
-        recent_standups = Standup.objects.filter(
-            team__teammember__user=user,
-            team__teammember__is_active=True
-        ).distinct().order_by('-date')[:5]
+        recent_standups = prefetch_standup_teams(Standup.objects.filter(
+            team_id__in=team_ids(user)
+        ).order_by('-date'))[:5]
         
         # Recent responses
         recent_responses = StandupResponse.objects.filter(
-            standup__team__teammember__user=user,
-            standup__team__teammember__is_active=True
-        ).distinct().order_by('-submitted_at')[:10]
+            standup__team_id__in=team_ids(user)
+        ).order_by('-submitted_at')[:10]
         
         data = {
             'user_stats': user_stats,
@@ -290,28 +291,7 @@ class DashboardView(APIView):
             'recent_responses': StandupResponseSerializer(recent_responses, many=True).data
         }
         
-        return Response(data)
-    
-    def _calculate_streak(self, user):
-        """Calculate user's current standup streak"""
-        # This is a simplified version - you might want to implement more sophisticated logic
-        responses = StandupResponse.objects.filter(user=user).order_by('-submitted_at')
-        
-        if not responses.exists():
-            return 0
-        
-        streak = 0
-        current_date = timezone.now().date()
-        
-        for response in responses:
-            response_date = response.submitted_at.date()
-            if response_date == current_date or response_date == current_date - timedelta(days=1):
-                streak += 1
-                current_date = response_date - timedelta(days=1)
-            else:
-                break
-        
-        return streak
+        return data
     
     def _calculate_avg_mood(self, responses):
         """Calculate average mood score"""
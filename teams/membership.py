@@ -0,0 +1,77 @@
+"""
+Resolved team memberships of a user.
+
+Permission filters need the teams a user is an active member of, and sometimes
+the role they hold in each. team_roles() loads them with one query per user,
+keeps them in the cache until a membership of that user changes and memoises
+them on the user instance, so a request resolves them at most once and
+querysets can filter on ``team_id__in`` instead of joining through TeamMember
+and de-duplicating with DISTINCT.
+
+Cached roles live under a per-user version token that a membership change
+replaces on commit, rather than being deleted: a reader that queried before
+the commit can only write the old rows under the old token, which nobody
+reads any more.
+"""
+import uuid
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+
+from .models import TeamMember
+
+
+MANAGER_ROLES = ('lead', 'admin')
+
+
+def _version_key(user_id):
+    return f'membership:version:{user_id}'
+
+
+def _version(user_id):
+    """The user's membership token, minting one when none exists or it was evicted"""
+    key = _version_key(user_id)
+    version = cache.get(key)
+    if version is None:
+        cache.add(key, uuid.uuid4().hex, timeout=None)
+        version = cache.get(key)
+    return version
+
+
+def team_roles(user):
+    """Role of the user in each team they are an active member of, keyed by team id"""
+    roles = getattr(user, '_team_roles', None)
+    if roles is None:
+        key = f'membership:{user.id}:{_version(user.id)}'
+        roles = cache.get(key)
+        if roles is None:
+            # Always the primary: a lagging replica must not put a revoked membership back in the cache
+            roles = dict(
+                TeamMember.objects.using('default').filter(
+                    user_id=user.id, is_active=True
+                ).values_list('team_id', 'role')
+            )
+            cache.set(key, roles, settings.MEMBERSHIP_CACHE_TTL)
+        user._team_roles = roles
+    return roles
+
+
+def team_ids(user):
+    """IDs of the teams the user is an active member of"""
+    return list(team_roles(user))
+
+
+def managed_team_ids(user):
+    """IDs of the teams the user leads or administers"""
+    return [team_id for team_id, role in team_roles(user).items() if role in MANAGER_ROLES]
+
+
+def can_manage(user, team_id):
+    """Whether the user may manage the team, as a superuser or one of its leads or admins"""
+    return user.is_superuser or team_roles(user).get(team_id) in MANAGER_ROLES
+
+
+def invalidate_membership(user_id):
+    """Replace a user's membership token once the current transaction commits"""
+    transaction.on_commit(lambda: cache.set(_version_key(user_id), uuid.uuid4().hex, timeout=None))
@@ -0,0 +1,31 @@
+# Generated by Django 5.2.18 on 2026-10-16 23:27
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('teams', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='StandupScheduleOccurrence',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('kind', models.CharField(choices=[('reminder', 'Reminder'), ('end', 'End')], max_length=10)),
+                ('date', models.DateField()),
+                ('fire_at', models.DateTimeField()),
+                ('dispatched_at', models.DateTimeField(blank=True, null=True)),
+                ('schedule', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='occurrences', to='teams.standupschedule')),
+                ('team', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='schedule_occurrences', to='teams.team')),
+            ],
+            options={
+                'ordering': ['fire_at'],
+                'indexes': [models.Index(condition=models.Q(('dispatched_at__isnull', True)), fields=['kind', 'fire_at'], name='occurrence_pending_idx')],
+                'unique_together': {('schedule', 'kind', 'date')},
+            },
+        ),
+    ]
@@ -0,0 +1,19 @@
+# Generated by Django 5.2.18 on 2026-10-16 23:57
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('teams', '0002_standupscheduleoccurrence'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='teammember',
+            index=models.Index(condition=models.Q(('is_active', True)), fields=['team', 'user'], name='teammember_active_idx'),
+        ),
+    ]
@@ -0,0 +1,64 @@
+from datetime import datetime, timedelta
+
+import pytz
+from django.conf import settings
+from django.db import migrations
+from django.utils import timezone
+
+
+def build_schedule_index(apps, schema_editor):
+    """Index the upcoming fire times of schedules that existed before the index did"""
+    StandupSchedule = apps.get_model('teams', 'StandupSchedule')
+    StandupScheduleOccurrence = apps.get_model('teams', 'StandupScheduleOccurrence')
+    Standup = apps.get_model('standups', 'Standup')
+
+    now = timezone.now()
+    days = settings.STANDUP_SCHEDULE_INDEX_DAYS
+
+    open_dates = {}
+    for team_id, standup_date in Standup.objects.filter(status='in_progress').values_list('team_id', 'date'):
+        open_dates.setdefault(team_id, []).append(standup_date)
+
+    def occurrence(schedule, team_tz, kind, local_date, local_time):
+        return StandupScheduleOccurrence(
+            schedule_id=schedule.id,
+            team_id=schedule.team_id,
+            kind=kind,
+            date=local_date,
+            fire_at=team_tz.localize(datetime.combine(local_date, local_time)).astimezone(pytz.UTC),
+        )
+
+    occurrences = []
+    for schedule in StandupSchedule.objects.filter(is_active=True, team__is_active=True):
+        team_tz = pytz.timezone(schedule.timezone)
+        slots = {}
+
+        # In-progress stand-ups keep an end, even one already past, so end_standups closes them
+        for standup_date in open_dates.get(schedule.team_id, []):
+            slots['end', standup_date] = occurrence(schedule, team_tz, 'end', standup_date, schedule.end_time)
+
+        today = now.astimezone(team_tz).date()
+        for offset in range(days):
+            local_date = today + timedelta(days=offset)
+            if local_date.isoweekday() not in schedule.weekdays:
+                continue
+            for kind, local_time in (('reminder', schedule.reminder_time), ('end', schedule.end_time)):
+                candidate = occurrence(schedule, team_tz, kind, local_date, local_time)
+                if candidate.fire_at > now:
+                    slots[kind, local_date] = candidate
+
+        occurrences.extend(slots.values())
+
+    StandupScheduleOccurrence.objects.bulk_create(occurrences, ignore_conflicts=True, batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('teams', '0003_hot_path_indexes'),
+        ('standups', '0008_backfill_participation_counters'),
+    ]
+
+    operations = [
+        migrations.RunPython(build_schedule_index, migrations.RunPython.noop),
+    ]
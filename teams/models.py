@@ -50,6 +50,10 @@ class TeamMember(models.Model):
     class Meta:
         unique_together = ['user', 'team']
         ordering = ['team__name', 'user__username']
+        indexes = [
+            # Nearly every lookup wants a team's active members
+            models.Index(fields=['team', 'user'], condition=models.Q(is_active=True), name='teammember_active_idx'),
+        ]
 
     def __str__(self):
         return f"{self.user.username} - {self.team.name} ({self.role})"
@@ -80,3 +84,32 @@ class StandupSchedule(models.Model):
 
     class Meta:
         ordering = ['team__name', 'reminder_time']
+
+
+class StandupScheduleOccurrence(models.Model):
+    """Model for a precomputed UTC fire time of a stand-up schedule"""
+    KIND_CHOICES = [
+        ('reminder', 'Reminder'),
+        ('end', 'End'),
+    ]
+
+    schedule = models.ForeignKey(StandupSchedule, on_delete=models.CASCADE, related_name='occurrences')
+    team = models.ForeignKey(Team, on_delete=models.CASCADE, related_name='schedule_occurrences')
+    kind = models.CharField(max_length=10, choices=KIND_CHOICES)
+    date = models.DateField()  # Stand-up date in the schedule's timezone
+    fire_at = models.DateTimeField()  # UTC instant the occurrence is due
+    dispatched_at = models.DateTimeField(null=True, blank=True)
+
+    def __str__(self):
+        return f"{self.team.name} - {self.kind} at {self.fire_at}"
+
+    class Meta:
+        unique_together = ['schedule', 'kind', 'date']
+        ordering = ['fire_at']
+        indexes = [
+            models.Index(
+                fields=['kind', 'fire_at'],
+                condition=models.Q(dispatched_at__isnull=True),
+                name='occurrence_pending_idx',
+            ),
+        ]
@@ -0,0 +1,146 @@
+from datetime import datetime, timedelta
+
+import pytz
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+
+from .models import StandupSchedule, StandupScheduleOccurrence
+
+
+def local_today(tz_name, now=None):
+    """The current date in a timezone"""
+    return (now or timezone.now()).astimezone(pytz.timezone(tz_name)).date()
+
+
+def team_local_dates(team_ids, now=None):
+    """Current stand-up date of each team, in its active schedule's timezone (UTC for teams without one)"""
+    timezones = dict(
+        StandupSchedule.objects.filter(
+            team_id__in=team_ids, is_active=True
+        ).order_by('id').values_list('team_id', 'timezone')
+    )
+    return {team_id: local_today(timezones.get(team_id, 'UTC'), now) for team_id in team_ids}
+
+
+def _occurrence(schedule, team_tz, kind, local_date, local_time):
+    # Localize per date so DST transitions are baked into each instant
+    fire_at = team_tz.localize(datetime.combine(local_date, local_time)).astimezone(pytz.UTC)
+    return StandupScheduleOccurrence(
+        schedule=schedule,
+        team_id=schedule.team_id,
+        kind=kind,
+        date=local_date,
+        fire_at=fire_at,
+    )
+
+
+def build_occurrences(schedule, start_date, days):
+    """Build unsaved occurrences for a schedule over the given local date range"""
+    team_tz = pytz.timezone(schedule.timezone)
+    occurrences = []
+
+    for offset in range(days):
+        local_date = start_date + timedelta(days=offset)
+        if local_date.isoweekday() not in schedule.weekdays:
+            continue
+
+        for kind, local_time in (('reminder', schedule.reminder_time), ('end', schedule.end_time)):
+            occurrences.append(_occurrence(schedule, team_tz, kind, local_date, local_time))
+
+    return occurrences
+
+
+def _upcoming_occurrences(schedule, now, days):
+    """Occurrences for a schedule from its local today that are still in the future"""
+    return [
+        occurrence for occurrence in build_occurrences(schedule, local_today(schedule.timezone, now), days)
+        if occurrence.fire_at > now
+    ]
+
+
+def _open_standup_ends(schedule):
+    """End occurrences for the team's in-progress stand-ups at the schedule's current end time.
+
+    These may already be past, in which case the next end_standups run closes
+    the stand-up, instead of it staying open because its end was deleted.
+    """
+    team_tz = pytz.timezone(schedule.timezone)
+    return [
+        _occurrence(schedule, team_tz, 'end', standup_date, schedule.end_time)
+        for standup_date in schedule.team.standups.filter(status='in_progress').values_list('date', flat=True)
+    ]
+
+
+def rebuild_schedule_index(schedule, days=None):
+    """Replace the pending occurrences of a schedule after it changed"""
+    days = days or settings.STANDUP_SCHEDULE_INDEX_DAYS
+    now = timezone.now()
+
+    with transaction.atomic():
+        schedule.occurrences.filter(dispatched_at__isnull=True).delete()
+
+        if not schedule.is_active:
+            return 0
+
+        occurrences = {
+            (occurrence.kind, occurrence.date): occurrence
+            for occurrence in _open_standup_ends(schedule) + _upcoming_occurrences(schedule, now, days)
+        }
+
+        # Occurrences that already fired keep their slot through the unique constraint
+        created = StandupScheduleOccurrence.objects.bulk_create(
+            list(occurrences.values()),
+            ignore_conflicts=True
+        )
+
+    return len(created)
+
+
+def extend_schedule_index(days=None):
+    """Roll the index horizon forward for all active schedules and prune old rows"""
+    days = days or settings.STANDUP_SCHEDULE_INDEX_DAYS
+    now = timezone.now()
+
+    occurrences = []
+    schedules = StandupSchedule.objects.filter(is_active=True, team__is_active=True)
+    for schedule in schedules:
+        occurrences.extend(_upcoming_occurrences(schedule, now, days))
+
+    StandupScheduleOccurrence.objects.bulk_create(occurrences, ignore_conflicts=True, batch_size=1000)
+
+    # Keep a short history of fired occurrences for debugging missed reminders
+    StandupScheduleOccurrence.objects.filter(fire_at__lt=now - timedelta(days=days)).delete()
+
+    return len(occurrences)
+
+
+def claim_due_occurrences(kind, now=None):
+    """Atomically claim the occurrences of a kind that became due since the last tick.
+
+    Each occurrence is handed out exactly once: rows are locked with SKIP LOCKED
+    and stamped with ``dispatched_at`` in the same transaction, so overlapping or
+    delayed beat ticks never see the same occurrence twice. Occurrences older than
+    the grace window are left alone rather than fired late.
+    """
+    now = now or timezone.now()
+    grace = timedelta(minutes=settings.STANDUP_SCHEDULE_GRACE_MINUTES)
+
+    with transaction.atomic():
+        due = list(
+            StandupScheduleOccurrence.objects.select_for_update(
+                skip_locked=True, of=('self',)
+            ).filter(
+                kind=kind,
+                dispatched_at__isnull=True,
+                fire_at__lte=now,
+                fire_at__gt=now - grace,
+                team__is_active=True
+            )
+        )
+
+        StandupScheduleOccurrence.objects.filter(
+            id__in=[occurrence.id for occurrence in due]
+        ).update(dispatched_at=now)
+
+    return due
@@ -1,8 +1,22 @@
 from rest_framework import serializers
 from django.contrib.auth.models import User
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
 from .models import Team, TeamMember, StandupSchedule
 
 
+def annotate_member_count(queryset):
+    """Annotate teams with the active member count TeamSerializer reports"""
+    return queryset.annotate(
+        active_member_count=Coalesce(Subquery(
+            TeamMember.objects.filter(
+                team=OuterRef('pk'),
+                is_active=True
+            ).order_by().values('team').annotate(total=Count('id')).values('total')
+        ), 0)
+    )
+
+
 class UserSerializer(serializers.ModelSerializer):
     """Serializer for User model"""
     full_name = serializers.SerializerMethodField()
@@ -25,7 +39,9 @@ class TeamSerializer(serializers.ModelSerializer):
                  'created_at', 'updated_at', 'member_count']
         read_only_fields = ['created_at', 'updated_at']
     
-    def get_member_count(self, obj):
+    def get_member_count(self, obj) -> int:
+        if hasattr(obj, 'active_member_count'):
+            return obj.active_member_count
         return obj.teammember_set.filter(is_active=True).count()
 
 
@@ -0,0 +1,18 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .membership import invalidate_membership
+from .models import StandupSchedule, TeamMember
+from .scheduling import rebuild_schedule_index
+
+
+@receiver(post_save, sender=StandupSchedule)
+def rebuild_occurrences_on_schedule_change(sender, instance, **kwargs):
+    """Recompile a schedule's fire times whenever it is saved"""
+    rebuild_schedule_index(instance)
+
+
+@receiver([post_save, post_delete], sender=TeamMember)
+def expire_cached_membership(sender, instance, **kwargs):
+    """Teams and roles are cached per user, so any change to a membership expires them"""
+    invalidate_membership(instance.user_id)
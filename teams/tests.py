@@ -1,3 +1,139 @@
+from datetime import date, datetime, time, timedelta
+from importlib import import_module
+from unittest import mock
+
+import pytz
+from django.apps import apps
+from django.contrib.auth.models import User
+from django.core.cache import cache
 from django.test import TestCase
+from django.utils import timezone
+
+from standups.models import Standup
+from standups.tasks import end_standups
+from .membership import team_roles
+from .models import Team, TeamMember, StandupSchedule, StandupScheduleOccurrence
+from .scheduling import build_occurrences, claim_due_occurrences
+
+
+class StandupScheduleIndexTestCase(TestCase):
+    """Test case for the precompiled schedule fire-time index"""
+
+    def setUp(self):
+        self.team = Team.objects.create(name='Platform', slack_channel_id='C12345678')
+        self.schedule = StandupSchedule.objects.create(
+            team=self.team,
+            weekdays=[1, 2, 3, 4, 5],
+            reminder_time=time(9, 0),
+            end_time=time(16, 0),
+            timezone='America/New_York'
+        )
+
+    def test_occurrences_follow_dst(self):
+        """Test that fire times shift in UTC across a DST transition"""
+        # US clocks moved forward on Sunday 2024-03-10
+        occurrences = build_occurrences(self.schedule, date(2024, 3, 8), 4)
+        reminders = {o.date: o.fire_at for o in occurrences if o.kind == 'reminder'}
+
+        self.assertEqual(sorted(reminders), [date(2024, 3, 8), date(2024, 3, 11)])
+        self.assertEqual(reminders[date(2024, 3, 8)], datetime(2024, 3, 8, 14, 0, tzinfo=pytz.UTC))
+        self.assertEqual(reminders[date(2024, 3, 11)], datetime(2024, 3, 11, 13, 0, tzinfo=pytz.UTC))
+
+    def test_saving_schedule_rebuilds_index(self):
+        """Test that saving a schedule replaces its pending occurrences"""
+        self.assertTrue(self.schedule.occurrences.exists())
+
+        self.schedule.is_active = False
+        self.schedule.save()
+        self.assertFalse(self.schedule.occurrences.filter(dispatched_at__isnull=True).exists())
+
+    @mock.patch('standups.tasks.group')
+    def test_end_moved_before_now_still_closes_standup(self, group):
+        """Test that moving today's end time into the past closes the in-progress stand-up"""
+        now = datetime(2024, 3, 7, 15, 0, tzinfo=pytz.UTC)  # A Thursday
+        team = Team.objects.create(name='Infra', slack_channel_id='C23456789')
+        with mock.patch('django.utils.timezone.now', return_value=now):
+            schedule = StandupSchedule.objects.create(
+                team=team, weekdays=[4], reminder_time=time(9, 0), end_time=time(16, 0), timezone='UTC'
+            )
+            standup = Standup.objects.create(team=team, date=now.date(), status='in_progress', started_at=now)
+
+            schedule.end_time = time(14, 30)
+            schedule.save()
+            end_standups()
+
+        standup.refresh_from_db()
+        self.assertEqual(standup.status, 'completed')
+
+    def test_existing_schedule_indexed_by_migration(self):
+        """Test that a schedule saved before the index existed gets reminders without being saved again"""
+        # A Thursday morning in New York, before the 09:00 reminder
+        now = datetime(2024, 3, 7, 12, 0, tzinfo=pytz.UTC)
+        StandupScheduleOccurrence.objects.all().delete()
+
+        migration = import_module('teams.migrations.0004_build_schedule_index')
+        with mock.patch('django.utils.timezone.now', return_value=now):
+            migration.build_schedule_index(apps, None)
+
+        due = claim_due_occurrences('reminder', now=datetime(2024, 3, 7, 14, 1, tzinfo=pytz.UTC))
+        self.assertEqual([(o.schedule_id, o.date) for o in due], [(self.schedule.id, date(2024, 3, 7))])
+        self.assertTrue(self.schedule.occurrences.filter(kind='end', date=date(2024, 3, 7)).exists())
+
+    def test_due_occurrence_claimed_once(self):
+        """Test that overlapping ticks claim a due occurrence exactly once"""
+        now = timezone.now()
+        StandupScheduleOccurrence.objects.create(
+            schedule=self.schedule,
+            team=self.team,
+            kind='reminder',
+            date=now.date() - timedelta(days=30),
+            fire_at=now - timedelta(minutes=1)
+        )
+
+        first = claim_due_occurrences('reminder', now=now)
+        second = claim_due_occurrences('reminder', now=now + timedelta(seconds=30))
+
+        self.assertEqual(len(first), 1)
+        self.assertEqual(second, [])
+
+
+class MembershipCacheTestCase(TestCase):
+    """Test case for the cached team memberships of a user"""
+
+    def test_membership_change_expires_cached_roles(self):
+        """Test that roles are served from cache until a membership changes"""
+        cache.clear()
+        team = Team.objects.create(name='Platform', slack_channel_id='C12345678')
+        user = User.objects.create(username='alice')
+        member = TeamMember.objects.create(user=user, team=team, slack_user_id='U12345678')
+
+        self.assertEqual(team_roles(User.objects.get(id=user.id)), {team.id: 'member'})
+        with self.assertNumQueries(0):
+            team_roles(user)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            member.role = 'lead'
+            member.save()
+
+        self.assertEqual(team_roles(User.objects.get(id=user.id)), {team.id: 'lead'})
+
+    def test_reader_racing_a_change_cannot_cache_old_roles(self):
+        """Test that roles queried before a change commits are not served after it"""
+        cache.clear()
+        team = Team.objects.create(name='Platform', slack_channel_id='C12345678')
+        user = User.objects.create(username='alice')
+        member = TeamMember.objects.create(user=user, team=team, slack_user_id='U12345678')
+        cache_set = cache.set
+
+        def change_then_set(key, value, *args, **kwargs):
+            # The membership change commits between the reader's query and its cache write
+            if value == {team.id: 'member'}:
+                with self.captureOnCommitCallbacks(execute=True):
+                    member.role = 'lead'
+                    member.save()
+            cache_set(key, value, *args, **kwargs)
+
+        with mock.patch.object(cache, 'set', side_effect=change_then_set):
+            self.assertEqual(team_roles(User.objects.get(id=user.id)), {team.id: 'member'})
 
-# Create your tests here.
+        self.assertEqual(team_roles(User.objects.get(id=user.id)), {team.id: 'lead'})
@@ -5,8 +5,10 @@ from rest_framework.response import Response
 from django.contrib.auth.models import User
 from django.utils import timezone
 
+from standapp.pagination import NameCursorPagination
+from .membership import can_manage, managed_team_ids, team_ids
 from .models import Team, TeamMember, StandupSchedule
-from .serializers import TeamSerializer, TeamMemberSerializer, StandupScheduleSerializer
+from .serializers import TeamSerializer, TeamMemberSerializer, StandupScheduleSerializer, annotate_member_count
 
 
 class TeamViewSet(viewsets.ModelViewSet):
@@ -14,18 +16,16 @@ class TeamViewSet(viewsets.ModelViewSet):
     queryset = Team.objects.all()
     serializer_class = TeamSerializer
     permission_classes = [permissions.IsAuthenticated]
+    pagination_class = NameCursorPagination
 
     def get_queryset(self):
         """Filter teams based on user permissions"""
         user = self.request.user
         if user.is_superuser:
-            return Team.objects.all()
+            return annotate_member_count(Team.objects.all())
         
         # Return teams where user is a member
-        return Team.objects.filter(
-            teammember__user=user,
-            teammember__is_active=True
-        ).distinct()
+        return annotate_member_count(Team.objects.filter(id__in=team_ids(user)))
 
     @action(detail=True, methods=['get'])
     def members(self, request, pk=None):
@@ -41,14 +41,7 @@ class TeamViewSet(viewsets.ModelViewSet):
         team = self.get_object()
         
         # Check if user has permission to add members
-        user_membership = TeamMember.objects.filter(
-            team=team,
-            user=request.user,
-            role__in=['lead', 'admin'],
-            is_active=True
-        ).first()
-        
-        if not user_membership and not request.user.is_superuser:
+        if not can_manage(request.user, team.id):
             return Response(
                 {"error": "Permission denied"}, 
                 status=status.HTTP_403_FORBIDDEN
@@ -97,10 +90,7 @@ class TeamMemberViewSet(viewsets.ModelViewSet):
             return TeamMember.objects.all()
         
         # Return memberships for teams where user is a member
-        return TeamMember.objects.filter(
-            team__teammember__user=user,
-            team__teammember__is_active=True
-        ).distinct()
+        return TeamMember.objects.filter(team_id__in=team_ids(user))
 
 
 class StandupScheduleViewSet(viewsets.ModelViewSet):
@@ -116,8 +106,4 @@ class StandupScheduleViewSet(viewsets.ModelViewSet):
             return StandupSchedule.objects.all()
         
         # Return schedules for teams where user is a lead or admin
-        return StandupSchedule.objects.filter(
-            team__teammember__user=user,
-            team__teammember__role__in=['lead', 'admin'],
-            team__teammember__is_active=True
-        ).distinct()
+        return StandupSchedule.objects.filter(team_id__in=managed_team_ids(user))